@@ -1,99 +1,212 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
-from backend.common.hashing import sha256_file
+from backend.common.hashing import HASH_ALGORITHMS, file_digest, resolve_hash_algorithm, sha256_file
 from backend.common.manifest import ManifestStore
+from backend.common.walker import iter_files
 from backend.common.models import AgentResult, FileChange, FileInfo
 from .base_agent import AgentBase
 
 
+def _hash_file(path: str, algorithm: str) -> str:
+    return sha256_file(path) if algorithm == "sha256" else file_digest(path, algorithm)
+
+
+def _hash_for_compare(path: str, algorithm: str, previous: str | None) -> tuple[str, str | None]:
+    """Digest of *path*, plus its *previous*-algorithm digest when that differs.
+
+    The second digest lets a file recorded under another
+    ``crawl_hash_algorithm`` be compared with its manifest hash; it is
+    ``None`` when the algorithms match or *previous* is not usable here.
+    """
+    digest = _hash_file(path, algorithm)
+    if not previous or previous == algorithm or previous not in HASH_ALGORITHMS:
+        return digest, None
+    try:
+        return digest, _hash_file(path, previous)
+    except ImportError:  # e.g. xxh3 entries after xxhash was uninstalled
+        return digest, None
+
+
+def _within(path: str, roots: list[str]) -> bool:
+    return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots)
+
+
+# Seconds between a file's mtime and the scan that hashed it below which the
+# stat fast path is not trusted.
+RACY_WINDOW_S = 2.0
+
+
 class CrawlerAgent(AgentBase):
     agent_name = "crawler-agent"
 
+    @staticmethod
+    def _stat_unchanged(known_info: dict | None, st: os.stat_result) -> bool:
+        """True if the manifest entry was hashed from a file with this exact stat.
+
+        Files modified within ``RACY_WINDOW_S`` of the previous scan are
+        always re-hashed: a same-size edit inside the mtime granularity
+        would otherwise go unnoticed.
+        """
+        if not (
+            known_info
+            and known_info.get("hash")
+            and known_info.get("status") == "active"
+            and known_info.get("mtime_ns")
+            and int(known_info.get("size_bytes", -1)) == st.st_size
+            and int(known_info["mtime_ns"]) == st.st_mtime_ns
+            and int(known_info.get("inode", 0)) == st.st_ino
+        ):
+            return False
+        try:
+            scanned_at = datetime.fromisoformat(known_info["last_seen"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return False
+        return scanned_at - st.st_mtime > RACY_WINDOW_S
+
+    @staticmethod
+    def _same_content(prev: dict, info: FileInfo, previous_digest: str | None) -> bool:
+        """True if *info* has the content recorded in the manifest entry *prev*.
+
+        Hashes are only compared under the same algorithm: when the entry
+        used another one, *previous_digest* is the file's digest under it.
+        """
+        if prev.get("hash_algorithm", "sha256") == info.hash_algorithm:
+            return prev.get("hash") == info.hash
+        return previous_digest is not None and prev.get("hash") == previous_digest
+
+    @staticmethod
+    def _file_info(name: str, abs_path: str, st: os.stat_result, file_hash: str,
+                   algorithm: str, known_info: dict | None) -> FileInfo:
+        # Generate stable source_id from initial content hash if new
+        source_id = known_info.get("source_id") if known_info else None
+        if not source_id:  # New file, or migration of old manifest entries
+            source_id = f"src_{file_hash[:16]}"
+        return FileInfo(
+            path=abs_path,
+            filename=name,
+            extension=os.path.splitext(name)[1].lower(),
+            size_bytes=st.st_size,
+            modified_time=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(),
+            hash=file_hash,
+            source_id=source_id,
+            status="active",
+            last_seen=datetime.now(timezone.utc).isoformat(),
+            retry_count=0,
+            mtime_ns=st.st_mtime_ns,
+            inode=st.st_ino,
+            hash_algorithm=algorithm,
+        )
+
+    @staticmethod
+    def _record_scan_error(abs_path: str, exc: Exception, known: dict,
+                           current_scan: dict[str, FileInfo], changes: FileChange) -> None:
+        changes.errors.append({"path": abs_path, "error": str(exc)})
+        if abs_path in known:
+            # Keep existing entry but mark error
+            preserved = known[abs_path]
+            retry_count = preserved.get("retry_count", 0) + 1
+            current_scan[abs_path] = FileInfo(
+                path=abs_path, # Preserve path
+                filename=preserved.get("filename", ""),
+                extension=preserved.get("extension", ""),
+                size_bytes=int(preserved.get("size_bytes", 0)),
+                modified_time=preserved.get("modified_time", ""),
+                hash=preserved.get("hash", ""),
+                doc_id=preserved.get("doc_id"),
+                source_id=preserved.get("source_id"),
+                status="error",
+                last_seen=preserved.get("last_seen"),
+                retry_count=retry_count,
+                hash_algorithm=preserved.get("hash_algorithm", "sha256"),
+            )
+
     def execute(self, request: dict) -> AgentResult:
         dry_run = bool(request.get("dry_run", False))
         force = bool(request.get("force", False))
         max_file_size_mb = int(request.get("max_file_size_mb", 100))
         missing_grace_scans = int(request.get("missing_grace_scans", 0))
+        # Scoped crawls (watch mode) only look at *paths*: a path that no
+        # longer exists is a deletion, and manifest entries elsewhere are
+        # not treated as missing.
+        scoped = bool(request.get("scoped", False))
         paths = request.get("paths") or self.config.source_paths
         manifest = ManifestStore(self.config.manifest_path)
-        known = manifest.load().get("files", {})
+        roots = [os.path.realpath(raw_path) for raw_path in paths]
+        # A scoped crawl can only touch entries under its roots
+        known = manifest.load_under(roots) if scoped else manifest.load().get("files", {})
 
         current_scan: dict[str, FileInfo] = {}
         changes = FileChange()
+        algorithm = resolve_hash_algorithm(getattr(self.config, 'crawl_hash_algorithm', 'sha256'))
+        trust_stat = getattr(self.config, 'crawl_trust_stat', True) and not force
+        max_bytes = max_file_size_mb * 1024 * 1024
 
         # 1. Scan Files (Mark Phase)
-        for raw_path in paths:
-            base = Path(raw_path)
-            if not base.exists():
-                changes.errors.append({"path": raw_path, "error": "path_not_found"})
-                continue
-            
+        # Files whose (size, mtime_ns, inode) match the manifest keep their
+        # recorded hash; the rest are hashed on a thread pool.
+        with ThreadPoolExecutor(
+            max_workers=max(1, int(getattr(self.config, 'crawl_hash_workers', 8))),
+            thread_name_prefix="kts-hash",
+        ) as pool:
+            pending: dict[str, tuple[str, os.stat_result, Future]] = {}
+            previous_digests: dict[str, str] = {}  # path -> digest under the entry's own algorithm
             # Dynamically skip the KB output directory (and legacy "knowledge_base")
             _kb_dir_name = Path(self.config.knowledge_base_path).name
             _skip_dirs = {_kb_dir_name, "knowledge_base", ".kts"}
-            files = [
-                p for p in base.rglob("*")
-                if p.is_file()
-                and p.suffix.lower() in self.config.supported_extensions
-                and not _skip_dirs.intersection(p.parts)  # Skip KB index directories
-            ]
-            for file_path in files:
-                abs_path = str(file_path.resolve())
+            for raw_path in paths:
+                base = Path(raw_path)
+                if not base.exists():
+                    if not scoped:
+                        changes.errors.append({"path": raw_path, "error": "path_not_found"})
+                    continue
+
+                # Files stream out of the walk straight into the hash pool
+                for abs_path, entry in iter_files(
+                    base,
+                    self.config.supported_extensions,
+                    skip_dirs=_skip_dirs,
+                    on_error=lambda path, exc: changes.warnings.append(f"unreadable:{path}:{exc}"),
+                ):
+                    try:
+                        # os.stat, not entry.stat(): on Windows DirEntry.stat()
+                        # leaves st_ino at 0, which would drop the inode check.
+                        st = os.stat(abs_path)
+                        if st.st_size > max_bytes:
+                            changes.warnings.append(f"skipped_large_file:{entry.path}")
+                            continue
+                        known_info = known.get(abs_path)
+                        if trust_stat and self._stat_unchanged(known_info, st):
+                            current_scan[abs_path] = self._file_info(
+                                entry.name, abs_path, st, known_info["hash"],
+                                known_info.get("hash_algorithm", "sha256"), known_info,
+                            )
+                            continue
+                        previous = known_info.get("hash_algorithm", "sha256") if known_info else None
+                        pending[abs_path] = (entry.name, st, pool.submit(_hash_for_compare, abs_path, algorithm, previous))
+                    except Exception as exc:
+                        self._record_scan_error(abs_path, exc, known, current_scan, changes)
+
+            for abs_path, (name, st, future) in pending.items():
                 try:
-                    file_size = file_path.stat().st_size
-                    if file_size > (max_file_size_mb * 1024 * 1024):
-                        changes.warnings.append(f"skipped_large_file:{file_path}")
-                        continue
-                    
-                    file_hash = sha256_file(file_path)
-                    
-                    # Generate stable source_id from initial content hash if new
-                    known_info = known.get(abs_path)
-                    source_id = known_info.get("source_id") if known_info else f"src_{file_hash[:16]}"
-                    if not source_id: # For migration of old manifest entries
-                        source_id = f"src_{file_hash[:16]}"
-
-                    info = FileInfo(
-                        path=abs_path,
-                        filename=file_path.name,
-                        extension=file_path.suffix.lower(),
-                        size_bytes=file_size,
-                        modified_time=datetime.fromtimestamp(file_path.stat().st_mtime, tz=timezone.utc).isoformat(),
-                        hash=file_hash,
-                        source_id=source_id,
-                        status="active",
-                        last_seen=datetime.now(timezone.utc).isoformat(),
-                        retry_count=0
+                    digest, previous_digest = future.result()
+                    current_scan[abs_path] = self._file_info(
+                        name, abs_path, st, digest, algorithm, known.get(abs_path)
                     )
-                    current_scan[abs_path] = info
-
+                    if previous_digest is not None:
+                        previous_digests[abs_path] = previous_digest
                 except Exception as exc:
                     # Robustness: Handle locked files
-                    changes.errors.append({"path": abs_path, "error": str(exc)})
-                    if abs_path in known:
-                        # Keep existing entry but mark error
-                        preserved = known[abs_path]
-                        retry_count = preserved.get("retry_count", 0) + 1
-                        info = FileInfo(
-                            path=abs_path, # Preserve path
-                            filename=preserved.get("filename", ""),
-                            extension=preserved.get("extension", ""),
-                            size_bytes=int(preserved.get("size_bytes", 0)),
-                            modified_time=preserved.get("modified_time", ""),
-                            hash=preserved.get("hash", ""),
-                            doc_id=preserved.get("doc_id"),
-                            source_id=preserved.get("source_id"),
-                            status="error",
-                            last_seen=preserved.get("last_seen"),
-                            retry_count=retry_count
-                        )
-                        current_scan[abs_path] = info
-        
+                    self._record_scan_error(abs_path, exc, known, current_scan, changes)
+
         # 2. Identify Missing (Sweep Phase Setup)
         missing_paths = set(known.keys()) - set(current_scan.keys())
+        if scoped:
+            missing_paths = {path for path in missing_paths if _within(path, roots)}
         potential_renames = {} # hash -> list[FileInfo]
 
         # 3. Process Changes
@@ -107,10 +220,18 @@ class CrawlerAgent(AgentBase):
                      # Don't re-ingest errors, just update manifest status
                      # We treat as 'unchanged' for diff purposes but will update manifest
                      pass 
-                elif force or prev.get("hash") != info.hash:
+                elif force or not self._same_content(prev, info, previous_digests.get(path)):
                     changes.modified_files.append(info)
                 else:
                     changes.unchanged_files += 1
+                    if (
+                        (prev.get("size_bytes"), prev.get("mtime_ns"), prev.get("inode"), prev.get("hash_algorithm", "sha256"))
+                        != (info.size_bytes, info.mtime_ns, info.inode, info.hash_algorithm)
+                    ):
+                        # Same content, new stat or hash algorithm (touch, copy,
+                        # legacy entry): record it so the next crawl can skip hashing
+                        info.versions = prev.get("versions", [])
+                        changes.refreshed_files.append(info)
             else:
                 # Potential new file - buffer for rename check
                 potential_renames.setdefault(info.hash, []).append(info)
@@ -190,6 +311,7 @@ class CrawlerAgent(AgentBase):
             changes.deleted_files = []
             changes.modified_files = []
             changes.new_files = []
+            changes.refreshed_files = []
 
         result = self.quality_check(
             AgentResult(
@@ -15,12 +15,13 @@ class GraphBuilderAgent(AgentBase):
     def execute(self, request: dict) -> AgentResult:
         doc = request["document"]
         metadata = request.get("metadata", {})
-        graph = self.builder.upsert_document(doc, metadata)
+        self.builder.upsert_document(doc, metadata)
+        node_count, edge_count = self.builder.store.counts()
         return self.quality_check(
             AgentResult(
                 success=True,
                 confidence=0.95,
-                data={"graph_nodes": graph.number_of_nodes(), "graph_edges": graph.number_of_edges()},
+                data={"graph_nodes": node_count, "graph_edges": edge_count},
                 reasoning="Upserted document nodes and relationships in knowledge graph.",
             )
         )
@@ -4,29 +4,61 @@ import json
 import logging
 import os
 import sys
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
-from backend.common.models import AgentResult, IngestedDocument
-from backend.common.text_utils import clean_text
+from backend.common.hashing import sha256_text
+from backend.common.models import AgentResult, IngestedDocument, PreparedDocument
+from backend.common.text_utils import PAGE_SEPARATOR, clean_text, joined_length, read_content_pages
 # All converters are bundled in the self-contained build
 from backend.ingestion import (
     convert_html, convert_json,
     extract_json_metadata, extract_image_refs,
     convert_yaml, convert_ini, convert_csv,
     convert_doc, convert_docx, convert_pdf, convert_pptx, convert_png,
+    iter_pdf_pages,
     extract_entities_and_keyphrases,
+    extract_entities_and_keyphrases_batch,
 )
+from backend.ingestion.ner_cache import NERCache
+from backend.ingestion.pipeline import Stage, run_pipeline
 from backend.ingestion.regime_classifier import RegimeClassifier
 from backend.common.doc_types import normalize_doc_type
-from backend.vector import VectorStore, chunk_document
-from backend.vector.legal_chunker import chunk_legal_document
+from backend.vector import VectorStore, chunk_document, chunk_pages
+from backend.vector.legal_chunker import chunk_legal_document, chunk_legal_pages
 from backend.vector.embedding_provider import get_embedding_provider
 from .base_agent import AgentBase
 
 logger = logging.getLogger(__name__)
 
 
+def _progress(msg):
+    """Emit progress to stderr so the extension output channel shows real-time updates."""
+    print(f"[Ingestion] {msg}", file=sys.stderr, flush=True)
+
+
+def _trace(trace: list[dict], name: str, message: str, **kwargs) -> None:
+    """Record an explainability step to be replayed by ``commit``."""
+    trace.append({"name": name, "message": message, "kwargs": kwargs})
+
+
+# Per-process agent used by ``prepare_in_worker`` (set by ``init_prepare_worker``).
+_worker_agent: "IngestionAgent | None" = None
+
+
+def init_prepare_worker(config) -> None:
+    """ProcessPoolExecutor initializer: build one IngestionAgent per worker."""
+    global _worker_agent
+    _worker_agent = IngestionAgent(config)
+
+
+def prepare_in_worker(request: dict) -> tuple[PreparedDocument | None, AgentResult | None]:
+    """Run ``IngestionAgent.prepare`` inside a pool worker."""
+    return _worker_agent.prepare(request)
+
+
 class IngestionAgent(AgentBase):
     agent_name = "ingestion-agent"
 
@@ -34,10 +66,46 @@ class IngestionAgent(AgentBase):
         super().__init__(config)
         # Initialize embedding provider from config (supports BGE ONNX or legacy MiniLM)
         self._embedding_provider = get_embedding_provider(config)
-        self.vector_store = VectorStore(
-            config.chroma_persist_dir,
-            embedding_provider=self._embedding_provider
-        )
+        # Opened on first use so ``prepare`` workers never touch ChromaDB.
+        # The lock keeps the CLI's prefetch thread and the committing thread
+        # from each opening their own store.
+        self._vector_store: VectorStore | None = None
+        self._ner_cache: NERCache | None = None
+        self._open_lock = threading.Lock()
+
+    @property
+    def vector_store(self) -> VectorStore:
+        if self._vector_store is None:
+            with self._open_lock:
+                if self._vector_store is None:
+                    self._vector_store = VectorStore(
+                        self.config.chroma_persist_dir,
+                        embedding_provider=self._embedding_provider
+                    )
+        return self._vector_store
+
+    @vector_store.setter
+    def vector_store(self, store: VectorStore) -> None:
+        self._vector_store = store
+
+    @property
+    def ner_cache(self) -> NERCache | None:
+        """Persistent NER result cache, or ``None`` when NER or the cache is disabled/unavailable."""
+        if (
+            self._ner_cache is None
+            and getattr(self.config, 'ner_enabled', False)
+            and getattr(self.config, 'ner_cache_enabled', True)
+        ):
+            with self._open_lock:
+                if self._ner_cache is None:
+                    try:
+                        self._ner_cache = NERCache(
+                            getattr(self.config, 'ner_cache_path', f"{self.config.knowledge_base_path}/cache/ner_cache.db"),
+                            max_entries=getattr(self.config, 'ner_cache_max_entries', 200_000),
+                        )
+                    except Exception as e:
+                        logger.debug(f"NER cache unavailable: {e}")
+        return self._ner_cache
 
     # ------------------------------------------------------------------
     # NER helper – uses bundled extract_entities_and_keyphrases directly
@@ -45,11 +113,25 @@ class IngestionAgent(AgentBase):
     def _extract_ner(self, text: str, max_keyphrases: int = None):
         """Extract entities and keyphrases using bundled spaCy model."""
         try:
-            return extract_entities_and_keyphrases(text, max_keyphrases=max_keyphrases)
+            return extract_entities_and_keyphrases(text, max_keyphrases=max_keyphrases, cache=self.ner_cache)
         except Exception as e:
             logger.debug(f"NER extraction skipped: {e}")
             return None
 
+    def _extract_ner_batch(self, texts: list[str], max_keyphrases: int = None):
+        """Batch variant of ``_extract_ner`` (one ``nlp.pipe`` run for all texts)."""
+        try:
+            return extract_entities_and_keyphrases_batch(
+                texts,
+                max_keyphrases=max_keyphrases,
+                batch_size=getattr(self.config, 'ner_batch_size', 64),
+                n_process=getattr(self.config, 'ner_n_process', 1),
+                cache=self.ner_cache,
+            )
+        except Exception as e:
+            logger.debug(f"Batch NER extraction skipped: {e}")
+            return None
+
     # ------------------------------------------------------------------
     # Phase 6 — Hierarchical item extraction + dual store + graph
     # ------------------------------------------------------------------
@@ -57,12 +139,19 @@ class IngestionAgent(AgentBase):
         self,
         doc_id: str,
         doc_regime: str,
-        text: str,
+        text: str | None,
         source_path: Path,
+        read_pages=None,
     ) -> dict:
         """Run Phase 6 ingestion: extract items, build hierarchical graph,
         and populate the dual vector store.
 
+        Streamed PDFs pass *read_pages* (a callable returning the
+        ``(page_number, text)`` pages of content.md) instead of *text*:
+        sections are assembled from the pages without first joining the
+        document.  The graph builder takes every section at once, so their
+        text is still held together (about one copy of the document).
+
         Returns stats dict or None on failure.
         """
         try:
@@ -86,7 +175,11 @@ class IngestionAgent(AgentBase):
                 min_chunk_size=getattr(self.config, 'legal_min_chunk_size', 500),
                 max_chunk_size=getattr(self.config, 'legal_max_chunk_size', 5000),
             )
-            raw_sections = chunker.extract_sections(text)
+            if read_pages is not None:
+                headings = chunker.scan_page_headings(read_pages())
+                raw_sections = list(chunker.iter_page_sections(read_pages(), headings, with_children=False))
+            else:
+                raw_sections = chunker.extract_sections(text)
             if not raw_sections:
                 # Fallback: treat entire document as one section
                 raw_sections = []
@@ -101,6 +194,8 @@ class IngestionAgent(AgentBase):
                     })
             else:
                 # No structured sections found — treat entire text as one section
+                if text is None:
+                    text = PAGE_SEPARATOR.join(page for _, page in read_pages())
                 sections = [{"section_number": "1", "section_heading": source_path.stem, "section_text": text}]
             if verbose:
                 logger.info("[Phase6] Found %d sections", len(sections))
@@ -230,19 +325,65 @@ class IngestionAgent(AgentBase):
 
         raise ValueError(f"Unsupported extension: {extension}")
 
+    def _stream_pdf(
+        self,
+        source_path: Path,
+        content_path: Path,
+        images_dir: str,
+        sample_chars: int,
+    ) -> tuple[str, list[tuple[int, int]], list[str], int]:
+        """Convert a PDF page by page, appending each cleaned page to *content_path*.
+
+        Only one page plus a leading sample of at most *sample_chars* is
+        held in memory.  Blank pages are dropped.  Returns ``(sample,
+        page_spans, image_paths, word_count)`` where *page_spans* lists
+        ``(page_number, chars)`` for every page written, in order.
+        """
+        sample_parts: list[str] = []
+        sampled = 0
+        page_spans: list[tuple[int, int]] = []
+        image_paths: list[str] = []
+        word_count = 0
+        with content_path.open("w", encoding="utf-8", newline="") as handle:
+            for page in iter_pdf_pages(str(source_path), images_dir=images_dir):
+                image_paths.extend(page.image_paths)
+                page_text = clean_text(page.text)
+                if not page_text:
+                    continue
+                if page_spans:
+                    handle.write(PAGE_SEPARATOR)
+                handle.write(page_text)
+                page_spans.append((page.number, len(page_text)))
+                word_count += len(page_text.split())
+                if sampled < sample_chars:
+                    piece = (PAGE_SEPARATOR if sample_parts else "") + page_text
+                    piece = piece[:sample_chars - sampled]
+                    sample_parts.append(piece)
+                    sampled += len(piece)
+        return "".join(sample_parts), page_spans, image_paths, word_count
+
     def execute(self, request: dict) -> AgentResult:
+        prepared, failure = self.prepare({"embed": True, **request})
+        if failure is not None:
+            return failure
+        return self.commit(prepared)
+
+    def prepare(self, request: dict) -> tuple[PreparedDocument | None, AgentResult | None]:
+        """CPU-bound half of ingestion: convert, clean, NER, classify and chunk.
+
+        Only writes to the document's staging folder — never to the vector
+        store or graph — so it is safe to run in a worker process (see
+        ``prepare_in_worker``).  Returns ``(prepared, None)`` on success or
+        ``(None, failure_result)``.
+        """
         import shutil
-        import sys
-        import tempfile
-        from backend.common.explainability import ExplainabilityLogger
 
-        def _progress(msg):
-            """Emit progress to stderr so the extension output channel shows real-time updates."""
-            print(f"[Ingestion] {msg}", file=sys.stderr, flush=True)
+        started = time.perf_counter()
+        trace: list[dict] = []
 
         source_path = Path(request["path"]).resolve()
         if not source_path.exists() or not source_path.is_file():
-            return AgentResult(success=False, confidence=0.1, data={"error": f"file_not_found:{source_path}"}, reasoning="Source file not found.")
+            return None, AgentResult(success=False, confidence=0.1, data={"error": f"file_not_found:{source_path}"}, reasoning="Source file not found.")
 
         # Detect large documents early for adaptive behavior
         file_size_mb = source_path.stat().st_size / (1024 * 1024)
@@ -253,9 +394,6 @@ class IngestionAgent(AgentBase):
         provided_doc_id = request.get("doc_id")
         doc_id = provided_doc_id or f"doc_{abs(hash(str(source_path))) % 10_000_000:07d}"
 
-        # ── Explainability Logger ──────────────────────────────────
-        xlog = ExplainabilityLogger("ingestion", doc_id=doc_id, verbose=getattr(self.config, 'phase6_verbose_logging', True))
-
         # Atomic Write Strategy
         # 1. Prepare Staging (must exist before _convert so images can be extracted into it)
         staging_dir = Path(self.config.knowledge_base_path) / "staging" / doc_id
@@ -263,31 +401,48 @@ class IngestionAgent(AgentBase):
             shutil.rmtree(staging_dir)
         staging_dir.mkdir(parents=True, exist_ok=True)
 
-        final_doc_dir = Path(self.config.knowledge_base_path) / "documents" / doc_id
-        final_images_dir = final_doc_dir / "images"
         staging_images_dir = staging_dir / "images"
         staging_images_dir.mkdir(parents=True, exist_ok=True)
 
+        content_path = staging_dir / "content.md"
+
+        # PDFs are streamed page by page straight into content.md; ``text``
+        # is then only a bounded leading sample (see ``_stream_pdf``).
+        stream_pdf = source_path.suffix.lower() == ".pdf" and bool(getattr(self.config, 'pdf_streaming_enabled', True))
+        page_spans: list[tuple[int, int]] | None = None
+
         try:
             _progress(f"Step 1/6: Converting {source_path.suffix} document...")
-            raw_text, raw_image_refs = self._convert(source_path, images_dir=str(staging_images_dir))
+            if stream_pdf:
+                text, page_spans, raw_image_refs, word_count = self._stream_pdf(
+                    source_path,
+                    content_path,
+                    images_dir=str(staging_images_dir),
+                    sample_chars=int(getattr(self.config, 'pdf_stream_sample_chars', 1_000_000)),
+                )
+            else:
+                raw_text, raw_image_refs = self._convert(source_path, images_dir=str(staging_images_dir))
         except Exception as exc:
-            return AgentResult(success=False, confidence=0.2, data={"error": str(exc)}, reasoning="Document conversion failed.")
+            return None, AgentResult(success=False, confidence=0.2, data={"error": str(exc)}, reasoning="Document conversion failed.")
 
-        text = clean_text(raw_text)
+        if page_spans is None:
+            text = clean_text(raw_text)
+            del raw_text
+            word_count = len(text.split())
         if not text:
-            return AgentResult(success=False, confidence=0.3, data={"error": "empty_document"}, reasoning="Extracted text is empty.")
+            return None, AgentResult(success=False, confidence=0.3, data={"error": "empty_document"}, reasoning="Extracted text is empty.")
 
-        text_len = len(text)
-        word_count = len(text.split())
+        if page_spans is None:
+            text_len = len(text)
+            content_path.write_text(text, encoding="utf-8")
+        else:
+            text_len = joined_length(page_spans)
         _progress(f"Step 2/6: Extracted {word_count:,} words ({text_len:,} chars), {len(raw_image_refs)} images")
 
-        xlog.step("convert", f"Converted {source_path.suffix} → plain text",
-                  detail={"extension": source_path.suffix, "chars": len(text), "images": len(raw_image_refs)},
-                  why="Extract machine-readable content from binary/markup format")
-
-        content_path = staging_dir / "content.md"
-        content_path.write_text(text, encoding="utf-8")
+        _trace(trace, "convert", f"Converted {source_path.suffix} → plain text",
+                      detail={"extension": source_path.suffix, "chars": text_len, "images": len(raw_image_refs),
+                              "pages": len(page_spans) if page_spans is not None else None},
+                      why="Extract machine-readable content from binary/markup format")
 
         # Enrich metadata
         json_metadata = {}
@@ -311,9 +466,9 @@ class IngestionAgent(AgentBase):
             except Exception as exc:
                 logger.debug("Regime classification failed: %s", exc)
 
-        xlog.step("classify", f"Document regime: {doc_regime}",
-                  detail={"regime": doc_regime, "filename": source_path.name},
-                  why="Route to domain-specific chunking and extraction strategies")
+        _trace(trace, "classify", f"Document regime: {doc_regime}",
+                      detail={"regime": doc_regime, "filename": source_path.name},
+                      why="Route to domain-specific chunking and extraction strategies")
 
         # ── Content-level date extraction (Gap 6) ──────────────────
         content_date = None
@@ -350,7 +505,7 @@ class IngestionAgent(AgentBase):
             "tools": json_metadata.get("tool_names", []),
             "topics": [],
             "processes": [],
-            "word_count": len(text.split()),
+            "word_count": word_count,
             "version": int(request.get("version", 1)),
         }
 
@@ -382,6 +537,199 @@ class IngestionAgent(AgentBase):
                 image_paths.append(ref)
                 seen.add(resolved)
 
+        _progress("Step 4/6: Chunking document...")
+        
+        # ── Intelligent Chunking Strategy ──────────────────────────
+        # For legal/governing documents: use section-aware semantic chunking
+        # to preserve document structure and reduce over-fragmentation.
+        # For other documents: use traditional character-based chunking.
+        
+        use_legal_chunking = (
+            doc_regime == "GOVERNING_DOC_LEGAL" and 
+            getattr(self.config, 'section_aware_chunking_enabled', True)
+        )
+        
+        if use_legal_chunking:
+            # Semantic section-aware chunking for legal documents
+            logger.info("Using legal semantic chunking for %s", source_path.name)
+            if page_spans is None:
+                chunks = chunk_legal_document(
+                    doc_id=doc_id,
+                    source_path=str(source_path),
+                    text=text,
+                    min_chunk_size=getattr(self.config, 'legal_min_chunk_size', 500),
+                    max_chunk_size=getattr(self.config, 'legal_max_chunk_size', 5000),
+                )
+            else:
+                chunks = list(chunk_legal_pages(
+                    doc_id=doc_id,
+                    source_path=str(source_path),
+                    read_pages=lambda: read_content_pages(content_path, page_spans),
+                    min_chunk_size=getattr(self.config, 'legal_min_chunk_size', 500),
+                    max_chunk_size=getattr(self.config, 'legal_max_chunk_size', 5000),
+                    window_chars=int(getattr(self.config, 'pdf_stream_window_chars', 200_000)),
+                ))
+        else:
+            # Traditional character-based chunking
+            # Regime-adaptive chunk sizing: legal docs use larger chunks even in fallback
+            effective_chunk_size = self.config.chunk_size
+            effective_chunk_overlap = self.config.chunk_overlap
+            if doc_regime == "GOVERNING_DOC_LEGAL":
+                effective_chunk_size = getattr(self.config, 'legal_chunk_size', 3000)
+                effective_chunk_overlap = getattr(self.config, 'legal_chunk_overlap', 500)
+                logger.info("Using legal chunk sizing: %d/%d for %s",
+                            effective_chunk_size, effective_chunk_overlap, source_path.name)
+
+            # ── Large-doc adaptive chunk sizing ────────────────────
+            # For documents >20 MB (extracted), use bigger chunks to reduce
+            # embedding count and stay within reasonable time budgets.
+            if is_large_doc and doc_regime != "GOVERNING_DOC_LEGAL":
+                # Scale chunk size: 2K base, +500 per 10 MB, cap at 5K
+                effective_chunk_size = min(2000 + int(file_size_mb / 10) * 500, 5000)
+                effective_chunk_overlap = min(effective_chunk_size // 4, 500)
+                _progress(f"Large-doc adaptive chunks: size={effective_chunk_size}, overlap={effective_chunk_overlap}")
+
+            if page_spans is None:
+                chunks = chunk_document(
+                    doc_id=doc_id,
+                    source_path=str(source_path),
+                    text=text,
+                    chunk_size=effective_chunk_size,
+                    chunk_overlap=effective_chunk_overlap,
+                )
+            else:
+                chunks = list(chunk_pages(
+                    doc_id=doc_id,
+                    source_path=str(source_path),
+                    pages=read_content_pages(content_path, page_spans),
+                    chunk_size=effective_chunk_size,
+                    chunk_overlap=effective_chunk_overlap,
+                    window_chars=int(getattr(self.config, 'pdf_stream_window_chars', 200_000)),
+                ))
+        
+        chunking_method = "semantic-legal" if use_legal_chunking else "character-based"
+        logger.info("Generated %d chunks for %s (method=%s)",
+                    len(chunks), source_path.name, chunking_method)
+        _progress(f"Step 4/6: Generated {len(chunks)} chunks")
+
+        _trace(trace, "chunk", f"Generated {len(chunks)} chunks ({chunking_method})",
+                      detail={"chunk_count": len(chunks), "method": chunking_method},
+                      why="Split document into retrieval-friendly segments preserving semantic boundaries")
+        
+        # Per-chunk NER (+ embedding of new content when this process owns the store)
+        embeddings, pipeline_report = self._enrich_chunks(doc_id, chunks, embed=bool(request.get("embed")))
+
+        return PreparedDocument(
+            doc_id=doc_id,
+            source_path=str(source_path),
+            staging_dir=str(staging_dir),
+            text=text,
+            metadata=metadata,
+            chunks=chunks,
+            chunking_method=chunking_method,
+            image_paths=image_paths,
+            trace=trace,
+            prepare_seconds=time.perf_counter() - started,
+            embeddings=embeddings,
+            pipeline=pipeline_report,
+            streamed=page_spans is not None,
+            page_spans=page_spans or [],
+        ), None
+
+    def _annotate_chunk_ner(self, chunks) -> list:
+        """Attach per-chunk entities/keyphrases (one ``nlp.pipe`` run per call)."""
+        chunk_results = self._extract_ner_batch([chunk.content for chunk in chunks], max_keyphrases=5) or []
+        for chunk, chunk_ner in zip(chunks, chunk_results):
+            chunk.entities = [
+                {"text": e.text, "label": e.label} for e in chunk_ner.entities
+            ]
+            chunk.keyphrases = [
+                {"text": k.text, "score": k.score} for k in chunk_ner.keyphrases
+            ]
+        return chunks
+
+    def _enrich_chunks(self, doc_id: str, chunks, embed: bool) -> tuple[dict, dict]:
+        """Run per-chunk NER and embedding as a streaming pipeline.
+
+        Batches of chunks flow from a spaCy stage to an embedding stage over
+        bounded queues (``run_pipeline``), so NER on one batch overlaps the
+        ONNX forward pass on the previous one.  Only content not already
+        stored for *doc_id* is embedded; ``commit`` reuses the vectors.
+        Embedding needs the vector store, so it is skipped unless *embed*
+        (never set for ``prepare_in_worker``).
+
+        Returns ``(embeddings by content hash, pipeline report)``.
+        """
+        ner_enabled = getattr(self.config, 'ner_enabled', True)
+        pipelined = getattr(self.config, 'ingest_pipeline_enabled', True)
+        stages: list[Stage] = []
+        if ner_enabled:
+            if pipelined and int(getattr(self.config, 'ner_n_process', 1)) <= 1:
+                stages.append(Stage("ner", self._annotate_chunk_ner))
+            else:
+                # Multi-process spaCy (or pipeline off): one whole-document run
+                _progress(f"Extracting NER for {len(chunks)} chunks...")
+                self._annotate_chunk_ner(chunks)
+
+        embeddings: dict = {}
+        if embed and pipelined and chunks:
+            try:
+                stored = self.vector_store.content_hashes(doc_id)
+            except Exception as e:
+                logger.debug(f"Stored chunk hashes unavailable for {doc_id}: {e}")
+                stored = None
+
+            def embed_batch(batch):
+                pending = {}
+                for chunk in batch:
+                    digest = sha256_text(chunk.content)
+                    if digest not in stored and digest not in embeddings:
+                        pending[digest] = chunk.content
+                if pending:
+                    embeddings.update(zip(pending, self.vector_store.embed_documents(list(pending.values()))))
+                return batch
+
+            if stored is not None:
+                stages.append(Stage("embed", embed_batch))
+
+        if not stages or not chunks:
+            return embeddings, {}
+        batch_size = max(1, int(getattr(self.config, 'ingest_pipeline_batch_size', 32)))
+        batches = [chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size)]
+        _progress(f"Processing {len(chunks)} chunks through {'/'.join(s.name for s in stages)} pipeline...")
+        _, report = run_pipeline(batches, stages, queue_size=int(getattr(self.config, 'ingest_pipeline_queue_size', 4)))
+        _progress(
+            "Pipeline complete: "
+            + ", ".join(f"{name} {stats['utilization']:.0%} busy" for name, stats in report["stages"].items())
+        )
+        return embeddings, report
+
+    def commit(self, prepared: PreparedDocument) -> AgentResult:
+        """Writer half of ingestion: version, publish, upsert and Phase 6.
+
+        Must run in the process that owns the vector store and graph.
+        """
+        import shutil
+        from backend.common.explainability import ExplainabilityLogger
+
+        doc_id = prepared.doc_id
+        source_path = Path(prepared.source_path)
+        staging_dir = Path(prepared.staging_dir)
+        text = prepared.text
+        metadata = prepared.metadata
+        chunks = prepared.chunks
+        image_paths = list(prepared.image_paths)
+        doc_regime = metadata.get("doc_regime", "UNKNOWN")
+
+        # ── Explainability Logger ──────────────────────────────────
+        xlog = ExplainabilityLogger("ingestion", doc_id=doc_id, verbose=getattr(self.config, 'phase6_verbose_logging', True))
+        for entry in prepared.trace:
+            xlog.step(entry["name"], entry["message"], **entry["kwargs"])
+
+        final_doc_dir = Path(self.config.knowledge_base_path) / "documents" / doc_id
+        final_images_dir = final_doc_dir / "images"
+        metadata_path = staging_dir / "metadata.json"
+
         # 2. Versioning (Backup Old) — auto-increment version number
         if final_doc_dir.exists():
             current_version = 0
@@ -423,99 +771,29 @@ class IngestionAgent(AgentBase):
         ]
 
         # 4. Vector Store (Transaction)
-        # Delete OLD chunks first to prevent phantom artifacts
-        self.vector_store.delete_doc_chunks(doc_id)
-        
-        _progress("Step 4/6: Chunking document...")
-        
-        # ── Intelligent Chunking Strategy ──────────────────────────
-        # For legal/governing documents: use section-aware semantic chunking
-        # to preserve document structure and reduce over-fragmentation.
-        # For other documents: use traditional character-based chunking.
-        
-        use_legal_chunking = (
-            doc_regime == "GOVERNING_DOC_LEGAL" and 
-            getattr(self.config, 'section_aware_chunking_enabled', True)
+        # Diff against the stored chunk hashes: only new/edited text is
+        # embedded, and chunks that vanished are deleted (no phantom artifacts).
+        _progress(f"Step 5/6: Syncing {len(chunks)} chunks to vector store...")
+        vector_sync = self.vector_store.sync_doc_chunks(doc_id, chunks, embeddings=prepared.embeddings)
+        _progress(
+            f"Step 5/6: Vector store synced — {vector_sync['embedded']} embedded, "
+            f"{vector_sync['unchanged'] + vector_sync['reused']} reused, {vector_sync['deleted']} deleted"
         )
-        
-        if use_legal_chunking:
-            # Semantic section-aware chunking for legal documents
-            logger.info("Using legal semantic chunking for %s", source_path.name)
-            chunks = chunk_legal_document(
-                doc_id=doc_id,
-                source_path=str(source_path),
-                text=text,
-                min_chunk_size=getattr(self.config, 'legal_min_chunk_size', 500),
-                max_chunk_size=getattr(self.config, 'legal_max_chunk_size', 5000),
-            )
-        else:
-            # Traditional character-based chunking
-            # Regime-adaptive chunk sizing: legal docs use larger chunks even in fallback
-            effective_chunk_size = self.config.chunk_size
-            effective_chunk_overlap = self.config.chunk_overlap
-            if doc_regime == "GOVERNING_DOC_LEGAL":
-                effective_chunk_size = getattr(self.config, 'legal_chunk_size', 3000)
-                effective_chunk_overlap = getattr(self.config, 'legal_chunk_overlap', 500)
-                logger.info("Using legal chunk sizing: %d/%d for %s",
-                            effective_chunk_size, effective_chunk_overlap, source_path.name)
 
-            # ── Large-doc adaptive chunk sizing ────────────────────
-            # For documents >20 MB (extracted), use bigger chunks to reduce
-            # embedding count and stay within reasonable time budgets.
-            if is_large_doc and doc_regime != "GOVERNING_DOC_LEGAL":
-                # Scale chunk size: 2K base, +500 per 10 MB, cap at 5K
-                effective_chunk_size = min(2000 + int(file_size_mb / 10) * 500, 5000)
-                effective_chunk_overlap = min(effective_chunk_size // 4, 500)
-                _progress(f"Large-doc adaptive chunks: size={effective_chunk_size}, overlap={effective_chunk_overlap}")
-
-            chunks = chunk_document(
-                doc_id=doc_id,
-                source_path=str(source_path),
-                text=text,
-                chunk_size=effective_chunk_size,
-                chunk_overlap=effective_chunk_overlap,
-            )
-        
-        logger.info("Generated %d chunks for %s (method=%s)", 
-                    len(chunks), source_path.name, 
-                    "semantic-legal" if use_legal_chunking else "character-based")
-        _progress(f"Step 4/6: Generated {len(chunks)} chunks")
-
-        xlog.step("chunk", f"Generated {len(chunks)} chunks ({('semantic-legal' if use_legal_chunking else 'character-based')})",
-                  detail={"chunk_count": len(chunks), "method": "semantic-legal" if use_legal_chunking else "character-based"},
-                  why="Split document into retrieval-friendly segments preserving semantic boundaries")
-        
-        # Extract entities/keyphrases per-chunk if NER enabled
-        if getattr(self.config, 'ner_enabled', True):
-            _progress(f"Extracting NER for {len(chunks)} chunks...")
-            for i, chunk in enumerate(chunks):
-                chunk_ner = self._extract_ner(chunk.content, max_keyphrases=5)
-                if chunk_ner:
-                    chunk.entities = [
-                        {"text": e.text, "label": e.label} for e in chunk_ner.entities
-                    ]
-                    chunk.keyphrases = [
-                        {"text": k.text, "score": k.score} for k in chunk_ner.keyphrases
-                    ]
-                if (i + 1) % 50 == 0:
-                    _progress(f"NER progress: {i + 1}/{len(chunks)} chunks")
-        
-        _progress(f"Step 5/6: Embedding and upserting {len(chunks)} chunks...")
-        self.vector_store.upsert_chunks(chunks)
-        _progress(f"Step 5/6: Upserted {len(chunks)} chunks to vector store")
-
-        xlog.step("vector_upsert", f"Upserted {len(chunks)} chunks to vector store",
-                  detail={"chunk_count": len(chunks)},
-                  why="Index chunks for semantic similarity retrieval")
+        xlog.step("vector_upsert", f"Synced {len(chunks)} chunks to vector store",
+                  detail={"chunk_count": len(chunks), **vector_sync},
+                  why="Index chunks for semantic similarity retrieval, re-embedding only changed content")
 
         # ── Phase 6: Hierarchical GraphRAG Pipeline (ALWAYS RUN) ───
         # Phase 6 is now the primary architecture — no conditional needed
         _progress("Step 6/6: Building hierarchical graph + dual vector store...")
+        final_content_path = final_doc_dir / "content.md"
         phase6_stats = self._run_phase6_pipeline(
             doc_id=doc_id,
             doc_regime=doc_regime,
-            text=text,
+            text=None if prepared.streamed else text,
             source_path=source_path,
+            read_pages=(lambda: read_content_pages(final_content_path, prepared.page_spans)) if prepared.streamed else None,
         )
         if phase6_stats:
             xlog.step("phase6", "Hierarchical GraphRAG pipeline complete",
@@ -531,6 +809,8 @@ class IngestionAgent(AgentBase):
             metadata_path=str(final_doc_dir / "metadata.json"),
             images_dir=str(final_images_dir),
             extracted_text=text,
+            extracted_text_truncated=prepared.streamed and len(text) < joined_length(prepared.page_spans),
+            page_spans=prepared.page_spans,
             image_paths=image_paths,
             chunk_count=len(chunks),
             word_count=metadata["word_count"],
@@ -549,7 +829,7 @@ class IngestionAgent(AgentBase):
             AgentResult(
                 success=True,
                 confidence=confidence,
-                data={"document": ingested, "chunk_count": len(chunks), "word_count": metadata["word_count"], "extracted_image_count": len(image_paths)},
+                data={"document": ingested, "chunk_count": len(chunks), "word_count": metadata["word_count"], "extracted_image_count": len(image_paths), "prepare_seconds": prepared.prepare_seconds, "vector_sync": vector_sync, "pipeline": prepared.pipeline},
                 reasoning="Ingested source document into local knowledge base and vector index.",
             )
         )
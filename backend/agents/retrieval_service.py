@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import replace
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -9,7 +12,7 @@ import networkx as nx
 
 from backend.common.models import AgentResult, Citation, SearchResult, TextChunk
 from backend.common.doc_types import normalize_doc_type
-from backend.graph import GraphQueries, GraphStore
+from backend.graph import ConceptIndex, GraphQueries, GraphStore
 from backend.retrieval.evidence_matcher import (
     EvidenceMatcher,
     ProvenanceError,
@@ -22,7 +25,17 @@ from backend.retrieval.term_resolver import (
 )
 from backend.retrieval.query_expander import QueryExpander
 from backend.retrieval.acronym_resolver import AcronymResolver
+from backend.retrieval.query_cache import QueryResultCache, make_key
+from backend.retrieval.rerank import rerank_rows, select_for_cross_encoder
+from backend.retrieval.query_context import (
+    QueryContext,
+    extract_error_codes,
+    has_legal_term,
+    normalize_entity,
+    query_terms,
+)
 from backend.vector import VectorStore
+from backend.vector.embedding_provider import get_embedding_provider
 from backend.retrieval.cross_encoder import rerank as cross_encoder_rerank
 from .base_agent import AgentBase
 
@@ -34,8 +47,23 @@ class RetrievalService(AgentBase):
 
     def __init__(self, config):
         super().__init__(config)
-        self.vector_store = VectorStore(config.chroma_persist_dir)
+        self.vector_store = VectorStore(
+            config.chroma_persist_dir,
+            query_embedding_cache_size=getattr(config, 'query_embedding_cache_size', 512),
+            embedding_provider=get_embedding_provider(config),
+        )
         self.graph_store = GraphStore(config.graph_path)
+        # Results of repeated queries, invalidated by corpus generation
+        self.query_cache = (
+            QueryResultCache(
+                max_entries=getattr(config, 'query_cache_max_entries', 256),
+                ttl_seconds=getattr(config, 'query_cache_ttl_seconds', 600.0),
+            )
+            if getattr(config, 'query_cache_enabled', True)
+            else None
+        )
+        # Worker threads for concurrent multi-query variant searches (lazy)
+        self._variant_pool: ThreadPoolExecutor | None = None
         
         # Configurable ranking weights (tunable via environment or config)
         self.weights = {
@@ -57,15 +85,7 @@ class RetrievalService(AgentBase):
 
     def _extract_error_codes(self, text: str) -> List[str]:
         """Extract error codes from text (ERR-XXX-000, HTTP 504, AUTH401, etc.)"""
-        patterns = [
-            r'\bERR-[A-Z]+-\d{3}\b',     # ERR-UPL-013, ERR-PWD-007
-            r'\bHTTP\s*\d{3}\b',         # HTTP 504, HTTP 401
-            r'\b[A-Z]+\d{3,4}\b',        # AUTH401, XYZ999
-        ]
-        codes = []
-        for pattern in patterns:
-            codes.extend(re.findall(pattern, text, re.IGNORECASE))
-        return [c.upper() for c in codes]
+        return extract_error_codes(text)
     
     def _detect_query_intent(self, query: str) -> Tuple[str, List[str]]:
         """
@@ -146,47 +166,85 @@ class RetrievalService(AgentBase):
         # Default: general query
         return ("general", ["USER_GUIDE", "TROUBLESHOOT"])
     
-    def _compute_feature_scores(self, query: str, row: dict, disable_intent: bool = False) -> Dict[str, float]:
-        """Compute feature-based scores for a search result"""
-        features = {}
+    def _build_query_context(
+        self,
+        query: str,
+        disable_intent: bool = False,
+        concept_nodes: list[str] | None = None,
+    ) -> QueryContext:
+        """Precompute everything feature scoring needs from the query alone.
+
+        Built once per request and passed to ``_compute_feature_scores`` so
+        per-row scoring does not re-run intent regexes, term extraction or
+        query NER.
+        """
         query_lower = query.lower()
-        row_type = str(row.get("doc_type", "UNKNOWN"))
+        intent, expected_doc_types = self._detect_query_intent(query)
+        terms = query_terms(query_lower)
+
+        entity_texts: set[str] = set()
+        keyphrase_texts: set[str] = set()
+        if getattr(self.config, 'ner_enabled', False):
+            entity_texts = {
+                normalize_entity(e["text"]) for e in self._extract_query_entities(query) if isinstance(e, dict)
+            }
+            keyphrase_texts = {
+                kp["text"].lower() for kp in self._extract_query_keyphrases(query) if isinstance(kp, dict)
+            }
+
+        return QueryContext(
+            query=query,
+            query_lower=query_lower,
+            error_codes=set(extract_error_codes(query)),
+            intent=intent,
+            expected_doc_types=expected_doc_types,
+            intent_enabled=not disable_intent,
+            terms=terms,
+            entity_texts=entity_texts,
+            keyphrase_texts=keyphrase_texts,
+            legal_term_hit=has_legal_term(query_lower),
+            concept_nodes=list(concept_nodes or []),
+        )
+
+    def _compute_feature_scores(
+        self,
+        query: str,
+        row: dict,
+        disable_intent: bool = False,
+        ctx: QueryContext | None = None,
+    ) -> Dict[str, float]:
+        """Compute feature-based scores for a search result.
+
+        Pass a prebuilt *ctx* when scoring many rows for the same query;
+        without one the query side is recomputed for this row.
+        """
+        if ctx is None:
+            ctx = self._build_query_context(query, disable_intent=disable_intent)
+
+        features = {}
         content = str(row.get("content", ""))
         doc_name = str(row.get("source_path", ""))
         
-        # Extract error codes from query and document
-        query_error_codes = self._extract_error_codes(query)
-        doc_error_codes = self._extract_error_codes(content + " " + doc_name)
-        
         # Feature 0: Entity overlap (NER-aware scoring)
-        features["entity_overlap"] = self._compute_entity_overlap(query, row)
-        
-        # Feature 1: Exact error code match
-        if query_error_codes:
-            exact_match = any(code in doc_error_codes for code in query_error_codes)
+        features["entity_overlap"] = self._compute_entity_overlap(query, row, ctx)
+        
+        # Feature 1: Exact error code match (doc side only scanned when the query has codes)
+        if ctx.error_codes:
+            doc_text = content + " " + doc_name
+            doc_text_upper = doc_text.upper()
+            # A matching code must occur verbatim in the text; only then run the patterns
+            exact_match = any(code in doc_text_upper for code in ctx.error_codes) and any(
+                code in ctx.error_codes for code in extract_error_codes(doc_text)
+            )
             features["error_code_exact_match"] = 1.0 if exact_match else 0.0
         else:
             features["error_code_exact_match"] = 0.0
         
         # Feature 2: Intent-based doc_type match
-        if disable_intent:
-            features["intent_doc_type_match"] = 0.0
-        else:
-            intent, expected_doc_types = self._detect_query_intent(query)
-            if row_type in expected_doc_types:
-                rank = expected_doc_types.index(row_type)
-                base_feature = 1.0 / (rank + 1)
-                high_confidence_intents = ["reference_catalog", "ui_page_access", "file_capability"]
-                if intent in high_confidence_intents:
-                    base_feature *= 1.5
-                features["intent_doc_type_match"] = base_feature
-            else:
-                features["intent_doc_type_match"] = 0.0
+        features["intent_doc_type_match"] = ctx.intent_match(str(row.get("doc_type", "UNKNOWN")))
         
         # Feature 3: Title/doc_name term matching
-        # Extract significant terms from query (length >= 3, not stopwords)
-        stopwords = {"the", "a", "an", "is", "are", "was", "were", "for", "to", "of", "in", "on", "at", "by"}
-        query_terms = [w for w in re.findall(r'\b\w{3,}\b', query_lower) if w not in stopwords]
+        query_terms = ctx.terms
         doc_name_lower = doc_name.lower()
         
         title_matches = sum(1 for term in query_terms if term in doc_name_lower)
@@ -194,41 +252,43 @@ class RetrievalService(AgentBase):
         
         # Feature 4: Query keyword density in content
         content_lower = content.lower()
-        content_matches = sum(1 for term in query_terms[:5] if term in content_lower)  # Top 5 terms
-        features["query_keyword_match"] = min(content_matches / max(min(len(query_terms), 5), 1), 1.0)
+        content_matches = sum(1 for term in ctx.top_terms if term in content_lower)  # Top 5 terms
+        features["query_keyword_match"] = min(content_matches / max(len(ctx.top_terms), 1), 1.0)
         
         # Feature 5: Image description penalty
         features["image_penalty"] = 1.0 if row.get("is_image_desc") else 0.0
         
         # Feature 6: Entity-based keyphrases (semantic match)
-        features["entity_keyphrase_match"] = self._compute_keyphrase_overlap(query, row)
+        features["entity_keyphrase_match"] = self._compute_keyphrase_overlap(query, row, ctx)
         
         return features
 
-    def _compute_graph_score(self, query: str, doc_id: str, G: nx.DiGraph) -> float:
+    def _compute_graph_score(
+        self,
+        query: str,
+        doc_id: str,
+        G: nx.DiGraph,
+        relevant_nodes: list[str] | None = None,
+    ) -> float:
         """Compute graph-based relevance boost using NetworkX O(1) look-ups.
 
-        Walks the graph to find concept / tool / error nodes whose *name*
-        appears in the query, then checks whether *doc_id* is connected to
-        those nodes via a typed edge.
+        Checks whether *doc_id* is connected via a typed edge to the concept /
+        tool / error nodes whose *name* appears in the query.  Callers scoring
+        many rows should resolve *relevant_nodes* once per query with
+        ``ConceptIndex``; otherwise it is resolved here.
         """
         if G is None or G.number_of_nodes() == 0:
             return 0.0
 
         score = 0.0
-        query_lower = query.lower()
         doc_node_id = f"doc:{doc_id}"
 
         if doc_node_id not in G:
             return 0.0
 
         # 1. Identify query-relevant concept nodes
-        relevant_nodes: list[str] = []
-        for node_id, attrs in G.nodes(data=True):
-            if attrs.get("type") in ("DEFINED_TERM", "TERM", "TOOL", "ERROR_CODE", "TOPIC", "CONCEPT"):
-                name = attrs.get("name", attrs.get("surface_form", "")).lower()
-                if name and name in query_lower:
-                    relevant_nodes.append(node_id)
+        if relevant_nodes is None:
+            relevant_nodes = ConceptIndex.for_graph(G).find(query)
 
         # 2. Score connections (O(1) per edge via nx adjacency)
         edge_weights = {
@@ -250,7 +310,7 @@ class RetrievalService(AgentBase):
 
         return min(score, getattr(self, '_graph_boost_cap', 0.7))  # Cap per TD §6.5
 
-    def _compute_entity_overlap(self, query: str, row: dict) -> float:
+    def _compute_entity_overlap(self, query: str, row: dict, ctx: QueryContext | None = None) -> float:
         """Compute entity overlap between query and chunk metadata.
         
         Uses NER-extracted entities from both query and chunk to compute
@@ -259,46 +319,22 @@ class RetrievalService(AgentBase):
         if not getattr(self.config, 'ner_enabled', False):
             return 0.0
         
-        # Extract entities from query (cached per query)
-        query_entities = self._extract_query_entities(query)
-        if not query_entities:
+        if ctx is None:
+            ctx = self._build_query_context(query)
+        query_entity_texts = ctx.entity_texts
+        if not query_entity_texts:
             return 0.0
         
         # Get chunk entities from row (entities/keyphrases are top-level keys after VectorStore.search() unpacks metadata)
-        chunk_entities_raw = row.get("entities", [])
-        
-        # Deserialize if stored as JSON string
-        if isinstance(chunk_entities_raw, str):
-            import json
-            try:
-                chunk_entities = json.loads(chunk_entities_raw)
-            except (json.JSONDecodeError, ValueError):
-                chunk_entities = []
-        else:
-            chunk_entities = chunk_entities_raw
-        
+        chunk_entities = self._row_ner_list(row, "entities")
         if not chunk_entities:
             return 0.0
         
         # Normalize entity text (lowercase, strip leading "the", remove possessive 's)
-        def normalize_entity(text: str) -> str:
-            normalized = text.lower().strip()
-            # Remove leading "the "
-            if normalized.startswith("the "):
-                normalized = normalized[4:]
-            # Remove possessive 's
-            if normalized.endswith("'s"):
-                normalized = normalized[:-2]
-            elif normalized.endswith("s'"):
-                normalized = normalized[:-2]
-            return normalized.strip()
-        
-        # Extract and normalize entity text
-        query_entity_texts = {normalize_entity(e["text"]) for e in query_entities if isinstance(e, dict)}
         chunk_entity_texts = {normalize_entity(e["text"]) for e in chunk_entities if isinstance(e, dict)}
         
         # Compute Jaccard overlap
-        if not query_entity_texts or not chunk_entity_texts:
+        if not chunk_entity_texts:
             return 0.0
         
         intersection = len(query_entity_texts & chunk_entity_texts)
@@ -307,7 +343,7 @@ class RetrievalService(AgentBase):
         
         return overlap
     
-    def _compute_keyphrase_overlap(self, query: str, row: dict) -> float:
+    def _compute_keyphrase_overlap(self, query: str, row: dict, ctx: QueryContext | None = None) -> float:
         """Compute keyphrase overlap between query and chunk.
         
         Uses NER-extracted keyphrases from both query and chunk.
@@ -316,29 +352,18 @@ class RetrievalService(AgentBase):
         if not getattr(self.config, 'ner_enabled', False):
             return 0.0
         
-        # Extract keyphrases from query
-        query_keyphrases = self._extract_query_keyphrases(query)
-        if not query_keyphrases:
+        if ctx is None:
+            ctx = self._build_query_context(query)
+        query_kp_texts = ctx.keyphrase_texts
+        if not query_kp_texts:
             return 0.0
         
         # Get chunk keyphrases from row (keyphrases are top-level keys after VectorStore.search() unpacks metadata)
-        chunk_keyphrases_raw = row.get("keyphrases", [])
-        
-        # Deserialize if stored as JSON string
-        if isinstance(chunk_keyphrases_raw, str):
-            import json
-            try:
-                chunk_keyphrases = json.loads(chunk_keyphrases_raw)
-            except (json.JSONDecodeError, ValueError):
-                chunk_keyphrases = []
-        else:
-            chunk_keyphrases = chunk_keyphrases_raw
-        
+        chunk_keyphrases = self._row_ner_list(row, "keyphrases")
         if not chunk_keyphrases:
             return 0.0
         
         # Extract keyphrase text (lowercase)
-        query_kp_texts = {kp["text"].lower() for kp in query_keyphrases if isinstance(kp, dict)}
         chunk_kp_texts = {kp["text"].lower() for kp in chunk_keyphrases if isinstance(kp, dict)}
         
         # Check for partial matches (e.g., "master servicer" in "master servicer obligations")
@@ -349,7 +374,19 @@ class RetrievalService(AgentBase):
                     matches += 1
                     break
         
-        return min(matches / len(query_kp_texts), 1.0) if query_kp_texts else 0.0
+        return min(matches / len(query_kp_texts), 1.0)
+
+    @staticmethod
+    def _row_ner_list(row: dict, key: str) -> list:
+        """Return the row's entity/keyphrase list, deserializing JSON-string metadata."""
+        raw = row.get(key, [])
+        if isinstance(raw, str):
+            import json
+            try:
+                return json.loads(raw)
+            except (json.JSONDecodeError, ValueError):
+                return []
+        return raw
     
     def _extract_query_entities(self, query: str) -> List[Dict[str, Any]]:
         """Extract entities from query using NER (cached)."""
@@ -558,7 +595,21 @@ class RetrievalService(AgentBase):
         
         expanded_chunks = []
         processed_chunk_ids = set()
-        
+
+        # One batched fetch covers the fixed window plus the two chunks that
+        # continuation expansion may look at beyond it.
+        neighbors = {}
+        if window_size > 0:
+            neighbors = self.vector_store.get_neighbors(
+                hit_chunks,
+                window=window_size,
+                lookahead=2 if continuation_enabled else 0,
+            )
+
+        def _neighbor(doc_id, idx):
+            row = neighbors.get((doc_id, idx))
+            return dict(row) if row is not None else None
+
         for hit in hit_chunks:
             doc_id = hit.get("doc_id")
             chunk_idx = int(hit.get("chunk_index", 0))
@@ -573,18 +624,10 @@ class RetrievalService(AgentBase):
                 continue
             
             # Strategy 1: Fixed Window Expansion
-            # Retrieve ±window_size chunks from vector store
-            start_idx = chunk_idx - window_size
-            end_idx = chunk_idx + window_size
-            
-            neighbor_chunks = self.vector_store.get_chunks_by_indices(
-                doc_id=doc_id,
-                start_index=start_idx,
-                end_index=end_idx
-            )
-            
-            for neighbor in neighbor_chunks:
-                if neighbor["chunk_id"] not in processed_chunk_ids:
+            # Take ±window_size chunks from the prefetched neighbours
+            for idx in range(max(chunk_idx - window_size, 0), chunk_idx + window_size + 1):
+                neighbor = _neighbor(doc_id, idx)
+                if neighbor is not None and neighbor["chunk_id"] not in processed_chunk_ids:
                     # Mark as expanded chunk (lower priority than direct hits)
                     neighbor["_is_expanded"] = True
                     expanded_chunks.append(neighbor)
@@ -594,21 +637,15 @@ class RetrievalService(AgentBase):
             if continuation_enabled:
                 # Check if hit chunk has continuation signal
                 if self._has_continuation_signal(hit.get("content", "")):
-                    # Retrieve next chunk beyond window
+                    # Take the next chunk beyond the window
                     next_idx = chunk_idx + window_size + 1
-                    next_chunks = self.vector_store.get_chunks_by_indices(
-                        doc_id=doc_id,
-                        start_index=next_idx,
-                        end_index=next_idx
-                    )
+                    next_chunk = _neighbor(doc_id, next_idx)
                     
-                    for next_chunk in next_chunks:
-                        if next_chunk["chunk_id"] not in processed_chunk_ids:
-                            # Check metadata guidance
-                            if metadata_guided and not self._same_section_context(hit, next_chunk):
-                                logger.debug(f"Continuation detected but different section → skip")
-                                break
-                            
+                    if next_chunk is not None and next_chunk["chunk_id"] not in processed_chunk_ids:
+                        # Check metadata guidance
+                        if metadata_guided and not self._same_section_context(hit, next_chunk):
+                            logger.debug(f"Continuation detected but different section → skip")
+                        else:
                             next_chunk["_is_expanded"] = True
                             next_chunk["_expansion_reason"] = "continuation"
                             expanded_chunks.append(next_chunk)
@@ -618,15 +655,9 @@ class RetrievalService(AgentBase):
                             # Recursive check: does the next chunk also continue?
                             if self._has_continuation_signal(next_chunk.get("content", "")):
                                 next_idx += 1
-                                more_chunks = self.vector_store.get_chunks_by_indices(
-                                    doc_id=doc_id,
-                                    start_index=next_idx,
-                                    end_index=next_idx
-                                )
-                                for more in more_chunks:
-                                    if more["chunk_id"] not in processed_chunk_ids:
-                                        if metadata_guided and not self._same_section_context(hit, more):
-                                            break
+                                more = _neighbor(doc_id, next_idx)
+                                if more is not None and more["chunk_id"] not in processed_chunk_ids:
+                                    if not (metadata_guided and not self._same_section_context(hit, more)):
                                         more["_is_expanded"] = True
                                         more["_expansion_reason"] = "continuation_recursive"
                                         expanded_chunks.append(more)
@@ -636,7 +667,96 @@ class RetrievalService(AgentBase):
         logger.debug(f"Context expansion: {len(hit_chunks)} hits → {len(expanded_chunks)} total ({len(expanded_chunks) - len(hit_chunks)} added)")
         return expanded_chunks
 
+    def _search_variants(
+        self,
+        search,
+        variations: list[str],
+        top_k: int,
+        doc_type_filter: str | None,
+    ) -> tuple[list[list[dict]], list[dict]]:
+        """Search each query variation on a thread pool, within a latency budget.
+
+        All variations are embedded up front in one batch (warming the
+        VectorStore query-embedding cache); the per-variant Chroma and BM25
+        look-ups then run concurrently.  The original query (index 0) is
+        always waited for; other variants still running when
+        ``multi_query_budget_ms`` expires are dropped from fusion.
+
+        Returns ``(result_lists, timings)`` where *timings* has one entry per
+        variation: ``query``, ``elapsed_ms`` (None if dropped), ``hits``
+        and ``used``.
+        """
+        budget_ms = getattr(self.config, 'multi_query_budget_ms', 1500)
+        if self._variant_pool is None:
+            self._variant_pool = ThreadPoolExecutor(
+                max_workers=max(1, getattr(self.config, 'multi_query_workers', 4)),
+                thread_name_prefix="kts-variant",
+            )
+
+        start = time.perf_counter()
+        self.vector_store.embed_queries(variations)
+
+        def _run(q_var: str):
+            t0 = time.perf_counter()
+            rows = search(query=q_var, top_k=top_k, doc_type_filter=doc_type_filter)
+            return rows, (time.perf_counter() - t0) * 1000.0
+
+        futures = [self._variant_pool.submit(_run, q_var) for q_var in variations]
+        remaining = None
+        if budget_ms and budget_ms > 0:
+            remaining = max(0.0, budget_ms / 1000.0 - (time.perf_counter() - start))
+        wait(futures[1:], timeout=remaining)
+        futures[0].result()  # the original query is never dropped
+
+        result_lists: list[list[dict]] = []
+        timings: list[dict] = []
+        for q_var, future in zip(variations, futures):
+            timing = {"query": q_var, "elapsed_ms": None, "hits": 0, "used": False}
+            if future.done() and future.exception() is None:
+                rows, elapsed_ms = future.result()
+                result_lists.append(rows)
+                timing.update(elapsed_ms=round(elapsed_ms, 2), hits=len(rows), used=True)
+            elif future.done():
+                logger.debug("Query variant %r failed: %s", q_var, future.exception())
+            else:
+                logger.debug("Query variant %r dropped: over %sms budget", q_var, budget_ms)
+            timings.append(timing)
+        logger.debug("Multi-query variant timings: %s", timings)
+        return result_lists, timings
+
     def execute(self, request: dict) -> AgentResult:
+        """Answer *request*, serving repeats from the query result cache.
+
+        Strict-provenance / answer-validation requests always run, since
+        they append to the provenance ledger.
+        """
+        cache = self.query_cache
+        if cache is None or request.get("strict") or request.get("generated_answer"):
+            return self._execute(request)
+
+        key = make_key(
+            request["query"],
+            {k: v for k, v in request.items() if k != "query"},
+            repr(self.config),
+            self._corpus_generation(),
+        )
+        result = cache.get(key)
+        hit = result is not None
+        if not hit:
+            result = self._execute(request)
+            if result.success:
+                cache.put(key, result)
+
+        if getattr(self.config, 'debug_level', 0) >= 1:
+            debug = {**result.data.get("debug", {}), "query_cache": {"hit": hit, **cache.stats()}}
+            result = replace(result, data={**result.data, "debug": debug})
+        return result
+
+    def _corpus_generation(self) -> tuple[int, int]:
+        """Write counters of the vector and graph stores; bumped by ingest, vacuum and vision."""
+        return self.vector_store.generation(), self.graph_store.generation()
+
+    def _execute(self, request: dict) -> AgentResult:
         query = request["query"]
         max_results = int(request.get("max_results", 5))
         doc_type_filter = request.get("doc_type_filter")
@@ -664,6 +784,7 @@ class RetrievalService(AgentBase):
         # 2. Multi-query: generate variations + RRF fusion (advanced)
         query_variations = [query]  # Start with original
         use_multi_query = False
+        variant_timings: list[dict] = []
         
         if getattr(self.config, 'query_expansion_enabled', True):
             try:
@@ -697,16 +818,29 @@ class RetrievalService(AgentBase):
         max_per_doc = int(request.get("max_chunks_per_doc", getattr(self.config, 'max_chunks_per_doc', 3)))
         top_k_multiplier = 6 if request.get("deep_mode") else 4
         
+        # Hybrid mode fuses BM25 lexical hits (exact error codes, defined
+        # terms) with the dense candidates for each query.
+        hybrid = getattr(self.config, 'hybrid_search_enabled', True)
+        search = self.vector_store.search_hybrid if hybrid else self.vector_store.search
+
         if use_multi_query and len(query_variations) > 1:
-            # Multi-query retrieval: search with each variation
-            all_result_lists = []
-            for q_var in query_variations:
-                variant_results = self.vector_store.search(
-                    query=q_var,
+            # Multi-query retrieval: all variations embedded in one batch and
+            # sent to Chroma as one multi-vector query
+            if getattr(self.config, 'multi_query_concurrent', True):
+                # Variants searched in parallel under a latency budget
+                all_result_lists, variant_timings = self._search_variants(
+                    search,
+                    query_variations,
+                    top_k=max_results * max_per_doc * top_k_multiplier,
+                    doc_type_filter=doc_type_filter,
+                )
+            else:
+                search_many = self.vector_store.search_hybrid_many if hybrid else self.vector_store.search_many
+                all_result_lists = search_many(
+                    queries=query_variations,
                     top_k=max_results * max_per_doc * top_k_multiplier,
                     doc_type_filter=doc_type_filter
                 )
-                all_result_lists.append(variant_results)
             
             # Merge results using Reciprocal Rank Fusion
             from backend.retrieval.query_expander import reciprocal_rank_fusion
@@ -722,7 +856,7 @@ class RetrievalService(AgentBase):
             logger.debug(f"RRF fusion: merged {len(all_result_lists)} result lists → {len(rows)} final candidates")
         else:
             # Single query retrieval (traditional)
-            rows = self.vector_store.search(
+            rows = search(
                 query=query_variations[0], 
                 top_k=max_results * max_per_doc * top_k_multiplier, 
                 doc_type_filter=doc_type_filter
@@ -730,6 +864,14 @@ class RetrievalService(AgentBase):
         
         # Load Graph (now an nx.DiGraph) for boosting
         graph_data: nx.DiGraph = self.graph_store.load()
+        # Concept nodes named in the query — resolved once, reused per row
+        query_concepts = ConceptIndex.for_graph(graph_data).find(query) if not disable_graph_boost else []
+        # Everything else the scorer needs from the query, also built once
+        query_ctx = self._build_query_context(
+            query,
+            disable_intent=disable_auto_filter,
+            concept_nodes=query_concepts,
+        )
         
         # 1a. Smart Context Expansion (Industry-Standard RAG Technique)
         # Expand context window around initial hits with intelligent strategies:
@@ -750,92 +892,48 @@ class RetrievalService(AgentBase):
                 min_confidence=top_score,
             )
 
-        # 1b. Cross-Encoder Re-ranking (if model available)
-        cross_encoder_active = getattr(self.config, 'cross_encoder_enabled', False)
-        if cross_encoder_active and rows:
-            rows = cross_encoder_rerank(query, rows, content_key="content")
-
         # 2. RAG Fusion & Re-ranking
-        def rerank_scorer(row: dict) -> float:
-            """
-            Hybrid Score = Vector Similarity * (1 + Graph Boost + Feature Boosts)
-            """
-            base_score = float(row.get("score", 0.0)) # Chroma returns 'score' (similarity)
-            doc_id = row.get("doc_id")
-            
-            # Compute all textual features (keyword matches, etc.)
-            features = self._compute_feature_scores(query, row, disable_intent=disable_auto_filter)
-            
-            # Store features on row for multi-signal confidence computation
-            row["_features"] = features
-            
-            # Compute Graph Relevance
-            graph_boost = 0.0 if disable_graph_boost else self._compute_graph_score(query, doc_id, graph_data)
-            
-            # Start with Vector Score
-            final_score = base_score
-            
-            # Apply Graph Boost (Additive to base, then multiplicative overall?)
-            # Let's use multiplicative boost: Score * (1 + GraphScore)
-            final_score *= (1.0 + graph_boost)
-
-            # Apply Cross-Encoder score (blend with vector similarity)
-            ce_score = row.get("cross_encoder_score")
-            if ce_score is not None:
-                # Normalize CE score to 0-1 range via sigmoid
-                import math
-                ce_norm = 1.0 / (1.0 + math.exp(-ce_score))
-                # Blend: 60% cross-encoder + 40% vector similarity * boosts
-                final_score = 0.6 * ce_norm + 0.4 * final_score
-
-            # Apply existing Heuristic Boosts
-            if features["error_code_exact_match"] > 0:
-                final_score *= 1.5 # 50% boost for error code
-            
-            # Intent-based doc_type boost
-            if features["intent_doc_type_match"] > 0:
-                 # intent_doc_type_match returns a float 0.0-1.0 from rank
-                 final_score *= (1.0 + features["intent_doc_type_match"]) 
-            
-            # Entity overlap boost (NER-aware scoring)
-            if features.get("entity_overlap", 0.0) > 0:
-                # Strong boost for entity matches (domain-specific terms)
-                final_score *= (1.0 + 0.5 * features["entity_overlap"])
-            
-            # Keyphrase overlap boost
-            if features.get("entity_keyphrase_match", 0.0) > 0:
-                # Moderate boost for keyphrase matches (semantic relevance)
-                final_score *= (1.0 + 0.3 * features["entity_keyphrase_match"])
-            
-            # Q38 fix: De-boost TROUBLESHOOT for capability queries
-            intent, _ = self._detect_query_intent(query)
-            if intent == "file_capability" and row.get("doc_type") == "TROUBLESHOOT":
-                final_score *= 0.6
+        # Hybrid Score = Vector Similarity * (1 + Graph Boost + Feature Boosts),
+        # fused for all candidates at once (see backend.retrieval.rerank).
+        features = [
+            self._compute_feature_scores(query, row, disable_intent=disable_auto_filter, ctx=query_ctx)
+            for row in rows
+        ]
+        graph_boosts = [
+            0.0 if disable_graph_boost
+            else self._compute_graph_score(query, row.get("doc_id"), graph_data, query_ctx.concept_nodes)
+            for row in rows
+        ]
+        for row, row_features in zip(rows, features):
+            # Stored for multi-signal confidence computation
+            row["_features"] = row_features
 
-            # Protect GOVERNING_DOC from intent-based de-boosting:
-            # General/educational/troubleshooting intents should NOT penalize
-            # legal docs since their content naturally contains words like
-            # "error", "failure", "issue" in governance contexts.
-            row_doc_type = row.get("doc_type", "UNKNOWN")
-            if row_doc_type == "GOVERNING_DOC":
-                # Neutral intent handling: don't let troubleshoot-intent boost
-                # hurt legal docs, and give a mild boost when query mentions
-                # legal-specific terms
-                legal_terms = {"agreement", "pooling", "servicing", "trust",
-                               "certificate", "trustee", "indenture", "mortgage",
-                               "obligor", "servicer", "depositor", "beneficiary",
-                               "reporting", "statement", "distribution"}
-                query_words = set(query.lower().split())
-                if query_words & legal_terms:
-                    final_score *= 1.3  # boost for legal-term queries
-            
-            # Store final rerank score on row for confidence computation
-            row["_rerank_score"] = final_score
-                
-            return final_score
+        # 2a. Cross-Encoder Re-ranking (if model available), cascaded: only
+        # the top-K rows by the cheap fused score are scored, never
+        # context-expansion neighbours.
+        cross_encoder_active = getattr(self.config, 'cross_encoder_enabled', False)
+        if cross_encoder_active and rows:
+            selected = select_for_cross_encoder(
+                rows,
+                features,
+                graph_boosts,
+                query_ctx,
+                top_k=int(getattr(self.config, 'cross_encoder_top_k', 30)),
+                skip_expanded=getattr(self.config, 'cross_encoder_skip_expanded', True),
+            )
+            logger.debug(f"Cross-encoder cascade: {len(selected)} of {len(rows)} candidates")
+            cross_encoder_rerank(
+                query,
+                [rows[i] for i in selected],
+                content_key="content",
+                batch_size=getattr(self.config, 'cross_encoder_batch_size', 16),
+                intra_op_threads=getattr(self.config, 'cross_encoder_intra_op_threads', 2),
+                inter_op_threads=getattr(self.config, 'cross_encoder_inter_op_threads', 1),
+                cache_size=getattr(self.config, 'cross_encoder_cache_size', 4096),
+            )
 
         # Sort by fused score
-        rows.sort(key=rerank_scorer, reverse=True)
+        rows = rerank_rows(rows, features, graph_boosts, query_ctx)
         
         # Deduplicate by doc_id (keep top N chunks per document, not just 1)
         max_per_doc = int(request.get("max_chunks_per_doc", getattr(self.config, 'max_chunks_per_doc', 3)))
@@ -862,6 +960,8 @@ class RetrievalService(AgentBase):
                 source_path=row["source_path"],
                 chunk_index=row["chunk_index"],
                 doc_type=normalize_doc_type(row.get("doc_type", "UNKNOWN")),
+                page=row.get("page"),
+                page_end=row.get("page_end"),
             )
             chunks.append(chunk)
 
@@ -874,7 +974,7 @@ class RetrievalService(AgentBase):
                     uri=f"file:///{source_path.replace('\\\\', '/')}",
                     version=1,
                     section=None,
-                    page=None,
+                    page=row.get("page"),
                     last_updated=None,
                     image_note=f"See source image context for {row.get('image_id')}" if row.get("is_image_desc") else None,
                 )
@@ -975,10 +1075,9 @@ class RetrievalService(AgentBase):
             if not corpus_regime:
                 corpus_regime = 'MIXED'  # Default to MIXED so term resolution can activate
 
-            intent, _ = self._detect_query_intent(query)
             activate, reason = should_activate_resolver(
                 query=query,
-                intent=intent,
+                intent=query_ctx.intent,
                 corpus_regime=corpus_regime,
                 initial_results=rows,
                 term_graph=graph_data,
@@ -1019,6 +1118,8 @@ class RetrievalService(AgentBase):
         }
         if term_resolution_payload:
             payload["term_resolution"] = term_resolution_payload
+        if variant_timings and getattr(self.config, 'debug_level', 0) >= 1:
+            payload["debug"] = {"multi_query": variant_timings}
 
         if strict_mode or generated_answer:
             matcher = EvidenceMatcher(
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from backend.common.models import AgentResult
 from backend.common.doc_types import normalize_doc_type
+from backend.common.text_utils import find_keywords
 from config.settings import get_bundle_root
 from .base_agent import AgentBase
 
@@ -19,7 +20,11 @@ class TaxonomyAgent(AgentBase):
 
     def execute(self, request: dict) -> AgentResult:
         filename = (request.get("filename") or "").lower()
-        text = (request.get("text") or "").lower()
+        # "texts" lets a caller stream a large document in windows.
+        texts = request.get("texts")
+        if texts is None:
+            texts = [request.get("text") or ""]
+        content_keywords = find_keywords(texts, (keyword for keywords in self.rules.values() for keyword in keywords))
         best_label = "UNKNOWN"
         best_score = 0.0
         tags: list[str] = []
@@ -100,7 +105,7 @@ class TaxonomyAgent(AgentBase):
                 if keyword_lower in filename:
                     score += 0.3
                     matched_rules.append(f"filename_keyword:{label}:{keyword_lower}")
-                if keyword_lower in text:
+                if keyword_lower in content_keywords:
                     score += 0.15
                     tags.append(keyword)
                     matched_rules.append(f"content:{label}:{keyword_lower}")
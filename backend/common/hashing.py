@@ -1,8 +1,17 @@
 from __future__ import annotations
 
 import hashlib
+import logging
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Digests accepted by ``file_digest``.  sha256 is the manifest default;
+# blake2b is faster on CPUs without SHA extensions, and xxh3 (optional
+# ``xxhash`` package) is a non-cryptographic checksum that is enough for
+# change detection.
+HASH_ALGORITHMS = ("sha256", "blake2b", "xxh3")
+
 
 def sha256_file(path: str | Path) -> str:
     file_path = Path(path)
@@ -11,3 +20,38 @@ def sha256_file(path: str | Path) -> str:
         for chunk in iter(lambda: handle.read(1024 * 1024), b""):
             digest.update(chunk)
     return digest.hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def resolve_hash_algorithm(algorithm: str) -> str:
+    """Return *algorithm* if usable here, else ``"sha256"`` (with a warning)."""
+    algorithm = (algorithm or "sha256").lower()
+    if algorithm not in HASH_ALGORITHMS:
+        logger.warning("Unknown hash algorithm %r — using sha256", algorithm)
+        return "sha256"
+    if algorithm == "xxh3":
+        try:
+            import xxhash  # noqa: F401
+        except ImportError:
+            logger.warning("xxhash not installed — using sha256 for file hashing")
+            return "sha256"
+    return algorithm
+
+
+def file_digest(path: str | Path, algorithm: str = "sha256") -> str:
+    """Hex digest of the file at *path* with a (resolved) *algorithm*."""
+    if algorithm == "sha256":
+        return sha256_file(path)
+    if algorithm == "xxh3":
+        import xxhash
+
+        digest = xxhash.xxh3_128()
+    else:
+        digest = hashlib.blake2b(digest_size=32)
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
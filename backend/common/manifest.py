@@ -1,39 +1,203 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import sqlite3
 from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterable
 
 from .models import FileInfo
+from .sqlite_utils import connect, in_batches
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path    TEXT PRIMARY KEY,
+    doc_id  TEXT,
+    hash    TEXT,
+    status  TEXT,
+    info    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_doc_id ON files(doc_id);
+CREATE INDEX IF NOT EXISTS idx_files_hash ON files(hash);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_UPSERT = (
+    "INSERT INTO files(path, doc_id, hash, status, info) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(path) DO UPDATE SET doc_id = excluded.doc_id, hash = excluded.hash, "
+    "status = excluded.status, info = excluded.info"
+)
 
 
 class ManifestStore:
+    """Index of every known source file, keyed by absolute path.
+
+    Rows live in SQLite (WAL journal): the full ``FileInfo`` is stored as
+    JSON next to indexed ``doc_id``, ``hash`` and ``status`` columns, so one
+    file can be updated without rewriting the manifest and a crawl's
+    results are applied in a single transaction.
+
+    ``load()`` still returns the legacy ``{"files": {path: info}, ...}``
+    dict.  Passing the legacy ``manifest.json`` path is supported: the
+    database lives next to it as ``manifest.db`` and the JSON file is
+    imported once, then renamed to ``*.json.migrated``.
+    """
+
     def __init__(self, manifest_path: str):
-        self.path = Path(manifest_path)
+        given = Path(manifest_path)
+        self.path = given.with_suffix(".db") if given.suffix == ".json" else given
+        self.legacy_path = self.path.with_suffix(".json")
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.path.exists():
-            self.save({"files": {}, "updated_at": None})
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            initialised = conn.execute("SELECT 1 FROM meta WHERE key = 'updated_at'").fetchone()
+        if not initialised:
+            # The updated_at row marks the store as initialised, so it is
+            # written in the same transaction as the legacy import: a failed
+            # import is retried on the next open.
+            if self.legacy_path.exists():
+                self._migrate_legacy_json()
+            else:
+                with connect(self.path) as conn:
+                    conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('updated_at', 'null')")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
 
     def load(self) -> dict:
-        with self.path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        """Return the whole manifest as ``{"files": {path: info}, "updated_at": ...}``."""
+        with connect(self.path) as conn:
+            files = {path: json.loads(info) for path, info in conn.execute("SELECT path, info FROM files ORDER BY rowid")}
+            return {"files": files, "updated_at": self._updated_at(conn)}
 
     def save(self, data: dict) -> None:
-        data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        with self.path.open("w", encoding="utf-8") as handle:
-            json.dump(data, handle, indent=2)
+        """Replace every row with ``data["files"]`` (full rewrite)."""
+        with connect(self.path) as conn:
+            conn.execute("DELETE FROM files")
+            conn.executemany(_UPSERT, [self._row(path, info) for path, info in data.get("files", {}).items()])
+            self._touch(conn)
+
+    def get(self, path: str) -> dict | None:
+        """Return the entry for *path*, or ``None`` if it is not in the manifest."""
+        with connect(self.path) as conn:
+            row = conn.execute("SELECT info FROM files WHERE path = ?", (path,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, paths: Iterable[str]) -> dict[str, dict]:
+        """Return ``{path: info}`` for the given paths that are in the manifest."""
+        keys = list(paths)
+        found: dict[str, dict] = {}
+        with connect(self.path) as conn:
+            for batch, placeholders in in_batches(keys):
+                for path, info in conn.execute(f"SELECT path, info FROM files WHERE path IN ({placeholders})", batch):
+                    found[path] = json.loads(info)
+        return found
+
+    def load_under(self, roots: Iterable[str]) -> dict[str, dict]:
+        """Return ``{path: info}`` for entries at or below any of *roots*.
+
+        Uses a range scan on the primary key, so the cost is proportional
+        to the matching rows rather than to the whole manifest.
+        """
+        found: dict[str, dict] = {}
+        with connect(self.path) as conn:
+            for root in roots:
+                prefix = root.rstrip(os.sep) + os.sep
+                upper = prefix[:-1] + chr(ord(os.sep) + 1)  # first key after every "prefix..." path
+                for path, info in conn.execute(
+                    "SELECT path, info FROM files WHERE path = ? OR (path >= ? AND path < ?)",
+                    (root, prefix, upper),
+                ):
+                    found[path] = json.loads(info)
+        return found
+
+    def count(self) -> int:
+        with connect(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def pending_paths(self) -> list[str]:
+        """Paths of entries that have not been ingested yet (no doc_id)."""
+        with connect(self.path) as conn:
+            return [row[0] for row in conn.execute("SELECT path FROM files WHERE doc_id IS NULL OR doc_id = '' ORDER BY rowid")]
 
     def upsert_files(self, infos: list[FileInfo]) -> None:
-        manifest = self.load()
-        files = manifest.setdefault("files", {})
-        for info in infos:
-            files[info.path] = asdict(info)
-        self.save(manifest)
+        self.apply_changes(infos, ())
 
     def remove_paths(self, paths: list[str]) -> None:
-        manifest = self.load()
-        files = manifest.setdefault("files", {})
-        for path in paths:
-            files.pop(path, None)
-        self.save(manifest)
+        self.apply_changes((), paths)
+
+    def apply_changes(self, upserts: Iterable[FileInfo], removed_paths: Iterable[str]) -> None:
+        """Upsert *upserts* and delete *removed_paths* in one transaction."""
+        rows = [self._row(info.path, asdict(info)) for info in upserts]
+        removed = list(removed_paths)
+        with connect(self.path) as conn:
+            conn.executemany(_UPSERT, rows)
+            for batch, placeholders in in_batches(removed):
+                conn.execute(f"DELETE FROM files WHERE path IN ({placeholders})", batch)
+            self._touch(conn)
+
+    def update_file(self, path: str, **fields) -> bool:
+        """Merge *fields* into the entry for *path*; ``False`` if there is none.
+
+        The read-modify-write runs under a write lock, so concurrent
+        updates to the same row are not lost.
+        """
+        with connect(self.path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT info FROM files WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                return False
+            conn.execute(_UPSERT, self._row(path, {**json.loads(row[0]), **fields}))
+            self._touch(conn)
+        return True
+
+    # ------------------------------------------------------------------
+    # Legacy / migration helpers
+    # ------------------------------------------------------------------
+
+    def _migrate_legacy_json(self) -> None:
+        with self.legacy_path.open("r", encoding="utf-8") as handle:
+            raw = json.load(handle)
+        with connect(self.path) as conn:
+            conn.execute("DELETE FROM files")
+            conn.executemany(_UPSERT, [self._row(path, info) for path, info in raw.get("files", {}).items()])
+            conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('updated_at', 'null')")
+            self._touch(conn)
+        migrated = self.legacy_path.with_name(self.legacy_path.name + ".migrated")
+        self.legacy_path.replace(migrated)
+        logger.info(
+            "Migrated manifest from %s to %s (%d files)",
+            self.legacy_path,
+            self.path,
+            len(raw.get("files", {})),
+        )
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row(path: str, info: dict) -> tuple:
+        return (path, info.get("doc_id"), info.get("hash"), info.get("status"), json.dumps(info))
+
+    @staticmethod
+    def _updated_at(conn: sqlite3.Connection):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'updated_at'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _touch(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "UPDATE meta SET value = ? WHERE key = 'updated_at'",
+            (json.dumps(datetime.now(timezone.utc).isoformat()),),
+        )
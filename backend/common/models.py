@@ -50,6 +50,9 @@ class FileInfo:
     retry_count: int = 0
     source_id: str | None = None  # Stable ID based on content hash
     versions: list[dict] = field(default_factory=list)  # History of {version, hash, date}
+    mtime_ns: int = 0  # st_mtime_ns at hash time (crawl fast path)
+    inode: int = 0  # st_ino at hash time (crawl fast path)
+    hash_algorithm: str = "sha256"
 
 
 @dataclass
@@ -58,6 +61,7 @@ class FileChange:
     modified_files: list[FileInfo] = field(default_factory=list)
     deleted_files: list[FileInfo] = field(default_factory=list)
     unchanged_files: int = 0
+    refreshed_files: list[FileInfo] = field(default_factory=list)  # unchanged content, stat fields updated
     errors: list[dict[str, str]] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
 
@@ -72,10 +76,32 @@ class IngestedDocument:
     metadata_path: str
     images_dir: str
     extracted_text: str
+    extracted_text_truncated: bool = False  # extracted_text is only the leading sample (streamed PDF); full text at content_path
     image_paths: list[str] = field(default_factory=list)
     chunk_count: int = 0
     word_count: int = 0
     version: int = 1
+    page_spans: list[tuple[int, int]] = field(default_factory=list)  # streamed: (page_number, chars) per page of content.md
+
+
+@dataclass
+class PreparedDocument:
+    """Output of the CPU-bound ingestion stage, handed to the single writer."""
+
+    doc_id: str
+    source_path: str
+    staging_dir: str
+    text: str
+    metadata: dict[str, Any]
+    chunks: list[TextChunk]
+    chunking_method: str
+    image_paths: list[str] = field(default_factory=list)
+    trace: list[dict[str, Any]] = field(default_factory=list)
+    prepare_seconds: float = 0.0
+    embeddings: dict[str, Any] = field(default_factory=dict)  # content hash → vector, computed during prepare
+    pipeline: dict[str, Any] = field(default_factory=dict)    # per-stage report from run_pipeline
+    streamed: bool = False  # text is only the leading sample; the full text is in content.md
+    page_spans: list[tuple[int, int]] = field(default_factory=list)  # streamed: (page_number, chars) per page of content.md
 
 
 @dataclass
@@ -88,6 +114,8 @@ class TextChunk:
     doc_type: str = "UNKNOWN"
     entities: list[dict] = field(default_factory=list)  # [{"text": str, "label": str}, ...]
     keyphrases: list[dict] = field(default_factory=list)  # [{"text": str, "score": float}, ...]
+    page: int | None = None      # first source page (paginated formats), for citations
+    page_end: int | None = None  # last source page the chunk draws from
 
 
 @dataclass
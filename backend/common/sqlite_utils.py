@@ -0,0 +1,48 @@
+"""Helpers shared by the SQLite-backed stores.
+
+The graph store, manifest, lexical index and NER cache each keep their
+state in a small SQLite database (WAL journal, one short transaction per
+operation) and use a ``meta`` table for bookkeeping such as a write
+generation counter.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# SQLite's default limit on host parameters per statement is 999.
+IN_BATCH = 500
+
+
+@contextmanager
+def connect(path: str | Path) -> Iterator[sqlite3.Connection]:
+    """Open *path* for one transaction: committed on success, rolled back on error, always closed."""
+    conn = sqlite3.connect(str(path), timeout=30)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def in_batches(items: Sequence[T], size: int = IN_BATCH) -> Iterator[Tuple[List[T], str]]:
+    """Split *items* for ``... IN (?, ?, ...)`` queries: yields ``(batch, placeholders)``."""
+    for start in range(0, len(items), size):
+        batch = list(items[start:start + size])
+        yield batch, ",".join("?" * len(batch))
+
+
+def read_generation(conn: sqlite3.Connection) -> int:
+    """Current value of the ``generation`` counter in the ``meta`` table (0 if unset)."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def bump_generation(conn: sqlite3.Connection) -> None:
+    """Increment the ``generation`` counter in the ``meta`` table."""
+    conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'generation'")
@@ -1,6 +1,20 @@
 from __future__ import annotations
 
 import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from backend.common.models import IngestedDocument
+
+# Joins pages in a streamed PDF's content.md.
+PAGE_SEPARATOR = "\n\n"
+
+# Full-text consumers of a streamed document read it in windows of this
+# size; each window repeats the tail of the previous one so that matches
+# straddling a boundary (definitions, keywords) are still seen whole.
+DOCUMENT_WINDOW_CHARS = 1_000_000
+DOCUMENT_WINDOW_OVERLAP = 10_000
 
 
 def clean_text(text: str) -> str:
@@ -87,3 +101,75 @@ def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> l
         return _merge_splits(good_splits, separator)
 
     return _recursive_split(text, separators)
+
+
+def joined_length(page_spans: list[tuple[int, int]]) -> int:
+    """Length of a streamed content.md written with *page_spans*."""
+    return sum(chars for _, chars in page_spans) + len(PAGE_SEPARATOR) * max(len(page_spans) - 1, 0)
+
+
+def read_content_pages(content_path: str | Path, page_spans: list[tuple[int, int]]) -> Iterator[tuple[int, str]]:
+    """Read a streamed content.md back one page at a time (see ``IngestionAgent._stream_pdf``)."""
+    with Path(content_path).open("r", encoding="utf-8", newline="") as handle:
+        for index, (number, chars) in enumerate(page_spans):
+            if index:
+                handle.read(len(PAGE_SEPARATOR))
+            yield number, handle.read(chars)
+
+
+def iter_text_windows(
+    pages: Iterable[tuple[int, str]],
+    window_chars: int = DOCUMENT_WINDOW_CHARS,
+    overlap_chars: int = DOCUMENT_WINDOW_OVERLAP,
+) -> Iterator[str]:
+    """Join *pages* with ``PAGE_SEPARATOR`` into windows of about *window_chars*.
+
+    Each window after the first starts with the last *overlap_chars* of
+    the previous one, trimmed forward to a line start.
+    """
+    parts: list[str] = []
+    size = 0
+    tail = ""
+    for _, page in pages:
+        if parts:
+            parts.append(PAGE_SEPARATOR)
+            size += len(PAGE_SEPARATOR)
+        parts.append(page)
+        size += len(page)
+        if size >= window_chars:
+            window = tail + "".join(parts)
+            yield window
+            tail = window[-overlap_chars:] if overlap_chars else ""
+            if len(window) > overlap_chars and "\n" in tail:
+                tail = tail[tail.index("\n") + 1:]
+            tail += PAGE_SEPARATOR if tail else ""
+            parts, size = [], 0
+    if parts:
+        yield tail + "".join(parts)
+
+
+def iter_document_text(doc: "IngestedDocument") -> Iterator[str]:
+    """Yield the full text of *doc*, windowed when it was streamed.
+
+    ``extracted_text`` is yielded as is unless it is only the leading
+    sample of a streamed PDF (``extracted_text_truncated``); then
+    content.md is re-read page by page through ``iter_text_windows``.
+    """
+    if not doc.extracted_text_truncated:
+        yield doc.extracted_text
+        return
+    yield from iter_text_windows(read_content_pages(doc.content_path, doc.page_spans))
+
+
+def find_keywords(texts: Iterable[str], keywords: Iterable[str]) -> set[str]:
+    """Return the lower-cased *keywords* that occur in any of *texts* (case-insensitive)."""
+    pending = {keyword.lower() for keyword in keywords if keyword}
+    found: set[str] = set()
+    for text in texts:
+        lowered = text.lower()
+        hits = {keyword for keyword in pending if keyword in lowered}
+        found |= hits
+        pending -= hits
+        if not pending:
+            break
+    return found
@@ -0,0 +1,75 @@
+"""Streaming directory walker for the crawler.
+
+``iter_files`` walks a source tree with ``os.scandir`` and yields matching
+files one at a time, so hashing can start before the walk finishes and a
+100k-file share is never materialised as a list of ``Path`` objects.
+
+- Skip directories (the KB output dir, ``.kts``, …) are pruned by name
+  before they are opened.
+- Extensions are matched on the entry name; no ``Path`` is built per file.
+- Paths are absolute and symlink-free, matching ``Path.resolve()``: each
+  directory is resolved once and files are joined onto it; only symlinked
+  files are resolved individually.
+- Symlinked directories are followed, with (device, inode) loop protection.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Callable, Collection, Iterator, Optional, Tuple
+
+
+def iter_files(
+    base: str | os.PathLike,
+    extensions: Collection[str],
+    skip_dirs: Collection[str] = (),
+    on_error: Optional[Callable[[str, OSError], None]] = None,
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Yield ``(absolute_path, entry)`` for files under *base* with a wanted extension.
+
+    *extensions* are suffixes including the dot.  A *base* that is a file
+    is yielded itself if it matches.  Directories that cannot be listed are
+    reported to *on_error* and skipped.
+    """
+    wanted = {ext.lower() for ext in extensions}
+    skip = set(skip_dirs)
+    root = os.path.realpath(base)
+    if skip.intersection(os.path.normpath(base).split(os.sep)):
+        return  # the base itself is inside a skipped directory
+    if os.path.isfile(root):
+        # A single file: mirror the directory case's filtering
+        parent, name = os.path.split(root)
+        if os.path.splitext(name)[1].lower() in wanted:
+            with os.scandir(parent) as entries:
+                for entry in entries:
+                    if entry.name == name:
+                        yield root, entry
+        return
+
+    visited = set()
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            st = os.stat(directory)
+            if (st.st_dev, st.st_ino) in visited:
+                continue  # symlink loop or second link to the same tree
+            visited.add((st.st_dev, st.st_ino))
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if entry.name not in skip:
+                                subdirs.append(os.path.realpath(entry.path) if entry.is_symlink() else entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in wanted and entry.is_file():
+                            yield (os.path.realpath(entry.path) if entry.is_symlink() else entry.path), entry
+                    except OSError as exc:
+                        if on_error is not None:
+                            on_error(entry.path, exc)
+        except OSError as exc:
+            if on_error is not None:
+                on_error(directory, exc)
+            continue
+        # Depth-first, in listing order
+        stack.extend(reversed(subdirs))
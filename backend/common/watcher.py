@@ -0,0 +1,246 @@
+"""Filesystem watching for ``kts-backend watch``.
+
+``FileWatcher`` reports the paths touched under the source paths in
+debounced batches.  An editor save or a bulk copy fires many events for the
+same files, so one burst becomes one crawl.
+
+Events come from watchdog (inotify / FSEvents / ReadDirectoryChangesW)
+when it is installed.  Otherwise a polling thread diffs a stat snapshot of
+the tree every ``poll_interval_seconds``.  Either way, only the touched
+paths reach the crawler.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+from .walker import iter_files
+
+logger = logging.getLogger(__name__)
+
+WATCH_BACKENDS = ("auto", "watchdog", "polling")
+
+# watchdog event types that can change a file's content or existence
+_CHANGE_EVENTS = {"created", "modified", "deleted", "moved", "closed"}
+
+
+class Debouncer:
+    """Collect paths and release them as one batch once events settle.
+
+    A batch is due ``quiet_seconds`` after the last event.  If events keep
+    arriving (a long copy), it is due ``max_wait_seconds`` after the first
+    one instead, so a busy share is still indexed as it fills.
+    """
+
+    def __init__(self, quiet_seconds: float = 2.0, max_wait_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.quiet_seconds = quiet_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._paths: Dict[str, None] = {}  # insertion-ordered set
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+
+    def add(self, paths: Iterable[str]) -> None:
+        with self._cond:
+            seen = False
+            for path in paths:
+                self._paths[path] = None
+                seen = True
+            if not seen:
+                return
+            now = self._clock()
+            if self._first is None:
+                self._first = now
+            self._last = now
+            self._cond.notify_all()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._paths)
+
+    def _due(self) -> Optional[float]:
+        if self._first is None:
+            return None
+        return min(self._last + self.quiet_seconds, self._first + self.max_wait_seconds)
+
+    def _take(self) -> List[str]:
+        batch = list(self._paths)
+        self._paths.clear()
+        self._first = self._last = None
+        return batch
+
+    def take_ready(self) -> List[str]:
+        """Return and clear the pending batch if it is due, else ``[]``."""
+        with self._cond:
+            due = self._due()
+            if due is None or self._clock() < due:
+                return []
+            return self._take()
+
+    def wait(self, stop: threading.Event, tick: float = 0.5) -> List[str]:
+        """Block until a batch is due; return ``[]`` once *stop* is set."""
+        with self._cond:
+            while not stop.is_set():
+                due = self._due()
+                if due is None:
+                    self._cond.wait(tick)
+                    continue
+                remaining = due - self._clock()
+                if remaining <= 0:
+                    return self._take()
+                self._cond.wait(min(remaining, tick))
+        return []
+
+
+def collapse_paths(paths: Iterable[str]) -> List[str]:
+    """Drop paths that sit under another path of the batch (a touched directory)."""
+    kept = set(paths)
+    result = []
+    for path in kept:
+        parent = os.path.dirname(path)
+        while parent and parent not in kept and os.path.dirname(parent) != parent:
+            parent = os.path.dirname(parent)
+        if parent not in kept:
+            result.append(path)
+    return sorted(result)
+
+
+def snapshot(paths: Iterable[str], extensions: Collection[str],
+             skip_dirs: Collection[str] = ()) -> Dict[str, Tuple[int, int, int]]:
+    """``{path: (size, mtime_ns, inode)}`` for every wanted file under *paths*."""
+    state: Dict[str, Tuple[int, int, int]] = {}
+    for base in paths:
+        if not os.path.exists(base):
+            continue
+        for abs_path, _ in iter_files(base, extensions, skip_dirs=skip_dirs):
+            try:
+                st = os.stat(abs_path)  # DirEntry.stat() has st_ino == 0 on Windows
+            except OSError:
+                continue  # vanished between listing and stat
+            state[abs_path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+    return state
+
+
+def diff_snapshots(old: Dict[str, tuple], new: Dict[str, tuple]) -> List[str]:
+    """Paths added, removed or changed between two snapshots."""
+    return sorted(path for path in old.keys() | new.keys() if old.get(path) != new.get(path))
+
+
+class FileWatcher:
+    """Watch *paths* and hand out debounced batches of touched paths.
+
+    ``backend`` is ``"watchdog"``, ``"polling"`` or ``"auto"`` (watchdog if
+    it can be imported and started, else polling).  ``start()`` returns the
+    backend in use.  Batches may contain deleted files and, with watchdog,
+    created, deleted or moved directories.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        extensions: Collection[str],
+        skip_dirs: Collection[str] = (),
+        debounce_seconds: float = 2.0,
+        max_batch_wait_seconds: float = 30.0,
+        poll_interval_seconds: float = 5.0,
+        backend: str = "auto",
+    ):
+        if backend not in WATCH_BACKENDS:
+            raise ValueError(f"Unknown watch backend {backend!r}; expected one of {WATCH_BACKENDS}")
+        self.paths = [os.path.realpath(p) for p in paths]
+        self.extensions = {ext.lower() for ext in extensions}
+        self.skip_dirs = set(skip_dirs)
+        self.poll_interval_seconds = poll_interval_seconds
+        self.requested_backend = backend
+        self.backend: Optional[str] = None
+        self.debouncer = Debouncer(debounce_seconds, max_batch_wait_seconds)
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+
+    def wanted(self, path: str, is_directory: bool = False) -> bool:
+        """True for paths under the watched roots, outside skip dirs, with a wanted extension."""
+        if not any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in self.paths):
+            return False
+        if self.skip_dirs.intersection(path.split(os.sep)):
+            return False
+        return is_directory or os.path.splitext(path)[1].lower() in self.extensions
+
+    def start(self) -> str:
+        if self.requested_backend != "polling":
+            try:
+                self._start_watchdog()
+                self.backend = "watchdog"
+                return self.backend
+            except ImportError:
+                if self.requested_backend == "watchdog":
+                    raise
+                logger.warning("watchdog not installed — polling every %.1fs", self.poll_interval_seconds)
+            except OSError as exc:  # e.g. inotify watch limit reached
+                if self.requested_backend == "watchdog":
+                    raise
+                logger.warning("watchdog failed to start (%s) — polling every %.1fs", exc, self.poll_interval_seconds)
+        self._start_polling()
+        self.backend = "polling"
+        return self.backend
+
+    def next_batch(self) -> List[str]:
+        """Block until a debounced batch is ready; ``[]`` after ``stop()``."""
+        return collapse_paths(self.debouncer.wait(self._stop))
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _start_watchdog(self) -> None:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type not in _CHANGE_EVENTS:
+                    return
+                if event.is_directory and event.event_type in ("modified", "closed"):
+                    return  # a child changed; the child has its own event
+                touched = [os.fsdecode(event.src_path)]
+                if getattr(event, "dest_path", ""):
+                    touched.append(os.fsdecode(event.dest_path))
+                watcher.debouncer.add(p for p in touched if watcher.wanted(p, event.is_directory))
+
+        observer = Observer()
+        handler = _Handler()
+        for root in self.paths:
+            if os.path.isdir(root):
+                observer.schedule(handler, root, recursive=True)
+            elif os.path.isfile(root):
+                observer.schedule(handler, os.path.dirname(root), recursive=False)
+        observer.start()
+        self._observer = observer
+
+    def _start_polling(self) -> None:
+        baseline = snapshot(self.paths, self.extensions, self.skip_dirs)
+
+        def _poll(previous):
+            while not self._stop.wait(self.poll_interval_seconds):
+                current = snapshot(self.paths, self.extensions, self.skip_dirs)
+                changed = diff_snapshots(previous, current)
+                if changed:
+                    self.debouncer.add(changed)
+                previous = current
+
+        self._thread = threading.Thread(target=_poll, args=(baseline,), name="kts-watch-poll", daemon=True)
+        self._thread.start()
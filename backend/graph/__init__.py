@@ -1,6 +1,7 @@
 from .builder import GraphBuilder
 from .queries import GraphQueries
 from .persistence import GraphStore
+from .concept_index import ConceptIndex
 from .schema import (
     SCHEMA_VERSION,
     NODE_TYPES,
@@ -15,6 +16,7 @@ __all__ = [
     "GraphBuilder",
     "GraphQueries",
     "GraphStore",
+    "ConceptIndex",
     "SCHEMA_VERSION",
     "NODE_TYPES",
     "EDGE_TYPES",
@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Set
 import networkx as nx
 
 from backend.common.models import IngestedDocument
+from backend.common.text_utils import iter_document_text
 from .persistence import GraphStore
 from .defined_term_extractor import DefinedTermExtractor
 from .schema import (
@@ -61,12 +62,14 @@ class GraphBuilder:
     def upsert_document(self, doc: IngestedDocument, metadata: dict) -> nx.DiGraph:
         """Parse *doc* and upsert nodes/edges into the persistent graph.
 
-        Returns the updated `nx.DiGraph` instance.
+        Only the document's own subgraph is built in memory and merged into
+        the store, so the cost is independent of the total graph size.
+        Returns that subgraph.
         """
-        G: nx.DiGraph = self.store.load()
+        G = nx.DiGraph()
 
         # Ensure schema version is stored on the graph
-        G.graph.setdefault("schema_version", SCHEMA_VERSION)
+        G.graph["schema_version"] = SCHEMA_VERSION
 
         # 1. Document node
         doc_node_id = f"doc:{doc.doc_id}"
@@ -79,9 +82,11 @@ class GraphBuilder:
         }
         G.add_node(doc_node_id, **doc_attrs)
 
-        # 2. Extract defined terms using full 4-strategy extractor (TD §5.4–§5.6)
+        # 2. Extract defined terms using full 4-strategy extractor (TD §5.4–§5.6).
+        # A streamed PDF is read back from content.md in windows rather than
+        # from its truncated extracted_text.
         extractor = DefinedTermExtractor()
-        defined_terms = extractor.extract(doc.extracted_text, filename=metadata.get("title", ""))
+        defined_terms = extractor.extract_many(iter_document_text(doc), filename=metadata.get("title", ""))
         for dt in defined_terms:
             term_id = f"defterm:{dt.surface_form.lower().replace(' ', '_')}"
             G.add_node(
@@ -98,23 +103,24 @@ class GraphBuilder:
 
         # Legacy fallback: also run inline regex for lines not caught by strategies 2-4
         extracted_surfaces = {dt.surface_form.lower() for dt in defined_terms}
-        for line in doc.extracted_text.split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            term = extract_defined_term(line)
-            if term and len(term) > 2 and term.lower() not in extracted_surfaces:
-                term_id = f"defterm:{term.lower().replace(' ', '_')}"
-                G.add_node(
-                    term_id,
-                    type="DEFINED_TERM",
-                    name=term,
-                    surface_form=term,
-                    confidence=0.95,
-                    extraction_strategy="regex_means",
-                    extract_source=line[:200],
-                )
-                self._ensure_edge(G, doc_node_id, term_id, "DEFINES")
+        for text in iter_document_text(doc):
+            for line in text.split("\n"):
+                line = line.strip()
+                if not line:
+                    continue
+                term = extract_defined_term(line)
+                if term and len(term) > 2 and term.lower() not in extracted_surfaces:
+                    term_id = f"defterm:{term.lower().replace(' ', '_')}"
+                    G.add_node(
+                        term_id,
+                        type="DEFINED_TERM",
+                        name=term,
+                        surface_form=term,
+                        confidence=0.95,
+                        extraction_strategy="regex_means",
+                        extract_source=line[:200],
+                    )
+                    self._ensure_edge(G, doc_node_id, term_id, "DEFINES")
 
         # 3. Metadata-driven links
         for tool in metadata.get("tools", []):
@@ -146,9 +152,9 @@ class GraphBuilder:
             self._ensure_edge(G, doc_node_id, err_id, "ADDRESSES")
 
         # 4. Persist
-        self.store.save(G)
+        self.store.upsert_subgraph(G)
         logger.info(
-            "Graph updated for %s: %d nodes, %d edges",
+            "Graph updated for %s: %d nodes, %d edges upserted",
             doc.doc_id,
             G.number_of_nodes(),
             G.number_of_edges(),
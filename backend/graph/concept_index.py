@@ -0,0 +1,70 @@
+"""Concept-name index for query → graph-node matching.
+
+Graph boosting needs the concept nodes (defined terms, tools, error codes,
+topics, …) whose name occurs in the query.  Scanning every node for every
+candidate row is O(rows × nodes); this index is built once per graph and
+answers the question in O(len(query) × distinct name lengths) dict
+look-ups, with the same substring semantics as ``name in query``.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Dict, List
+
+import networkx as nx
+
+# Node types whose names are matched against the query.
+CONCEPT_NODE_TYPES = ("DEFINED_TERM", "TERM", "TOOL", "ERROR_CODE", "TOPIC", "CONCEPT")
+
+_INDEX_CACHE: "weakref.WeakKeyDictionary[nx.DiGraph, ConceptIndex]" = weakref.WeakKeyDictionary()
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+class ConceptIndex:
+    """Lower-cased concept names → node ids, probed by query substring."""
+
+    def __init__(self, G: nx.DiGraph):
+        self._by_name: Dict[str, List[str]] = {}
+        for node_id, attrs in G.nodes(data=True):
+            if attrs.get("type") in CONCEPT_NODE_TYPES:
+                name = attrs.get("name", attrs.get("surface_form", "")).lower()
+                if name:
+                    self._by_name.setdefault(name, []).append(node_id)
+        self._lengths = sorted({len(name) for name in self._by_name})
+
+    @classmethod
+    def for_graph(cls, G: nx.DiGraph) -> "ConceptIndex":
+        """Return the index for *G*, building it on first use.
+
+        ``GraphStore.load`` hands out one frozen graph per stored generation,
+        so the index is rebuilt exactly when the graph changes.  Mutable
+        graphs are indexed afresh on every call.
+        """
+        if not nx.is_frozen(G):
+            return cls(G)
+        with _INDEX_CACHE_LOCK:
+            index = _INDEX_CACHE.get(G)
+        if index is None:
+            index = cls(G)
+            with _INDEX_CACHE_LOCK:
+                _INDEX_CACHE[G] = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def find(self, query: str) -> List[str]:
+        """Return ids of concept nodes whose name is a substring of *query*."""
+        text = query.lower()
+        matched: Dict[str, None] = {}
+        for start in range(len(text)):
+            for length in self._lengths:
+                end = start + length
+                if end > len(text):
+                    break
+                node_ids = self._by_name.get(text[start:end])
+                if node_ids:
+                    matched.update(dict.fromkeys(node_ids))
+        return list(matched)
@@ -16,7 +16,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterable
 
 
 @dataclass
@@ -42,6 +42,13 @@ class DefinedTermExtractor:
         terms.extend(self._strategy4_inline_reference(text))
         return self._deduplicate(terms)
 
+    def extract_many(self, texts: Iterable[str], filename: str = "") -> list[DefinedTerm]:
+        """Run :meth:`extract` over successive windows of one document, de-duplicating across them."""
+        terms: list[DefinedTerm] = []
+        for text in texts:
+            terms.extend(self.extract(text, filename=filename))
+        return self._deduplicate(terms)
+
     # ── Strategy 1: "X" means … (confidence 0.95) ────────────────
     def _strategy1_means_pattern(self, text: str) -> list[DefinedTerm]:
         results: list[DefinedTerm] = []
@@ -2,64 +2,302 @@ from __future__ import annotations
 
 import json
 import logging
+import sqlite3
+import threading
 from pathlib import Path
+from typing import Iterable
 
 import networkx as nx
 
+from backend.common.sqlite_utils import bump_generation, connect, in_batches, read_generation
+
 logger = logging.getLogger(__name__)
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id    TEXT PRIMARY KEY,
+    attrs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS edges (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    attrs  TEXT NOT NULL,
+    PRIMARY KEY (source, target)
+);
+CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Process-level cache of materialised graphs: path -> (signature, frozen graph).
+# The signature is the database file identity plus the generation counter,
+# so any write — from this or another process — invalidates the entry.
+_GRAPH_CACHE: dict[Path, tuple[tuple, nx.DiGraph]] = {}
+_GRAPH_CACHE_LOCK = threading.Lock()
+
 
 class GraphStore:
     """Persistent knowledge-graph store backed by NetworkX DiGraph.
 
-    On disk the graph is stored as JSON (NetworkX node-link format).
-    In memory it is always materialised as an ``nx.DiGraph`` so every
-    consumer gets O(1) adjacency look-ups, multi-hop traversal, and
-    the full NetworkX algorithm suite for free.
+    On disk the graph is stored in SQLite (``nodes``, ``edges`` and ``meta``
+    tables, attributes as JSON) so a single document can be upserted or
+    deleted without rewriting the whole graph.  In memory it is always
+    materialised as an ``nx.DiGraph`` so every consumer gets O(1) adjacency
+    look-ups, multi-hop traversal, and the full NetworkX algorithm suite.
+
+    Passing the legacy ``knowledge_graph.json`` path is supported: the
+    database lives next to it as ``knowledge_graph.db`` and the JSON file is
+    imported once, then renamed to ``*.json.migrated``.
     """
 
     def __init__(self, graph_path: str):
-        self.path = Path(graph_path)
+        given = Path(graph_path)
+        self.path = given.with_suffix(".db") if given.suffix == ".json" else given
+        self.legacy_path = self.path.with_suffix(".json")
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.path.exists():
-            # Bootstrap with an empty graph
-            self._save_nx(nx.DiGraph())
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            initialised = conn.execute("SELECT 1 FROM meta WHERE key = 'generation'").fetchone()
+        if not initialised:
+            # The generation row marks the store as initialised, so it is
+            # written in the same transaction as the legacy import: a failed
+            # import is retried on the next open.
+            if self.legacy_path.exists():
+                self._migrate_legacy_json()
+            else:
+                with connect(self.path) as conn:
+                    self._init_meta(conn)
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
     def load(self) -> nx.DiGraph:
-        """Deserialise the JSON file into an ``nx.DiGraph``."""
-        with self.path.open("r", encoding="utf-8") as fh:
-            raw = json.load(fh)
-        return self._dict_to_nx(raw)
+        """Return the stored graph as an ``nx.DiGraph``.
+
+        The graph is materialised once per process and reused until the
+        database changes.  It is frozen (``nx.freeze``) because it is
+        shared; use ``load_copy`` to get a graph you can modify.
+        """
+        with connect(self.path) as conn:
+            signature = self._signature(conn)
+            with _GRAPH_CACHE_LOCK:
+                cached = _GRAPH_CACHE.get(self.path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            graph = nx.freeze(self._dict_to_nx(self._read_dict(conn)))
+        with _GRAPH_CACHE_LOCK:
+            _GRAPH_CACHE[self.path] = (signature, graph)
+        logger.debug("Loaded knowledge graph from %s (generation %s)", self.path, signature[-1])
+        return graph
+
+    def load_copy(self) -> nx.DiGraph:
+        """Return a mutable copy of the stored graph."""
+        return nx.DiGraph(self.load())
 
     def save(self, graph: nx.DiGraph) -> None:
-        """Persist an ``nx.DiGraph`` to JSON."""
-        self._save_nx(graph)
+        """Replace the stored graph with *graph* (full rewrite)."""
+        with connect(self.path) as conn:
+            self._replace(conn, graph)
+
+    def upsert_subgraph(self, subgraph: nx.DiGraph) -> None:
+        """Merge *subgraph* into the stored graph.
+
+        Node and edge attributes are merged into existing rows the same way
+        ``G.add_node`` / ``G.add_edge`` would update them in memory; nothing
+        outside *subgraph* is touched.
+        """
+        with connect(self.path) as conn:
+            if subgraph.graph:
+                attrs = self._read_graph_attrs(conn)
+                attrs.update(subgraph.graph)
+                self._write_graph_attrs(conn, attrs)
+            self._upsert_rows(conn, subgraph, merge=True)
+            bump_generation(conn)
+
+    def delete_document(self, doc_id: str) -> int:
+        """Remove ``doc:<doc_id>`` and any neighbour left without edges.
+
+        Returns the number of nodes removed.
+        """
+        doc_node = f"doc:{doc_id}"
+        with connect(self.path) as conn:
+            if not conn.execute("SELECT 1 FROM nodes WHERE id = ?", (doc_node,)).fetchone():
+                return 0
+            neighbours = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT target FROM edges WHERE source = ? UNION SELECT source FROM edges WHERE target = ?",
+                    (doc_node, doc_node),
+                )
+            }
+            conn.execute("DELETE FROM edges WHERE source = ? OR target = ?", (doc_node, doc_node))
+            conn.execute("DELETE FROM nodes WHERE id = ?", (doc_node,))
+            removed = 1
+            for node_id in neighbours:
+                if node_id.startswith("doc:"):
+                    continue
+                still_linked = conn.execute(
+                    "SELECT 1 FROM edges WHERE source = ? OR target = ? LIMIT 1", (node_id, node_id)
+                ).fetchone()
+                if not still_linked:
+                    conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+                    removed += 1
+            bump_generation(conn)
+        return removed
+
+    def prune_orphans(self, active_doc_ids: Iterable[str]) -> int:
+        """Delete document nodes whose doc_id is not in *active_doc_ids*."""
+        active = {f"doc:{doc_id}" for doc_id in active_doc_ids}
+        with connect(self.path) as conn:
+            stale = [
+                row[0][len("doc:"):]
+                for row in conn.execute("SELECT id FROM nodes WHERE id LIKE 'doc:%'")
+                if row[0] not in active
+            ]
+        return sum(self.delete_document(doc_id) for doc_id in stale)
+
+    def set_graph_attr(self, key: str, value) -> None:
+        """Set a single graph-level attribute (e.g. ``corpus_regime``)."""
+        with connect(self.path) as conn:
+            attrs = self._read_graph_attrs(conn)
+            attrs[key] = value
+            self._write_graph_attrs(conn, attrs)
+            bump_generation(conn)
+
+    def counts(self) -> tuple[int, int]:
+        """Return ``(node_count, edge_count)`` without loading the graph."""
+        with connect(self.path) as conn:
+            nodes = conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+            edges = conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+        return nodes, edges
+
+    def generation(self) -> int:
+        """Monotonic counter bumped on every write."""
+        with connect(self.path) as conn:
+            return read_generation(conn)
 
     # ------------------------------------------------------------------
     # Legacy / migration helpers
     # ------------------------------------------------------------------
 
     def load_raw(self) -> dict:
-        """Return the raw JSON dict (nodes/edges) for migration tooling."""
-        with self.path.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
+        """Return the graph as the canonical nodes/edges dict for tooling."""
+        with connect(self.path) as conn:
+            return self._read_dict(conn)
+
+    def _migrate_legacy_json(self) -> None:
+        with self.legacy_path.open("r", encoding="utf-8") as fh:
+            raw = json.load(fh)
+        graph = self._dict_to_nx(raw)
+        with connect(self.path) as conn:
+            self._init_meta(conn)
+            self._replace(conn, graph)
+        migrated = self.legacy_path.with_name(self.legacy_path.name + ".migrated")
+        self.legacy_path.replace(migrated)
+        logger.info(
+            "Migrated knowledge graph from %s to %s (%d nodes, %d edges)",
+            self.legacy_path,
+            self.path,
+            len(raw.get("nodes", {})),
+            len(raw.get("edges", [])),
+        )
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _save_nx(self, G: nx.DiGraph) -> None:
-        data = self._nx_to_dict(G)
-        with self.path.open("w", encoding="utf-8") as fh:
-            json.dump(data, fh, indent=2)
+    @staticmethod
+    def _init_meta(conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('generation', '0')")
+        conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('graph', '{}')")
+
+    def _replace(self, conn: sqlite3.Connection, graph: nx.DiGraph) -> None:
+        conn.execute("DELETE FROM edges")
+        conn.execute("DELETE FROM nodes")
+        self._write_graph_attrs(conn, dict(graph.graph))
+        self._upsert_rows(conn, graph, merge=False)
+        bump_generation(conn)
+
+    def _read_dict(self, conn: sqlite3.Connection) -> dict:
+        nodes = {}
+        for node_id, attrs in conn.execute("SELECT id, attrs FROM nodes ORDER BY rowid"):
+            nodes[node_id] = {"id": node_id, **json.loads(attrs)}
+        edges = [
+            {"source": src, "target": tgt, **json.loads(attrs)}
+            for src, tgt, attrs in conn.execute("SELECT source, target, attrs FROM edges ORDER BY rowid")
+        ]
+        result: dict = {"nodes": nodes, "edges": edges}
+        graph_attrs = self._read_graph_attrs(conn)
+        if graph_attrs:
+            result["graph"] = graph_attrs
+        return result
+
+    def _signature(self, conn: sqlite3.Connection) -> tuple:
+        stat = self.path.stat()
+        return (stat.st_dev, stat.st_ino, read_generation(conn))
+
+    @staticmethod
+    def _read_graph_attrs(conn: sqlite3.Connection) -> dict:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'graph'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    @staticmethod
+    def _write_graph_attrs(conn: sqlite3.Connection, attrs: dict) -> None:
+        conn.execute(
+            "INSERT INTO meta(key, value) VALUES ('graph', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (json.dumps(attrs),),
+        )
+
+    @staticmethod
+    def _existing_attrs(conn: sqlite3.Connection, sql: str, keys: list) -> dict:
+        found: dict = {}
+        for batch, placeholders in in_batches(keys):
+            for row in conn.execute(sql.format(placeholders=placeholders), batch):
+                found[row[0]] = json.loads(row[1])
+        return found
+
+    def _upsert_rows(self, conn: sqlite3.Connection, G: nx.DiGraph, merge: bool) -> None:
+        node_rows = list(G.nodes(data=True))
+        edge_rows = list(G.edges(data=True))
+        existing_nodes: dict = {}
+        existing_edges: dict = {}
+        if merge:
+            existing_nodes = self._existing_attrs(
+                conn, "SELECT id, attrs FROM nodes WHERE id IN ({placeholders})", [n for n, _ in node_rows]
+            )
+            # Edge keys are (source, target); look them up by source and filter.
+            sources = sorted({src for src, _, _ in edge_rows})
+            for batch, placeholders in in_batches(sources):
+                for src, tgt, attrs in conn.execute(
+                    f"SELECT source, target, attrs FROM edges WHERE source IN ({placeholders})", batch
+                ):
+                    existing_edges[(src, tgt)] = json.loads(attrs)
+
+        conn.executemany(
+            "INSERT INTO nodes(id, attrs) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET attrs = excluded.attrs",
+            [
+                (node_id, json.dumps({**existing_nodes.get(node_id, {}), **{k: v for k, v in attrs.items() if k != "id"}}))
+                for node_id, attrs in node_rows
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO edges(source, target, attrs) VALUES (?, ?, ?) "
+            "ON CONFLICT(source, target) DO UPDATE SET attrs = excluded.attrs",
+            [
+                (src, tgt, json.dumps({**existing_edges.get((src, tgt), {}), **attrs}))
+                for src, tgt, attrs in edge_rows
+            ],
+        )
 
     @staticmethod
     def _nx_to_dict(G: nx.DiGraph) -> dict:
-        """Convert an ``nx.DiGraph`` to the project's canonical JSON schema.
+        """Convert an ``nx.DiGraph`` to the project's canonical dict schema.
 
         Schema::
 
@@ -84,7 +322,7 @@ class GraphStore:
 
     @staticmethod
     def _dict_to_nx(raw: dict) -> nx.DiGraph:
-        """Convert the canonical JSON dict back into an ``nx.DiGraph``."""
+        """Convert the canonical dict back into an ``nx.DiGraph``."""
         G = nx.DiGraph()
 
         # Restore graph-level attributes (e.g. corpus_regime)
@@ -1,6 +1,6 @@
 from .doc_converter import convert_doc
 from .docx_converter import convert_docx
-from .pdf_converter import convert_pdf
+from .pdf_converter import PdfPage, convert_pdf, iter_pdf_pages
 from .pptx_converter import convert_pptx
 from .html_converter import convert_html
 from .json_converter import convert_json, extract_json_metadata
@@ -8,12 +8,14 @@ from .image_extractor import extract_image_refs
 from .png_converter import convert_png
 from .config_converter import convert_yaml, convert_ini
 from .csv_converter import convert_csv
-from .ner_extractor import extract_entities_and_keyphrases, NERResult
+from .ner_extractor import extract_entities_and_keyphrases, extract_entities_and_keyphrases_batch, NERResult
 
 __all__ = [
     "convert_doc",
     "convert_docx",
     "convert_pdf",
+    "iter_pdf_pages",
+    "PdfPage",
     "convert_pptx",
     "convert_html",
     "convert_json",
@@ -24,5 +26,6 @@ __all__ = [
     "convert_ini",
     "convert_csv",
     "extract_entities_and_keyphrases",
+    "extract_entities_and_keyphrases_batch",
     "NERResult",
 ]
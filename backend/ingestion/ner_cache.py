@@ -0,0 +1,120 @@
+"""Persistent NER/keyphrase result cache.
+
+Re-ingesting a modified document usually leaves most of its chunks
+byte-identical, so their spaCy output can be reused.  Results are keyed by
+the sha256 of the text plus the model identity and extraction parameters,
+stored in SQLite under the knowledge base, and evicted least-recently-used
+once the cache exceeds ``max_entries``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from backend.common.sqlite_utils import connect, in_batches
+
+from .ner_extractor import ExtractedEntity, ExtractedKeyphrase, NERResult
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ner_results (
+    key       TEXT PRIMARY KEY,
+    payload   TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ner_results_last_used ON ner_results(last_used);
+"""
+
+
+class NERCache:
+    """SQLite-backed LRU cache of ``NERResult`` objects."""
+
+    def __init__(self, path: str, max_entries: int = 200_000):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(text: str, model_id: str, params: str = "") -> str:
+        """Return the cache key for *text* processed by *model_id* with *params*."""
+        digest = hashlib.sha256()
+        for part in (model_id, params):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, NERResult]:
+        """Return cached results for the subset of *keys* that are present.
+
+        Hits are marked as recently used.
+        """
+        wanted = list(dict.fromkeys(keys))
+        found: Dict[str, NERResult] = {}
+        with connect(self.path) as conn:
+            for batch, placeholders in in_batches(wanted):
+                for key, payload in conn.execute(
+                    f"SELECT key, payload FROM ner_results WHERE key IN ({placeholders})", batch
+                ):
+                    found[key] = self._decode(payload)
+            if found:
+                now = self._tick(conn)
+                conn.executemany(
+                    "UPDATE ner_results SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        return found
+
+    def put_many(self, results: Dict[str, NERResult]) -> None:
+        """Store *results* and evict the least recently used overflow."""
+        if not results:
+            return
+        with connect(self.path) as conn:
+            now = self._tick(conn)
+            conn.executemany(
+                "INSERT INTO ner_results(key, payload, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET payload = excluded.payload, last_used = excluded.last_used",
+                [(key, json.dumps(asdict(result)), now) for key, result in results.items()],
+            )
+            self._evict(conn)
+
+    def __len__(self) -> int:
+        with connect(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM ner_results").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _tick(conn: sqlite3.Connection) -> int:
+        """Next value of the logical LRU clock (wall time is too coarse on some platforms)."""
+        return conn.execute("SELECT COALESCE(MAX(last_used), 0) + 1 FROM ner_results").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        overflow = conn.execute("SELECT COUNT(*) FROM ner_results").fetchone()[0] - self.max_entries
+        if overflow <= 0:
+            return
+        conn.execute(
+            "DELETE FROM ner_results WHERE key IN "
+            "(SELECT key FROM ner_results ORDER BY last_used ASC LIMIT ?)",
+            (overflow,),
+        )
+        logger.debug("NER cache evicted %d entries", overflow)
+
+    @staticmethod
+    def _decode(payload: str) -> NERResult:
+        raw = json.loads(payload)
+        entities: List[ExtractedEntity] = [ExtractedEntity(**e) for e in raw.get("entities", [])]
+        keyphrases: List[ExtractedKeyphrase] = [ExtractedKeyphrase(**k) for k in raw.get("keyphrases", [])]
+        return NERResult(entities=entities, keyphrases=keyphrases)
@@ -14,12 +14,16 @@ is registered).
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import os
 import sys
 from collections import Counter
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .ner_cache import NERCache
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +76,12 @@ def _load_model(model_path: Optional[str] = None) -> object:
         return None
 
 
+def _model_identity(nlp) -> str:
+    """Identify the loaded model (``lang_name-version``) for cache keys."""
+    meta = getattr(nlp, "meta", None) or {}
+    return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}"
+
+
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
@@ -117,6 +127,15 @@ _STOPCHUNK_WORDS = {
 }
 
 
+# Pipeline components needed for doc.ents and doc.noun_chunks (the parser
+# relies on tagger/attribute_ruler POS tags).  Everything else — lemmatizer,
+# textcat, custom components — is disabled in the batch path.
+_BATCH_KEEP_COMPONENTS = {
+    "tok2vec", "transformer", "tagger", "morphologizer", "attribute_ruler",
+    "parser", "ner", "entity_ruler",
+}
+
+
 def _dedupe_entities(entities: List[ExtractedEntity]) -> List[ExtractedEntity]:
     """Keep one entity per (normalised_text, label) pair."""
     seen: set[Tuple[str, str]] = set()
@@ -155,6 +174,7 @@ def extract_entities_and_keyphrases(
     max_text_chars: int = 100_000,
     min_chunk_words: int = 2,
     max_keyphrases: int = 30,
+    cache: Optional["NERCache"] = None,
 ) -> NERResult:
     """Run spaCy NER + noun-chunk keyphrase extraction on *text*.
 
@@ -173,7 +193,14 @@ def extract_entities_and_keyphrases(
         Minimum word count for a noun chunk to qualify as a keyphrase.
     max_keyphrases : int
         Maximum keyphrases to return.
+    cache : NERCache | None
+        Reuse a stored result for identical text (see ``ner_cache``).
     """
+    if cache is not None:
+        return extract_entities_and_keyphrases_batch(
+            [text], model_path, max_text_chars, min_chunk_words, max_keyphrases, batch_size=1, cache=cache,
+        )[0]
+
     nlp = _load_model(model_path)
     if nlp is None:
         return NERResult()
@@ -188,6 +215,94 @@ def extract_entities_and_keyphrases(
         logger.warning("spaCy processing failed: %s", exc)
         return NERResult()
 
+    result = _result_from_doc(doc, min_chunk_words, max_keyphrases)
+    logger.info("NER extracted %d entities, %d keyphrases", len(result.entities), len(result.keyphrases))
+    return result
+
+
+def extract_entities_and_keyphrases_batch(
+    texts: Sequence[str],
+    model_path: Optional[str] = None,
+    max_text_chars: int = 100_000,
+    min_chunk_words: int = 2,
+    max_keyphrases: int = 30,
+    batch_size: int = 64,
+    n_process: int = 1,
+    cache: Optional["NERCache"] = None,
+) -> List[NERResult]:
+    """Run NER + keyphrase extraction over many texts with ``nlp.pipe``.
+
+    Returns one ``NERResult`` per input text, in input order.  Components
+    not needed for entities or noun chunks are disabled for the run.  Falls
+    back to empty results if the model is unavailable or spaCy fails.
+
+    Parameters
+    ----------
+    texts : Sequence[str]
+        Texts to process (typically all chunks of one document).
+    batch_size : int
+        Number of texts spaCy buffers per batch.
+    n_process : int
+        spaCy worker processes.  Forced to 1 inside daemonic processes
+        (e.g. an ingest ``--workers`` pool), which cannot fork children.
+    cache : NERCache | None
+        Persistent result cache; only texts without a cached result for the
+        current model and parameters are sent to spaCy.
+
+    The remaining parameters match ``extract_entities_and_keyphrases``.
+    """
+    if not texts:
+        return []
+    nlp = _load_model(model_path)
+    if nlp is None:
+        return [NERResult() for _ in texts]
+
+    if n_process > 1 and multiprocessing.current_process().daemon:
+        n_process = 1
+    truncated = [text[:max_text_chars] for text in texts]
+
+    keys: List[str] = []
+    cached: dict = {}
+    if cache is not None:
+        params = f"{max_text_chars}:{min_chunk_words}:{max_keyphrases}"
+        model_id = _model_identity(nlp)
+        keys = [cache.key(text, model_id, params) for text in truncated]
+        try:
+            cached = cache.get_many(keys)
+        except Exception as exc:
+            logger.warning("NER cache lookup failed: %s", exc)
+    pending = [i for i in range(len(truncated)) if not keys or keys[i] not in cached]
+
+    results: List[Optional[NERResult]] = [cached.get(key) for key in keys] or [None] * len(texts)
+    if pending:
+        disable = [name for name in nlp.pipe_names if name not in _BATCH_KEEP_COMPONENTS]
+        try:
+            docs = nlp.pipe(
+                [truncated[i] for i in pending], batch_size=batch_size, n_process=n_process, disable=disable,
+            )
+            for i, doc in zip(pending, docs):
+                results[i] = _result_from_doc(doc, min_chunk_words, max_keyphrases)
+        except Exception as exc:
+            logger.warning("spaCy batch processing failed: %s", exc)
+            return [NERResult() for _ in texts]
+        if cache is not None:
+            try:
+                cache.put_many({keys[i]: results[i] for i in pending})
+            except Exception as exc:
+                logger.warning("NER cache store failed: %s", exc)
+
+    logger.info(
+        "NER batch processed %d texts (%d cached): %d entities, %d keyphrases",
+        len(results),
+        len(results) - len(pending),
+        sum(len(r.entities) for r in results),
+        sum(len(r.keyphrases) for r in results),
+    )
+    return results
+
+
+def _result_from_doc(doc, min_chunk_words: int, max_keyphrases: int) -> NERResult:
+    """Build an ``NERResult`` from a processed spaCy ``Doc``."""
     # 1. Named entities
     entities = [
         ExtractedEntity(
@@ -213,6 +328,4 @@ def extract_entities_and_keyphrases(
                 raw_chunks.append(clean)
 
     keyphrases = _rank_noun_chunks(raw_chunks, max_keyphrases)
-
-    logger.info("NER extracted %d entities, %d keyphrases", len(entities), len(keyphrases))
     return NERResult(entities=entities, keyphrases=keyphrases)
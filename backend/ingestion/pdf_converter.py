@@ -1,58 +1,80 @@
 from __future__ import annotations
 
 import hashlib
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterator
 
 
-def _extract_pdf_images(doc, output_dir: Path) -> list[str]:
-    """Extract embedded images from a PDF via PyMuPDF.
+@dataclass
+class PdfPage:
+    """One converted page: 1-based page number, raw text and images saved from it."""
+    number: int
+    text: str
+    image_paths: list[str] = field(default_factory=list)
+
+
+def _extract_page_images(doc, page, output_dir: Path, seen_xrefs: set[int]) -> list[str]:
+    """Extract the embedded images of one PDF page via PyMuPDF.
 
     Uses page.get_images() and doc.extract_image() to pull raster
-    images from every page.  Returns a list of saved file paths.
+    images; an image shared by several pages is saved once (*seen_xrefs*).
+    Returns a list of saved file paths.
     """
     image_paths: list[str] = []
-    seen_xrefs: set[int] = set()
     try:
-        for page in doc:
-            for img_info in page.get_images(full=True):
-                xref = img_info[0]
-                if xref in seen_xrefs:
-                    continue
-                seen_xrefs.add(xref)
-                base_image = doc.extract_image(xref)
-                if not base_image or not base_image.get("image"):
-                    continue
-                blob = base_image["image"]
-                ext = base_image.get("ext", "png")
-                content_hash = hashlib.sha256(blob).hexdigest()[:12]
-                filename = f"img_{content_hash}.{ext}"
-                dest = output_dir / filename
-                if not dest.exists():
-                    dest.write_bytes(blob)
-                image_paths.append(str(dest))
+        for img_info in page.get_images(full=True):
+            xref = img_info[0]
+            if xref in seen_xrefs:
+                continue
+            seen_xrefs.add(xref)
+            base_image = doc.extract_image(xref)
+            if not base_image or not base_image.get("image"):
+                continue
+            blob = base_image["image"]
+            ext = base_image.get("ext", "png")
+            content_hash = hashlib.sha256(blob).hexdigest()[:12]
+            filename = f"img_{content_hash}.{ext}"
+            dest = output_dir / filename
+            if not dest.exists():
+                dest.write_bytes(blob)
+            image_paths.append(str(dest))
     except Exception:
         pass  # graceful — image extraction is best-effort
     return image_paths
 
 
-def convert_pdf(path: str, images_dir: str | None = None) -> tuple[str, list[str]]:
+def iter_pdf_pages(path: str, images_dir: str | None = None) -> Iterator[PdfPage]:
+    """Yield the pages of a PDF one at a time.
+
+    Only the current page's text (and images, when *images_dir* is given)
+    is held in memory, so a large scanned document can be converted in a
+    bounded footprint.
+    """
     try:
         import fitz
     except Exception as exc:
         raise RuntimeError("PyMuPDF is required for PDF conversion") from exc
 
-    file_path = Path(path)
-    doc = fitz.open(str(file_path))
-    parts: list[str] = []
-    for page in doc:
-        parts.append(page.get_text("text"))
-
-    # Extract embedded images when an output directory is provided
-    image_paths: list[str] = []
+    out = None
     if images_dir:
         out = Path(images_dir)
         out.mkdir(parents=True, exist_ok=True)
-        image_paths = _extract_pdf_images(doc, out)
 
-    doc.close()
+    doc = fitz.open(str(Path(path)))
+    try:
+        seen_xrefs: set[int] = set()
+        for index, page in enumerate(doc):
+            image_paths = _extract_page_images(doc, page, out, seen_xrefs) if out is not None else []
+            yield PdfPage(number=index + 1, text=page.get_text("text"), image_paths=image_paths)
+    finally:
+        doc.close()
+
+
+def convert_pdf(path: str, images_dir: str | None = None) -> tuple[str, list[str]]:
+    parts: list[str] = []
+    image_paths: list[str] = []
+    for page in iter_pdf_pages(path, images_dir=images_dir):
+        parts.append(page.text)
+        image_paths.extend(page.image_paths)
     return "\n".join(parts), image_paths
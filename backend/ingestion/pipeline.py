@@ -0,0 +1,142 @@
+"""Bounded-queue stage pipeline for chunk-level ingestion work.
+
+``run_pipeline`` pushes items (batches of chunks) through a chain of
+stages, each served by its own worker thread(s) and connected by bounded
+queues.  A slow stage fills its input queue and blocks the stage before it
+(backpressure), so at most ``queue_size`` batches wait between any two
+stages.  spaCy NER and ONNX embedding both spend most of their time in
+native code, so a batch can be embedded while the next one is parsed.
+
+Each stage reports busy time, time starved for input and time blocked on
+a full output queue; ``utilization`` is busy time over wall time per worker.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """One pipeline step: ``fn(item) -> item`` run by *workers* threads."""
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    items: int = 0
+    busy_seconds: float = 0.0
+    starved_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+
+    def as_dict(self, wall_seconds: float) -> dict:
+        capacity = wall_seconds * self.workers
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "starved_seconds": round(self.starved_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "utilization": round(self.busy_seconds / capacity, 3) if capacity > 0 else 0.0,
+        }
+
+
+def run_pipeline(items: Iterable[Any], stages: Sequence[Stage], queue_size: int = 4) -> Tuple[List[Any], dict]:
+    """Run *items* through *stages*; return ``(outputs in input order, report)``.
+
+    The report is ``{"wall_seconds": float, "stages": {name: {...}}}``.  The
+    first exception raised by a stage stops the feed, drains the pipeline
+    and is re-raised here.
+    """
+    started = time.perf_counter()
+    queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in range(len(stages) + 1)]
+    stats = [StageStats(stage.name, max(1, stage.workers)) for stage in stages]
+    stats_lock = threading.Lock()
+    remaining = [s.workers for s in stats]
+    errors: List[BaseException] = []
+    failed = threading.Event()
+
+    def feed() -> None:
+        for index, item in enumerate(items):
+            if failed.is_set():
+                break
+            queues[0].put((index, item))
+        for _ in range(stats[0].workers if stages else 1):
+            queues[0].put(_DONE)
+
+    def work(position: int) -> None:
+        stage, stat = stages[position], stats[position]
+        inbox, outbox = queues[position], queues[position + 1]
+        busy = starved = blocked = 0.0
+        count = 0
+        while True:
+            t0 = time.perf_counter()
+            entry = inbox.get()
+            t1 = time.perf_counter()
+            starved += t1 - t0
+            if entry is _DONE:
+                break
+            if failed.is_set():
+                continue  # drain without working
+            index, item = entry
+            try:
+                result = stage.fn(item)
+            except BaseException as exc:  # re-raised by run_pipeline
+                with stats_lock:
+                    errors.append(exc)
+                failed.set()
+                continue
+            t2 = time.perf_counter()
+            busy += t2 - t1
+            count += 1
+            outbox.put((index, result))
+            blocked += time.perf_counter() - t2
+        with stats_lock:
+            stat.items += count
+            stat.busy_seconds += busy
+            stat.starved_seconds += starved
+            stat.blocked_seconds += blocked
+            remaining[position] -= 1
+            last = remaining[position] == 0
+        if last:
+            # Downstream stage (or the collector) needs one marker per worker
+            downstream = stats[position + 1].workers if position + 1 < len(stages) else 1
+            for _ in range(downstream):
+                outbox.put(_DONE)
+
+    threads = [threading.Thread(target=feed, name="pipeline-feed", daemon=True)]
+    for position, stat in enumerate(stats):
+        threads.extend(
+            threading.Thread(target=work, args=(position,), name=f"pipeline-{stat.name}-{n}", daemon=True)
+            for n in range(stat.workers)
+        )
+    for thread in threads:
+        thread.start()
+
+    results: Dict[int, Any] = {}
+    while True:
+        entry = queues[-1].get()
+        if entry is _DONE:
+            break
+        results[entry[0]] = entry[1]
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    wall = time.perf_counter() - started
+    report = {
+        "wall_seconds": round(wall, 3),
+        "stages": {stat.name: stat.as_dict(wall) for stat in stats},
+    }
+    return [results[i] for i in sorted(results)], report
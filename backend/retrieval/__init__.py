@@ -15,6 +15,8 @@ from .evidence_matcher import (
 )
 from .acronym_resolver import AcronymResolver
 from .query_expander import QueryExpander
+from .query_context import QueryContext
+from .rerank import rerank_rows
 from .cross_encoder import rerank as cross_encoder_rerank, score_pairs as cross_encoder_score_pairs
 from .term_registry import TermRegistry
 
@@ -32,6 +34,8 @@ __all__ = [
     "validate_strict_mode",
     "AcronymResolver",
     "QueryExpander",
+    "QueryContext",
+    "rerank_rows",
     "cross_encoder_rerank",
     "cross_encoder_score_pairs",
     "TermRegistry",
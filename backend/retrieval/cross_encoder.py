@@ -8,12 +8,21 @@ extension and its path is communicated via the
 ``KTS_CROSSENCODER_MODEL_PATH`` environment variable.
 
 Gated behind ``config.cross_encoder_enabled``.
+
+Pairs are sorted by token length and batched so each batch is padded
+only to its own longest sequence; scores are returned in input order.
+Logits are cached per (model file hash, max_length, whitespace-normalised
+query, passage hash), so repeated and incremental reranks only score new pairs.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -24,14 +33,40 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 _session = None
 _tokenizer = None
+_model_hash = ""
+
+# ---------------------------------------------------------------------------
+# Score cache — (model hash, max_length, query, passage hash) → logit
+# ---------------------------------------------------------------------------
+_score_cache: "OrderedDict[tuple, float]" = OrderedDict()
+_score_cache_lock = threading.Lock()
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def clear_score_cache() -> None:
+    with _score_cache_lock:
+        _score_cache.clear()
+
 
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-def _load_model(model_path: Optional[str] = None):
+
+def _load_model(
+    model_path: Optional[str] = None,
+    intra_op_threads: int = 2,
+    inter_op_threads: int = 1,
+):
     """Load the ONNX cross-encoder model.
 
+    Thread counts only apply to the first (singleton) load.
     Returns ``(session, tokenizer)`` or ``(None, None)`` on failure.
     """
-    global _session, _tokenizer
+    global _session, _tokenizer, _model_hash
     if _session is not None:
         return _session, _tokenizer
 
@@ -65,7 +100,10 @@ def _load_model(model_path: Optional[str] = None):
         # Load ONNX session with CPU execution provider
         sess_options = ort.SessionOptions()
         sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-        sess_options.intra_op_num_threads = 2
+        sess_options.intra_op_num_threads = max(1, intra_op_threads)
+        sess_options.inter_op_num_threads = max(1, inter_op_threads)
+        if inter_op_threads > 1:
+            sess_options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
         _session = ort.InferenceSession(
             str(onnx_file),
             sess_options=sess_options,
@@ -82,6 +120,7 @@ def _load_model(model_path: Optional[str] = None):
             _session = None
             return None, None
 
+        _model_hash = _file_hash(onnx_file)
         logger.info("Cross-encoder ONNX model loaded from %s", onnx_file)
         return _session, _tokenizer
 
@@ -97,11 +136,30 @@ def _load_model(model_path: Optional[str] = None):
 # Public API
 # ---------------------------------------------------------------------------
 
+def _encode_pairs(tokenizer, query: str, passages: List[str], max_length: int):
+    """Tokenize ``(query, passage)`` pairs, truncated to *max_length* tokens."""
+    encoded = []
+    for passage in passages:
+        encoding = tokenizer.encode(query, passage)
+        encoded.append((encoding.ids[:max_length], encoding.type_ids[:max_length]))
+    return encoded
+
+
+def _length_batches(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """Group indices into batches of similar length (stable sort by length)."""
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+
 def score_pairs(
     query: str,
     passages: List[str],
     model_path: Optional[str] = None,
     max_length: int = 512,
+    batch_size: int = 16,
+    intra_op_threads: int = 2,
+    inter_op_threads: int = 1,
+    cache_size: int = 4096,
 ) -> List[float]:
     """Score ``(query, passage)`` pairs using the ONNX cross-encoder.
 
@@ -118,8 +176,14 @@ def score_pairs(
         Override path to the ONNX model directory.
     max_length : int
         Maximum token length for the cross-encoder input.
+    batch_size : int
+        Pairs per ONNX run; each batch is padded to its longest pair.
+    intra_op_threads, inter_op_threads : int
+        ONNX Runtime thread counts, applied when the model is first loaded.
+    cache_size : int
+        Bound on cached logits (LRU, shared across calls); 0 disables the cache.
     """
-    session, tokenizer = _load_model(model_path)
+    session, tokenizer = _load_model(model_path, intra_op_threads, inter_op_threads)
     if session is None or tokenizer is None:
         return []
 
@@ -129,40 +193,43 @@ def score_pairs(
     try:
         import numpy as np  # noqa: E402  — available via onnxruntime
 
-        scores = []
-        # Process in small batches to limit memory
-        batch_size = 16
-        for i in range(0, len(passages), batch_size):
-            batch = passages[i : i + batch_size]
-
-            # Tokenize (query, passage) pairs
-            input_ids_list = []
-            attention_mask_list = []
-            token_type_ids_list = []
-
-            for passage in batch:
-                encoding = tokenizer.encode(query, passage)
-                ids = encoding.ids[:max_length]
-                type_ids = encoding.type_ids[:max_length]
-                attn = [1] * len(ids)
-
-                # Pad to max_length
-                pad_len = max_length - len(ids)
-                ids = ids + [0] * pad_len
-                type_ids = type_ids + [0] * pad_len
-                attn = attn + [0] * pad_len
-
-                input_ids_list.append(ids)
-                attention_mask_list.append(attn)
-                token_type_ids_list.append(type_ids)
-
-            # Build numpy arrays
-            input_ids = np.array(input_ids_list, dtype=np.int64)
-            attention_mask = np.array(attention_mask_list, dtype=np.int64)
-            token_type_ids = np.array(token_type_ids_list, dtype=np.int64)
+        scores: List[float] = [0.0] * len(passages)
+        query_key = _WHITESPACE_RE.sub(" ", query).strip()
+        keys = [
+            (_model_hash, max_length, query_key, hashlib.sha256(p.encode("utf-8")).hexdigest())
+            for p in passages
+        ]
+
+        # Only pairs missing from the cache are tokenized and scored
+        todo: List[int] = []
+        with _score_cache_lock:
+            for i, key in enumerate(keys):
+                cached = _score_cache.get(key) if cache_size > 0 else None
+                if cached is None:
+                    todo.append(i)
+                else:
+                    _score_cache.move_to_end(key)
+                    scores[i] = cached
+        if not todo:
+            return scores
+
+        encoded = _encode_pairs(tokenizer, query, [passages[i] for i in todo], max_length)
+        input_names = [inp.name for inp in session.get_inputs()]
+        fresh: List[float] = [0.0] * len(todo)
+
+        # Similar lengths share a batch, so dynamic padding wastes little
+        for batch in _length_batches([len(ids) for ids, _ in encoded], max(1, batch_size)):
+            width = max(len(encoded[i][0]) for i in batch)
+            input_ids = np.zeros((len(batch), width), dtype=np.int64)
+            attention_mask = np.zeros((len(batch), width), dtype=np.int64)
+            token_type_ids = np.zeros((len(batch), width), dtype=np.int64)
+            for row, i in enumerate(batch):
+                ids, type_ids = encoded[i]
+                input_ids[row, : len(ids)] = ids
+                attention_mask[row, : len(ids)] = 1
+                token_type_ids[row, : len(type_ids)] = type_ids
 
             # Run inference
-            input_names = [inp.name for inp in session.get_inputs()]
             feed = {}
             for name in input_names:
                 if "input_ids" in name:
@@ -175,13 +242,19 @@ def score_pairs(
             outputs = session.run(None, feed)
             logits = outputs[0]  # shape: (batch_size, 1) or (batch_size,)
 
-            # Extract scores
-            if logits.ndim == 2:
-                batch_scores = logits[:, 0].tolist()
-            else:
-                batch_scores = logits.tolist()
+            # Extract scores and restore input order
+            batch_scores = logits[:, 0].tolist() if logits.ndim == 2 else logits.tolist()
+            for i, score in zip(batch, batch_scores):
+                fresh[i] = score
 
-            scores.extend(batch_scores)
+        for i, score in zip(todo, fresh):
+            scores[i] = score
+        if cache_size > 0:
+            with _score_cache_lock:
+                for i, score in zip(todo, fresh):
+                    _score_cache[keys[i]] = score
+                while len(_score_cache) > cache_size:
+                    _score_cache.popitem(last=False)
 
         return scores
 
@@ -196,6 +269,10 @@ def rerank(
     model_path: Optional[str] = None,
     content_key: str = "content",
     score_key: str = "cross_encoder_score",
+    batch_size: int = 16,
+    intra_op_threads: int = 2,
+    inter_op_threads: int = 1,
+    cache_size: int = 4096,
 ) -> List[Dict]:
     """Re-rank a list of search result dicts by cross-encoder score.
 
@@ -211,7 +288,15 @@ def rerank(
     logger.info(f"Cross-encoder reranking {len(rows)} candidates...")
     
     passages = [str(row.get(content_key, "")) for row in rows]
-    scores = score_pairs(query, passages, model_path=model_path)
+    scores = score_pairs(
+        query,
+        passages,
+        model_path=model_path,
+        batch_size=batch_size,
+        intra_op_threads=intra_op_threads,
+        inter_op_threads=inter_op_threads,
+        cache_size=cache_size,
+    )
 
     if not scores:
         logger.warning(f"Cross-encoder scoring returned no scores (model unavailable or failed)")
@@ -0,0 +1,90 @@
+"""Bounded LRU/TTL cache for retrieval results.
+
+Chat retries, follow-ups and golden-query runs re-issue the same query
+many times against an unchanged corpus.  ``RetrievalService`` keys each
+result by the whitespace-normalised query, the request options, the retrieval
+config and the corpus generation (vector store + graph store write
+counters), so any ingest, vacuum or vision update makes older entries
+unreachable; they age out of the LRU.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Whitespace-insensitive form of *query*.
+
+    Case is kept: acronym expansion, term resolution and NER behind the
+    cache are case-sensitive, so "PSA" and "psa" can retrieve differently.
+    """
+    return _WHITESPACE_RE.sub(" ", query).strip()
+
+
+def make_key(query: str, options: dict, config_repr: str, generation: Tuple[int, ...]) -> str:
+    """Stable cache key for one retrieval request."""
+    payload = json.dumps(
+        [normalize_query(query), options, config_repr, list(generation)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class QueryResultCache:
+    """Thread-safe LRU of results with a per-entry time-to-live."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600.0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl_seconds <= 0 or now - entry[0] <= self.ttl_seconds):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
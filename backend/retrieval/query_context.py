@@ -0,0 +1,100 @@
+"""Per-query state shared by every candidate row during reranking.
+
+Everything in ``RetrievalService._compute_feature_scores`` and
+``rerank_scorer`` that depends only on the query — error codes, intent,
+significant terms, NER entity/keyphrase sets, legal-term hit, graph
+concepts — is computed once per request and stored here, so scoring a row
+only does row-side work.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Set
+
+# Error codes: ERR-UPL-013, HTTP 504, AUTH401 …
+ERROR_CODE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\bERR-[A-Z]+-\d{3}\b',
+        r'\bHTTP\s*\d{3}\b',
+        r'\b[A-Z]+\d{3,4}\b',
+    )
+)
+
+QUERY_TERM_PATTERN = re.compile(r'\b\w{3,}\b')
+
+QUERY_STOPWORDS = frozenset(
+    {"the", "a", "an", "is", "are", "was", "were", "for", "to", "of", "in", "on", "at", "by"}
+)
+
+# Intents precise enough to boost their expected doc_type 1.5×
+HIGH_CONFIDENCE_INTENTS = frozenset({"reference_catalog", "ui_page_access", "file_capability"})
+
+# Query words that earn GOVERNING_DOC rows a mild boost
+LEGAL_TERMS = frozenset(
+    {"agreement", "pooling", "servicing", "trust",
+     "certificate", "trustee", "indenture", "mortgage",
+     "obligor", "servicer", "depositor", "beneficiary",
+     "reporting", "statement", "distribution"}
+)
+
+
+def extract_error_codes(text: str) -> List[str]:
+    """Extract error codes from *text*, upper-cased, in pattern order."""
+    codes: List[str] = []
+    for pattern in ERROR_CODE_PATTERNS:
+        codes.extend(pattern.findall(text))
+    return [c.upper() for c in codes]
+
+
+def query_terms(query_lower: str) -> List[str]:
+    """Significant query terms (3+ word characters, not stopwords), in order."""
+    return [w for w in QUERY_TERM_PATTERN.findall(query_lower) if w not in QUERY_STOPWORDS]
+
+
+def has_legal_term(query_lower: str) -> bool:
+    return bool(set(query_lower.split()) & LEGAL_TERMS)
+
+
+def normalize_entity(text: str) -> str:
+    """Lowercase, strip a leading "the " and a possessive 's / s'."""
+    normalized = text.lower().strip()
+    if normalized.startswith("the "):
+        normalized = normalized[4:]
+    if normalized.endswith("'s"):
+        normalized = normalized[:-2]
+    elif normalized.endswith("s'"):
+        normalized = normalized[:-2]
+    return normalized.strip()
+
+
+@dataclass
+class QueryContext:
+    """Query-only inputs to feature scoring, computed once per request."""
+    query: str
+    query_lower: str
+    error_codes: Set[str]
+    intent: str
+    expected_doc_types: List[str]
+    intent_enabled: bool = True
+    terms: List[str] = field(default_factory=list)
+    entity_texts: Set[str] = field(default_factory=set)
+    keyphrase_texts: Set[str] = field(default_factory=set)
+    legal_term_hit: bool = False
+    concept_nodes: List[str] = field(default_factory=list)
+
+    @property
+    def top_terms(self) -> List[str]:
+        """Terms used for content keyword density (first five)."""
+        return self.terms[:5]
+
+    def intent_match(self, row_type: str) -> float:
+        """Rank-weighted boost when *row_type* is one of the expected doc types."""
+        if not self.intent_enabled or row_type not in self.expected_doc_types:
+            return 0.0
+        feature = 1.0 / (self.expected_doc_types.index(row_type) + 1)
+        if self.intent in HIGH_CONFIDENCE_INTENTS:
+            feature *= 1.5
+        return feature
@@ -0,0 +1,153 @@
+"""Vectorised fusion of retrieval signals into the final rerank score.
+
+Per-row features (``RetrievalService._compute_feature_scores``) and graph
+boosts are gathered into one matrix and combined with NumPy in a single
+pass.  The formula is the one ``RetrievalService.execute`` has always
+applied row by row::
+
+    score = vector_similarity * (1 + graph_boost)
+    score = 0.6 * sigmoid(ce_logit) + 0.4 * score          (if CE scored)
+    score *= 1.5                                            (error code match)
+    score *= 1 + intent_doc_type_match
+    score *= 1 + 0.5 * entity_overlap
+    score *= 1 + 0.3 * entity_keyphrase_match
+    score *= 0.6      (TROUBLESHOOT row, file_capability intent)
+    score *= 1.3      (GOVERNING_DOC row, legal-term query)
+
+Boosts that do not apply multiply by exactly 1.0, so scores — and the
+stable descending order — match the scalar computation.
+
+For cascaded reranking the same formula, evaluated before any
+cross-encoder score exists, is the cheap first stage:
+``select_for_cross_encoder`` picks the rows worth a cross-encoder pass,
+and ``rerank_rows`` ranks the scored rows ahead of the rest.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np  # available via onnxruntime
+
+from .query_context import QueryContext
+
+# Column order of the candidate feature matrix.
+FEATURE_COLUMNS = (
+    "score",
+    "cross_encoder_score",
+    "graph_boost",
+    "error_code_exact_match",
+    "intent_doc_type_match",
+    "entity_overlap",
+    "entity_keyphrase_match",
+)
+_COL = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+
+
+def build_feature_matrix(
+    rows: Sequence[dict],
+    features: Sequence[Dict[str, float]],
+    graph_boosts: Sequence[float],
+) -> np.ndarray:
+    """Stack per-row signals into an ``(n, len(FEATURE_COLUMNS))`` float64 matrix.
+
+    Rows without a cross-encoder score get NaN in that column.
+    """
+    nan = float("nan")
+    table = []
+    for row, feats, boost in zip(rows, features, graph_boosts):
+        ce = row.get("cross_encoder_score")
+        table.append((
+            float(row.get("score", 0.0)),
+            nan if ce is None else float(ce),
+            boost,
+            feats.get("error_code_exact_match", 0.0),
+            feats.get("intent_doc_type_match", 0.0),
+            feats.get("entity_overlap", 0.0),
+            feats.get("entity_keyphrase_match", 0.0),
+        ))
+    return np.array(table, dtype=np.float64).reshape(len(table), len(FEATURE_COLUMNS))
+
+
+def fused_scores(matrix: np.ndarray, doc_types: Sequence[str], ctx: QueryContext) -> np.ndarray:
+    """Apply the hybrid rerank formula to every row of *matrix* at once."""
+    col = lambda name: matrix[:, _COL[name]]  # noqa: E731
+
+    scores = col("score") * (1.0 + col("graph_boost"))
+
+    ce = col("cross_encoder_score")
+    has_ce = ~np.isnan(ce)
+    if has_ce.any():
+        with np.errstate(over="ignore"):
+            ce_norm = 1.0 / (1.0 + np.exp(-ce[has_ce]))
+        scores[has_ce] = 0.6 * ce_norm + 0.4 * scores[has_ce]
+
+    error = col("error_code_exact_match")
+    scores *= np.where(error > 0, 1.5, 1.0)
+    intent = col("intent_doc_type_match")
+    scores *= np.where(intent > 0, 1.0 + intent, 1.0)
+    entity = col("entity_overlap")
+    scores *= np.where(entity > 0, 1.0 + 0.5 * entity, 1.0)
+    keyphrase = col("entity_keyphrase_match")
+    scores *= np.where(keyphrase > 0, 1.0 + 0.3 * keyphrase, 1.0)
+
+    types = np.asarray(doc_types, dtype=object)
+    if ctx.intent == "file_capability":
+        # Q38 fix: de-boost TROUBLESHOOT for capability queries
+        scores *= np.where(types == "TROUBLESHOOT", 0.6, 1.0)
+    if ctx.legal_term_hit:
+        # Mild boost for legal docs when the query uses legal terms
+        scores *= np.where(types == "GOVERNING_DOC", 1.3, 1.0)
+    return scores
+
+
+def select_for_cross_encoder(
+    rows: Sequence[dict],
+    features: Sequence[Dict[str, float]],
+    graph_boosts: Sequence[float],
+    ctx: QueryContext,
+    top_k: int,
+    skip_expanded: bool = True,
+) -> List[int]:
+    """Indices of the *top_k* rows by cheap (pre-cross-encoder) fused score.
+
+    Context-expansion neighbours (``_is_expanded``) are never selected when
+    *skip_expanded* is set.  ``top_k <= 0`` selects every eligible row.
+    """
+    if not rows:
+        return []
+    matrix = build_feature_matrix(rows, features, graph_boosts)
+    matrix[:, _COL["cross_encoder_score"]] = np.nan
+    scores = fused_scores(matrix, [row.get("doc_type", "UNKNOWN") for row in rows], ctx)
+    eligible = [
+        i for i in np.argsort(-scores, kind="stable").tolist()
+        if not (skip_expanded and rows[i].get("_is_expanded"))
+    ]
+    return sorted(eligible[:top_k] if top_k > 0 else eligible)
+
+
+def rerank_rows(
+    rows: List[dict],
+    features: Sequence[Dict[str, float]],
+    graph_boosts: Sequence[float],
+    ctx: QueryContext,
+) -> List[dict]:
+    """Return *rows* ordered by fused score, best first.
+
+    Each row gets ``_rerank_score``; ties keep their retrieval order.  Rows
+    without a cross-encoder score (not selected by the cascade) keep the
+    vector-based formula, as when no cross-encoder is installed.  That
+    score is on a different scale from the blended one, so when the
+    cascade scored some rows they all rank ahead of the unscored rows,
+    which follow in cheap-score order.
+    """
+    if not rows:
+        return []
+    matrix = build_feature_matrix(rows, features, graph_boosts)
+    doc_types = [row.get("doc_type", "UNKNOWN") for row in rows]
+    scores = fused_scores(matrix, doc_types, ctx)
+    for row, score in zip(rows, scores.tolist()):
+        row["_rerank_score"] = score
+    unscored = np.isnan(matrix[:, _COL["cross_encoder_score"]])
+    order = np.lexsort((-scores, unscored))  # stable: ties keep retrieval order
+    return [rows[i] for i in order.tolist()]
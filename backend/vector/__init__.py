@@ -1,4 +1,4 @@
-from .store import VectorStore
-from .chunker import chunk_document
+from .store import EmbeddingModelMismatchError, VectorStore
+from .chunker import chunk_document, chunk_pages
 
-__all__ = ["VectorStore", "chunk_document"]
+__all__ = ["EmbeddingModelMismatchError", "VectorStore", "chunk_document", "chunk_pages"]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from backend.common.models import TextChunk
 from backend.common.text_utils import chunk_text
@@ -82,3 +84,83 @@ def chunk_document(doc_id: str, source_path: str, text: str, chunk_size: int, ch
         )
         for index, chunk in enumerate(chunks)
     ]
+
+
+def _page_at(starts: list[int], pages: list[int], offset: int) -> int | None:
+    position = bisect_right(starts, offset) - 1
+    return pages[max(position, 0)] if pages else None
+
+
+def chunk_pages(
+    doc_id: str,
+    source_path: str,
+    pages: Iterable[tuple[int, str]],
+    chunk_size: int,
+    chunk_overlap: int,
+    window_chars: int = 200_000,
+) -> Iterator[TextChunk]:
+    """Chunk a stream of ``(page_number, text)`` pages without joining the whole document.
+
+    Pages are buffered (joined by a blank line) until about *window_chars*
+    of text is waiting; the window is split with ``chunk_text`` and every
+    chunk but the last is emitted.  The last one may continue on the next
+    page, so its text starts the next window.  Memory therefore stays
+    proportional to the window, not the document.  Each chunk records the
+    first and last page its text comes from.
+    """
+    window_chars = max(window_chars, chunk_size * 4)
+    parts: list[str] = []
+    starts: list[int] = []  # offset of each buffered page within the window
+    page_numbers: list[int] = []
+    size = 0
+    index = 0
+
+    def _split(final: bool) -> Iterator[TextChunk]:
+        nonlocal parts, starts, page_numbers, size, index
+        window = "".join(parts)
+        pieces = chunk_text(window, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        emit = pieces if final else pieces[:-1]
+        cursor = 0
+        for piece in emit:
+            start = window.find(piece, cursor)
+            if start < 0:  # separator normalised away; attribute to the running position
+                start = cursor
+            yield TextChunk(
+                chunk_id=f"{doc_id}_chunk_{index}",
+                doc_id=doc_id,
+                content=_anchor_chunk_with_metadata(source_path=source_path, chunk=piece),
+                source_path=source_path,
+                chunk_index=index,
+                page=_page_at(starts, page_numbers, start),
+                page_end=_page_at(starts, page_numbers, start + len(piece) - 1),
+            )
+            index += 1
+            cursor = start + 1
+        if final or not pieces:
+            parts, starts, page_numbers, size = [], [], [], 0
+            return
+        # Carry the unfinished tail (it ends at the window's end) into the next window
+        tail = pieces[-1]
+        tail_start = window.rfind(tail)
+        if tail_start < 0:
+            tail_start = max(0, len(window) - len(tail))
+        kept = bisect_right(starts, tail_start) - 1
+        starts = [0] + [s - tail_start for s in starts[kept + 1:]]
+        page_numbers = page_numbers[max(kept, 0):]
+        parts = [window[tail_start:]]
+        size = len(parts[0])
+
+    for page_number, text in pages:
+        if not text:
+            continue
+        if parts:
+            parts.append("\n\n")
+            size += 2
+        starts.append(size)
+        page_numbers.append(page_number)
+        parts.append(text)
+        size += len(text)
+        if size >= window_chars:
+            yield from _split(final=False)
+    if parts:
+        yield from _split(final=True)
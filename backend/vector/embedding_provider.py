@@ -0,0 +1,273 @@
+"""Embedding providers shared by VectorStore, TermRegistry and query-time search.
+
+Two backends:
+
+- ``DefaultEmbeddingProvider`` — ChromaDB's bundled all-MiniLM-L6-v2
+  (``DefaultEmbeddingFunction``), used when no model path is configured.
+- ``OnnxEmbeddingProvider`` — a MiniLM or BGE ONNX export plus its
+  ``tokenizer.json`` (path via ``KTS_EMBEDDING_MODEL_PATH``).  An int8
+  model file (``model_quantized.onnx`` / ``*int8*.onnx``) is preferred when
+  present and ``embedding_quantized`` is on.
+
+Texts are embedded in ``embedding_batch_size`` batches; the ONNX backend
+sorts texts by length so each batch is padded only to its own longest
+sequence, and keeps one ``InferenceSession`` per model file and thread
+setting.  ``get_embedding_provider`` returns one shared provider per
+configuration, so every component in a process embeds through the same
+session.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np  # available via onnxruntime
+
+logger = logging.getLogger(__name__)
+
+# Model presets: pooling, default max tokens, query instruction prefix.
+MODEL_PRESETS: Dict[str, Dict[str, Any]] = {
+    "minilm": {"pooling": "mean", "max_length": 256, "query_instruction": ""},
+    "bge": {
+        "pooling": "cls",
+        "max_length": 512,
+        "query_instruction": "Represent this sentence for searching relevant passages: ",
+    },
+}
+
+# Int8 exports, in order of preference.
+_QUANTIZED_PATTERNS = ("model_quantized.onnx", "model_int8.onnx", "*quantized*.onnx", "*int8*.onnx", "*qint8*.onnx")
+
+_sessions: Dict[Tuple[str, int, int], Any] = {}
+_sessions_lock = threading.Lock()
+
+_providers: Dict[tuple, "EmbeddingProvider"] = {}
+_providers_lock = threading.Lock()
+
+
+class EmbeddingProvider(ABC):
+    """Callable ``List[str] -> List[vector]``; ``__call__`` embeds documents."""
+
+    name = "base"
+
+    def __init__(self, batch_size: int = 32):
+        self.batch_size = max(1, int(batch_size))
+
+    def __call__(self, texts: List[str]) -> List[Any]:
+        return self.embed_documents(texts)
+
+    @abstractmethod
+    def embed_documents(self, texts: List[str]) -> List[Any]:
+        raise NotImplementedError
+
+    def embed_queries(self, texts: List[str]) -> List[Any]:
+        return self.embed_documents(texts)
+
+
+class DefaultEmbeddingProvider(EmbeddingProvider):
+    """ChromaDB's bundled all-MiniLM-L6-v2, called in fixed-size batches."""
+
+    name = "minilm"
+
+    def __init__(self, batch_size: int = 32):
+        super().__init__(batch_size)
+        from chromadb.utils import embedding_functions
+
+        self._ef = embedding_functions.DefaultEmbeddingFunction()
+
+    def embed_documents(self, texts: List[str]) -> List[Any]:
+        vectors: List[Any] = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._ef(list(texts[start:start + self.batch_size])))
+        return vectors
+
+
+def find_model_file(model_path: str | Path, quantized: bool = True) -> Optional[Path]:
+    """Resolve the ONNX file for *model_path* (a ``.onnx`` file or model directory).
+
+    Directories are searched at the top level and in ``onnx/`` (Hugging Face
+    export layout); with *quantized*, int8 files win over ``model.onnx``.
+    """
+    path = Path(model_path)
+    if path.is_file():
+        return path if path.suffix == ".onnx" else None
+    if not path.is_dir():
+        return None
+    for directory in (path, path / "onnx"):
+        if not directory.is_dir():
+            continue
+        if quantized:
+            for pattern in _QUANTIZED_PATTERNS:
+                matches = sorted(directory.glob(pattern))
+                if matches:
+                    return matches[0]
+        if (directory / "model.onnx").is_file():
+            return directory / "model.onnx"
+        matches = sorted(directory.glob("*.onnx"))
+        if matches:
+            return matches[0]
+    return None
+
+
+def _find_tokenizer(model_path: Path, onnx_file: Path) -> Optional[Path]:
+    for directory in (model_path if model_path.is_dir() else model_path.parent, onnx_file.parent, onnx_file.parent.parent):
+        candidate = directory / "tokenizer.json"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _load_session(onnx_file: Path, intra_op_threads: int, inter_op_threads: int):
+    """One ``InferenceSession`` per (model file, thread settings), created on first use."""
+    key = (str(onnx_file.resolve()), intra_op_threads, inter_op_threads)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            import onnxruntime as ort
+
+            sess_options = ort.SessionOptions()
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            sess_options.intra_op_num_threads = max(1, intra_op_threads)
+            sess_options.inter_op_num_threads = max(1, inter_op_threads)
+            if inter_op_threads > 1:
+                sess_options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+            session = ort.InferenceSession(
+                str(onnx_file),
+                sess_options=sess_options,
+                providers=["CPUExecutionProvider"],
+            )
+            _sessions[key] = session
+            logger.info("Embedding model loaded from %s", onnx_file)
+    return session
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    """Sentence embeddings from an ONNX transformer export (MiniLM or BGE)."""
+
+    def __init__(
+        self,
+        model_path: str,
+        model: str = "minilm",
+        batch_size: int = 32,
+        max_length: int = 0,
+        quantized: bool = True,
+        intra_op_threads: int = 4,
+        inter_op_threads: int = 1,
+        session=None,
+        tokenizer=None,
+    ):
+        super().__init__(batch_size)
+        if model not in MODEL_PRESETS:
+            raise ValueError(f"Unknown embedding model {model!r}; expected one of {sorted(MODEL_PRESETS)}")
+        preset = MODEL_PRESETS[model]
+        self.name = model
+        self.pooling = preset["pooling"]
+        self.query_instruction = preset["query_instruction"]
+        self.max_length = int(max_length) or preset["max_length"]
+        self.model_file: Optional[Path] = None
+
+        if session is None or tokenizer is None:
+            self.model_file = find_model_file(model_path, quantized)
+            if self.model_file is None:
+                raise FileNotFoundError(f"No ONNX embedding model found at {model_path}")
+            tokenizer_path = _find_tokenizer(Path(model_path), self.model_file)
+            if tokenizer_path is None:
+                raise FileNotFoundError(f"tokenizer.json not found next to {self.model_file}")
+            from tokenizers import Tokenizer
+
+            tokenizer = Tokenizer.from_file(str(tokenizer_path))
+            session = _load_session(self.model_file, intra_op_threads, inter_op_threads)
+
+        tokenizer.enable_truncation(max_length=self.max_length)
+        tokenizer.no_padding()
+        self._tokenizer = tokenizer
+        self._session = session
+        self._input_names = {i.name for i in session.get_inputs()}
+
+    def embed_documents(self, texts: List[str]) -> List[Any]:
+        return self._embed(list(texts))
+
+    def embed_queries(self, texts: List[str]) -> List[Any]:
+        return self._embed([self.query_instruction + t for t in texts])
+
+    def _embed(self, texts: List[str]) -> List[Any]:
+        """L2-normalised embeddings for *texts*, in input order."""
+        if not texts:
+            return []
+        encodings = self._tokenizer.encode_batch(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(encodings[i].ids))
+        vectors: List[Any] = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            for i, vector in zip(batch, self._run([encodings[i] for i in batch])):
+                vectors[i] = vector
+        return vectors
+
+    def _run(self, encodings) -> np.ndarray:
+        width = max(len(e.ids) for e in encodings)
+        input_ids = np.zeros((len(encodings), width), dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), width), dtype=np.int64)
+        token_type_ids = np.zeros((len(encodings), width), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            n = len(encoding.ids)
+            input_ids[row, :n] = encoding.ids
+            attention_mask[row, :n] = encoding.attention_mask
+            token_type_ids[row, :n] = encoding.type_ids
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = token_type_ids
+
+        output = np.asarray(self._session.run(None, feeds)[0], dtype=np.float32)
+        if output.ndim == 3:  # token embeddings → pool
+            if self.pooling == "cls":
+                output = output[:, 0]
+            else:
+                mask = attention_mask[:, :, None].astype(np.float32)
+                output = (output * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(output, axis=1, keepdims=True)
+        return output / np.clip(norms, 1e-12, None)
+
+
+def get_embedding_provider(config=None) -> EmbeddingProvider:
+    """Shared provider for *config* (bundled MiniLM when no model path is set).
+
+    Falls back to the bundled model, with a warning, if the configured ONNX
+    model cannot be loaded.  ``VectorStore`` refuses to open a collection
+    embedded with another model, so the fallback never mixes vectors.
+    """
+    model = getattr(config, 'embedding_model', 'minilm')
+    model_path = getattr(config, 'embedding_model_path', '')
+    batch_size = getattr(config, 'embedding_batch_size', 32)
+    settings = (
+        model,
+        model_path,
+        batch_size,
+        getattr(config, 'embedding_max_length', 0),
+        getattr(config, 'embedding_quantized', True),
+        getattr(config, 'embedding_intra_op_threads', 4),
+        getattr(config, 'embedding_inter_op_threads', 1),
+    )
+    with _providers_lock:
+        provider = _providers.get(settings)
+        if provider is None:
+            if model_path:
+                try:
+                    provider = OnnxEmbeddingProvider(
+                        model_path,
+                        model=model,
+                        batch_size=batch_size,
+                        max_length=settings[3],
+                        quantized=settings[4],
+                        intra_op_threads=settings[5],
+                        inter_op_threads=settings[6],
+                    )
+                except Exception as exc:
+                    logger.warning("Embedding model %s unavailable (%s) — using bundled MiniLM", model_path, exc)
+            if provider is None:
+                provider = DefaultEmbeddingProvider(batch_size)
+            _providers[settings] = provider
+    return provider
@@ -18,13 +18,19 @@ Usage:
     chunker = LegalChunker(min_chunk_size=500, max_chunk_size=5000)
     sections = chunker.extract_sections(text)
     chunks = chunker.chunk_by_sections(doc_id, source_path, sections)
+
+Paginated sources too large to hold as one string (streamed PDFs) use
+``chunk_legal_pages``, which reads the pages twice and keeps only one
+top-level section in memory at a time.
 """
 
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional
+from typing import Callable, Iterable, Iterator, List, Tuple, Optional
 
 from backend.common.models import TextChunk
 from backend.common.text_utils import chunk_text
@@ -43,6 +49,25 @@ class DocumentSection:
     children: List[DocumentSection] = field(default_factory=list)
 
 
+@dataclass
+class PageHeadings:
+    """Top-level headings found by a first pass over a page stream.
+
+    Offsets are positions in the pages joined by the page separator, as if
+    the document were one string.
+    """
+    level: int  # 1 = ARTICLE/PART headings, 2 = Section headings
+    heads: List[Tuple[int, str, str]]  # (start offset, number, title)
+    page_starts: List[int]
+    page_numbers: List[int]
+
+    def page_at(self, offset: int) -> Optional[int]:
+        """Page number containing *offset*."""
+        if not self.page_numbers:
+            return None
+        return self.page_numbers[max(bisect_right(self.page_starts, offset) - 1, 0)]
+
+
 @dataclass
 class TableOfContents:
     """Extracted table of contents structure."""
@@ -169,25 +194,12 @@ class LegalChunker:
         if article_matches:
             # Document has article structure
             for i, match in enumerate(article_matches):
-                article_num = match.group(2).strip()
-                article_title = match.group(3).strip() if match.group(3) else ""
+                number, title = self._heading(match, level=1)
                 start_pos = match.start()
                 end_pos = article_matches[i + 1].start() if i + 1 < len(article_matches) else len(text)
-                
-                content = text[start_pos:end_pos]
-                
-                article = DocumentSection(
-                    level=1,
-                    number=article_num,
-                    title=article_title,
-                    content=content,
-                    start_pos=start_pos,
-                    end_pos=end_pos,
+                sections.append(
+                    self._top_level_section(1, number, title, text[start_pos:end_pos], start_pos, end_pos)
                 )
-                
-                # Extract sections within this article
-                article.children = self._extract_subsections(content, article_num, start_pos)
-                sections.append(article)
         
         else:
             # No articles, look for section-level structure
@@ -195,27 +207,113 @@ class LegalChunker:
             
             if section_matches:
                 for i, match in enumerate(section_matches):
-                    section_num = match.group(1).strip()
-                    section_title = match.group(2).strip() if match.group(2) else ""
+                    number, title = self._heading(match, level=2)
                     start_pos = match.start()
                     end_pos = section_matches[i + 1].start() if i + 1 < len(section_matches) else len(text)
-                    
-                    content = text[start_pos:end_pos]
-                    
-                    section = DocumentSection(
-                        level=2,
-                        number=section_num,
-                        title=section_title,
-                        content=content,
-                        start_pos=start_pos,
-                        end_pos=end_pos,
+                    sections.append(
+                        self._top_level_section(2, number, title, text[start_pos:end_pos], start_pos, end_pos)
                     )
-                    
-                    # Extract subsections within this section
-                    section.children = self._extract_subsections(content, section_num, start_pos, level=3)
-                    sections.append(section)
         
         return sections
+
+    @staticmethod
+    def _heading(match: re.Match, level: int) -> Tuple[str, str]:
+        """``(number, title)`` of an ARTICLE (level 1) or Section (level 2) heading match."""
+        number_group, title_group = (2, 3) if level == 1 else (1, 2)
+        title = match.group(title_group)
+        return match.group(number_group).strip(), title.strip() if title else ""
+
+    def _top_level_section(
+        self,
+        level: int,
+        number: str,
+        title: str,
+        content: str,
+        start_pos: int,
+        end_pos: int,
+        with_children: bool = True,
+    ) -> DocumentSection:
+        """Build an ARTICLE (level 1) or Section (level 2) with its subsections."""
+        section = DocumentSection(
+            level=level,
+            number=number,
+            title=title,
+            content=content,
+            start_pos=start_pos,
+            end_pos=end_pos,
+        )
+        if with_children:
+            # Sections within an article, or (a)/(b) subsections within a section
+            section.children = self._extract_subsections(content, number, start_pos, level=level + 1)
+        return section
+
+    def scan_page_headings(self, pages: Iterable[Tuple[int, str]], separator: str = "\n\n") -> PageHeadings:
+        """First pass over ``(page_number, text)`` pages: locate top-level headings.
+
+        Headings are matched page by page (a heading line never spans a
+        page break).  Offsets match ``extract_sections`` on the pages
+        joined by *separator*, where a heading that opens a page starts
+        on the blank line before it.  Only offsets and heading labels
+        are kept.
+        """
+        articles: List[Tuple[int, str, str]] = []
+        sections: List[Tuple[int, str, str]] = []
+        page_starts: List[int] = []
+        page_numbers: List[int] = []
+        offset = 0
+        for number, text in pages:
+            if page_starts:
+                offset += len(separator)
+            page_starts.append(offset)
+            page_numbers.append(number)
+            for pattern, level, found in ((self.ARTICLE_PATTERN, 1, articles), (self.SECTION_PATTERN, 2, sections)):
+                for match in pattern.finditer(text):
+                    start = offset + match.start()
+                    if match.start() == 0 and offset and separator.endswith("\n"):
+                        start -= 1
+                    found.append((start, *self._heading(match, level)))
+            offset += len(text)
+        if articles:
+            return PageHeadings(1, articles, page_starts, page_numbers)
+        return PageHeadings(2, sections, page_starts, page_numbers)
+
+    def iter_page_sections(
+        self,
+        pages: Iterable[Tuple[int, str]],
+        headings: PageHeadings,
+        separator: str = "\n\n",
+        with_children: bool = True,
+    ) -> Iterator[DocumentSection]:
+        """Second pass: yield the top-level sections of a page stream in order.
+
+        Yields what ``extract_sections`` returns for the joined text, but
+        only the text of the section being assembled is held in memory.
+        """
+        heads = headings.heads
+        if not heads:
+            return
+        buffer = ""
+        buffer_start = heads[0][0]
+        position = 0  # offset of the end of the text read so far
+        k = 0
+        for index, (_, text) in enumerate(pages):
+            piece = text if index == 0 else separator + text
+            piece_start = position
+            position += len(piece)
+            if position <= buffer_start:
+                continue  # before the first heading
+            buffer += piece[max(buffer_start - piece_start, 0):]
+            while k + 1 < len(heads) and heads[k + 1][0] <= position:
+                start, number, title = heads[k]
+                end = heads[k + 1][0]
+                yield self._top_level_section(
+                    headings.level, number, title, buffer[:end - start], start, end, with_children
+                )
+                buffer = buffer[end - start:]
+                buffer_start = end
+                k += 1
+        start, number, title = heads[k]
+        yield self._top_level_section(headings.level, number, title, buffer, start, position, with_children)
     
     def _extract_subsections(
         self,
@@ -286,37 +384,66 @@ class LegalChunker:
         Returns:
             List of TextChunk objects
         """
-        chunks: List[TextChunk] = []
+        return list(self._iter_section_chunks(doc_id, source_path, self._iter_flat_sections(sections)))
+
+    def _iter_section_chunks(
+        self,
+        doc_id: str,
+        source_path: str,
+        flat_sections: Iterable[DocumentSection],
+        page_at: Optional[Callable[[int], Optional[int]]] = None,
+    ) -> Iterator[TextChunk]:
+        """Chunk flattened sections lazily (see ``chunk_by_sections``).
+
+        Only the sections being merged into one chunk are looked ahead at.
+        With *page_at*, each chunk records the pages its section spans.
+        """
+        pending = iter(flat_sections)
+        lookahead: deque = deque()
+
+        def peek() -> Optional[DocumentSection]:
+            if not lookahead:
+                nxt = next(pending, None)
+                if nxt is None:
+                    return None
+                lookahead.append(nxt)
+            return lookahead[0]
+
+        def take() -> Optional[DocumentSection]:
+            return lookahead.popleft() if peek() is not None else None
+
+        def emit(chunk: TextChunk, section: DocumentSection) -> TextChunk:
+            if page_at is not None:
+                # A heading that opens a page starts on the blank line before it
+                start = section.start_pos + len(section.content) - len(section.content.lstrip())
+                chunk.page = page_at(min(start, max(section.end_pos - 1, section.start_pos)))
+                chunk.page_end = page_at(max(section.start_pos, section.end_pos - 1))
+            return chunk
+
         chunk_index = 0
-        
-        # Flatten section hierarchy for processing
-        flat_sections = self._flatten_sections(sections)
-        
-        i = 0
-        while i < len(flat_sections):
-            section = flat_sections[i]
+        while (section := take()) is not None:
             section_size = len(section.content)
             
             # Case 1: Section is within target range
             if self.min_chunk_size <= section_size <= self.max_chunk_size:
-                chunk = self._create_chunk(doc_id, source_path, section, chunk_index)
-                chunks.append(chunk)
+                yield emit(self._create_chunk(doc_id, source_path, section, chunk_index), section)
                 chunk_index += 1
-                i += 1
             
             # Case 2: Section is too small - merge with adjacent sections
             elif section_size < self.min_chunk_size:
                 merged_content = section.content
                 merged_title = f"{section.number} {section.title}".strip()
-                j = i + 1
+                last = section
                 
                 # Merge subsequent sections until we reach min size
-                while j < len(flat_sections) and len(merged_content) < self.target_chunk_size:
-                    next_section = flat_sections[j]
+                while len(merged_content) < self.target_chunk_size:
+                    next_section = peek()
+                    if next_section is None:
+                        break
                     if len(merged_content) + len(next_section.content) > self.max_chunk_size:
                         break
                     merged_content += "\n\n" + next_section.content
-                    j += 1
+                    last = take()
                 
                 # Create merged chunk
                 merged_section = DocumentSection(
@@ -325,21 +452,18 @@ class LegalChunker:
                     title=merged_title,
                     content=merged_content,
                     start_pos=section.start_pos,
-                    end_pos=flat_sections[j-1].end_pos if j > i + 1 else section.end_pos,
+                    end_pos=last.end_pos,
                 )
                 
-                chunk = self._create_chunk(doc_id, source_path, merged_section, chunk_index)
-                chunks.append(chunk)
+                yield emit(self._create_chunk(doc_id, source_path, merged_section, chunk_index), merged_section)
                 chunk_index += 1
-                i = j
             
             # Case 3: Section is too large - split it
             else:
                 # Try to split on subsections if available
                 if section.children:
                     for child in section.children:
-                        chunk = self._create_chunk(doc_id, source_path, child, chunk_index)
-                        chunks.append(chunk)
+                        yield emit(self._create_chunk(doc_id, source_path, child, chunk_index), child)
                         chunk_index += 1
                 else:
                     # Fall back to character-based splitting
@@ -357,17 +481,15 @@ class LegalChunker:
                             source_path=source_path,
                             chunk_index=chunk_index,
                         )
-                        chunks.append(chunk)
+                        yield emit(chunk, section)
                         chunk_index += 1
-                
-                i += 1
-        
-        return chunks
     
     def _flatten_sections(self, sections: List[DocumentSection]) -> List[DocumentSection]:
         """Flatten hierarchical sections into a linear list."""
-        flat: List[DocumentSection] = []
-        
+        return list(self._iter_flat_sections(sections))
+
+    def _iter_flat_sections(self, sections: Iterable[DocumentSection]) -> Iterator[DocumentSection]:
+        """Lazy form of ``_flatten_sections``."""
         for section in sections:
             if self.enable_subsection_merging and section.children:
                 # If subsections are small, keep parent with all children merged
@@ -381,17 +503,15 @@ class LegalChunker:
                     
                     section.content = merged_content
                     section.children = []
-                    flat.append(section)
+                    yield section
                 else:
                     # Add section and children separately
-                    flat.append(section)
-                    flat.extend(section.children)
+                    yield section
+                    yield from section.children
             else:
-                flat.append(section)
+                yield section
                 if section.children:
-                    flat.extend(section.children)
-        
-        return flat
+                    yield from section.children
     
     def _create_chunk(
         self,
@@ -469,3 +589,47 @@ def chunk_legal_document(
         )
     
     return chunker.chunk_by_sections(doc_id, source_path, sections)
+
+
+def chunk_legal_pages(
+    doc_id: str,
+    source_path: str,
+    read_pages: Callable[[], Iterable[Tuple[int, str]]],
+    min_chunk_size: int = 500,
+    max_chunk_size: int = 5000,
+    window_chars: int = 200_000,
+) -> Iterator[TextChunk]:
+    """
+    ``chunk_legal_document`` for a stream of ``(page_number, text)`` pages.
+
+    *read_pages* is called twice: once to locate the top-level headings,
+    then again to assemble and chunk one top-level section at a time, so
+    peak memory follows the largest ARTICLE/Section rather than the
+    document.  Chunks match ``chunk_legal_document`` on the pages joined by
+    a blank line, and also record the pages they span.  Documents without
+    headings fall back to ``chunk_pages`` with the same sizing as
+    ``chunk_legal_document``'s fallback.
+    """
+    chunker = LegalChunker(
+        min_chunk_size=min_chunk_size,
+        max_chunk_size=max_chunk_size,
+        target_chunk_size=(min_chunk_size + max_chunk_size) // 2,
+    )
+
+    headings = chunker.scan_page_headings(read_pages())
+    if not headings.heads:
+        from backend.vector.chunker import chunk_pages
+        yield from chunk_pages(
+            doc_id=doc_id,
+            source_path=source_path,
+            pages=read_pages(),
+            chunk_size=max_chunk_size,
+            chunk_overlap=500,
+            window_chars=window_chars,
+        )
+        return
+
+    sections = chunker.iter_page_sections(read_pages(), headings)
+    yield from chunker._iter_section_chunks(
+        doc_id, source_path, chunker._iter_flat_sections(sections), page_at=headings.page_at
+    )
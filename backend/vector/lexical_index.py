@@ -0,0 +1,202 @@
+"""BM25 lexical index kept alongside the Chroma collection.
+
+Dense retrieval misses exact identifiers (``ERR-UPL-013``) and rare defined
+terms unless ``top_k`` is large.  This inverted index scores chunks with
+Okapi BM25 so ``VectorStore.search_hybrid`` can fuse lexical and dense
+candidates.  Postings live in SQLite next to the Chroma data so a single
+document can be re-indexed or deleted without rebuilding the index.
+
+The per-chunk table doubles as a ``(doc_id, chunk_index) → chunk_id``
+range index used for neighbour lookups during context expansion.  Every
+write bumps a generation counter that ``VectorStore.generation`` exposes
+so query caches can tell when the collection changed.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from backend.common.sqlite_utils import bump_generation, connect, in_batches, read_generation
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk_id    TEXT PRIMARY KEY,
+    doc_id      TEXT NOT NULL,
+    doc_type    TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    length      INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks(doc_id, chunk_index);
+CREATE TABLE IF NOT EXISTS postings (
+    term     TEXT NOT NULL,
+    chunk_id TEXT NOT NULL,
+    tf       INTEGER NOT NULL,
+    PRIMARY KEY (term, chunk_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_chunk ON postings(chunk_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta(key, value) VALUES ('generation', '0');
+"""
+
+# Okapi BM25 parameters (standard defaults)
+_K1 = 1.2
+_B = 0.75
+
+# Identifier-aware tokens: "err-upl-013", "section_4.01", "http504"
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+_SPLIT_RE = re.compile(r"[-_.]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens; compound identifiers also yield their parts."""
+    tokens: List[str] = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        if _SPLIT_RE.search(token):
+            tokens.extend(part for part in _SPLIT_RE.split(token) if part)
+    return tokens
+
+
+class LexicalIndex:
+    """Persistent BM25 inverted index keyed by chunk id."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def upsert(self, rows: Iterable[Tuple[str, str, str, int, str]]) -> None:
+        """Index ``(chunk_id, doc_id, doc_type, chunk_index, text)`` rows, replacing old postings."""
+        rows = list({row[0]: row for row in rows}.values())
+        if not rows:
+            return
+        with connect(self.path) as conn:
+            self._delete_chunks(conn, [row[0] for row in rows])
+            chunk_rows = []
+            posting_rows = []
+            for chunk_id, doc_id, doc_type, chunk_index, text in rows:
+                counts = Counter(tokenize(text))
+                chunk_rows.append((chunk_id, doc_id, doc_type or "UNKNOWN", int(chunk_index), sum(counts.values())))
+                posting_rows.extend((term, chunk_id, tf) for term, tf in counts.items())
+            conn.executemany(
+                "INSERT INTO chunks(chunk_id, doc_id, doc_type, chunk_index, length) VALUES (?, ?, ?, ?, ?)",
+                chunk_rows,
+            )
+            conn.executemany("INSERT INTO postings(term, chunk_id, tf) VALUES (?, ?, ?)", posting_rows)
+            bump_generation(conn)
+
+    def delete_ids(self, chunk_ids: Iterable[str]) -> None:
+        with connect(self.path) as conn:
+            self._delete_chunks(conn, list(chunk_ids))
+            bump_generation(conn)
+
+    def delete_document(self, doc_id: str) -> None:
+        with connect(self.path) as conn:
+            ids = [row[0] for row in conn.execute("SELECT chunk_id FROM chunks WHERE doc_id = ?", (doc_id,))]
+            self._delete_chunks(conn, ids)
+            bump_generation(conn)
+
+    def set_doc_type(self, doc_id: str, doc_type: str) -> None:
+        with connect(self.path) as conn:
+            conn.execute("UPDATE chunks SET doc_type = ? WHERE doc_id = ?", (doc_type, doc_id))
+            bump_generation(conn)
+
+    def clear(self) -> None:
+        with connect(self.path) as conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM chunks")
+            bump_generation(conn)
+
+    def bump_generation(self) -> None:
+        """Record a collection change that did not go through this index."""
+        with connect(self.path) as conn:
+            bump_generation(conn)
+
+    def generation(self) -> int:
+        """Monotonic counter bumped on every write."""
+        with connect(self.path) as conn:
+            return read_generation(conn)
+
+    def __len__(self) -> int:
+        with connect(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Range lookup
+    # ------------------------------------------------------------------
+
+    def chunk_ids_in_ranges(self, ranges: Iterable[Tuple[str, int, int]]) -> List[Tuple[str, str, int]]:
+        """Resolve ``(doc_id, start, end)`` ranges (inclusive) to ``(chunk_id, doc_id, chunk_index)``.
+
+        Results are de-duplicated and ordered by document, then position.
+        """
+        found = {}
+        with connect(self.path) as conn:
+            for doc_id, start, end in ranges:
+                for chunk_id, chunk_index in conn.execute(
+                    "SELECT chunk_id, chunk_index FROM chunks "
+                    "WHERE doc_id = ? AND chunk_index BETWEEN ? AND ?",
+                    (doc_id, max(start, 0), end),
+                ):
+                    found[chunk_id] = (chunk_id, doc_id, chunk_index)
+        return sorted(found.values(), key=lambda row: (row[1], row[2]))
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, top_k: int = 20, doc_type_filter: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Return up to *top_k* ``(chunk_id, bm25_score)`` pairs, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        scores: Counter = Counter()
+        with connect(self.path) as conn:
+            total, avg_len = conn.execute("SELECT COUNT(*), AVG(length) FROM chunks").fetchone()
+            if not total:
+                return []
+            avg_len = avg_len or 1.0
+            sql = (
+                "SELECT p.chunk_id, p.tf, c.length FROM postings p JOIN chunks c ON c.chunk_id = p.chunk_id "
+                "WHERE p.term = ?"
+            )
+            if doc_type_filter:
+                sql += " AND c.doc_type = ?"
+            for term in terms:
+                params = (term, doc_type_filter) if doc_type_filter else (term,)
+                postings = conn.execute(sql, params).fetchall()
+                if not postings:
+                    continue
+                df = conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,)).fetchone()[0]
+                idf = math.log(1.0 + (total - df + 0.5) / (df + 0.5))
+                for chunk_id, tf, length in postings:
+                    norm = tf + _K1 * (1.0 - _B + _B * length / avg_len)
+                    scores[chunk_id] += idf * tf * (_K1 + 1.0) / norm
+        return scores.most_common(top_k)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _delete_chunks(conn: sqlite3.Connection, chunk_ids: List[str]) -> None:
+        for batch, placeholders in in_batches(chunk_ids):
+            conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({placeholders})", batch)
+            conn.execute(f"DELETE FROM chunks WHERE chunk_id IN ({placeholders})", batch)
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import json
 import logging
 import os
+import re
 import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, List, Optional
 
@@ -10,22 +14,46 @@ import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 
+from backend.common.hashing import sha256_text
 from backend.common.models import TextChunk
+from .lexical_index import LexicalIndex
 
 logger = logging.getLogger(__name__)
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _content_hash(text: str) -> str:
+    return sha256_text(text)
+
+
+def _cosine_similarity(a, b) -> float:
+    dot = sum(float(x) * float(y) for x, y in zip(a, b))
+    norm_a = sum(float(x) * float(x) for x in a) ** 0.5
+    norm_b = sum(float(y) * float(y) for y in b) ** 0.5
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+class EmbeddingModelMismatchError(RuntimeError):
+    """The collection holds vectors from a different embedding model than the configured one."""
+
+
 class VectorStore:
     """Production Vector Store using ChromaDB (local persistence).
     
     Features:
-    - Default Embedding: all-MiniLM-L6-v2 (via ONNX, bundled for offline use)
+    - Default Embedding: all-MiniLM-L6-v2 (via ONNX, bundled for offline use),
+      or any ``EmbeddingProvider`` (MiniLM / BGE ONNX, batched, int8)
     - Semantic Search: Finding concepts, not just keywords
+    - Lexical Search: BM25 index (``lexical_index.db``) fused via ``search_hybrid``
     - Persistence: Stores data in ./knowledge_base/vectors/chroma
     - Offline Support: Model bundled in PyInstaller executable
     """
 
-    def __init__(self, persist_dir: str):
+    def __init__(self, persist_dir: str, query_embedding_cache_size: int = 512, embedding_provider=None):
         self.persist_dir = Path(persist_dir)
         self.persist_dir.mkdir(parents=True, exist_ok=True)
         
@@ -54,62 +82,296 @@ class VectorStore:
             settings=Settings(anonymized_telemetry=False),
         )
         
-        # Use default optimized ONNX embedding function (all-MiniLM-L6-v2)
-        # This handles tokenization and embedding locally.
-        self.ef = embedding_functions.DefaultEmbeddingFunction()
+        # Documents and queries are embedded here, not by Chroma, so batching
+        # and the model are ours.  Without a provider, fall back to the
+        # default optimized ONNX embedding function (all-MiniLM-L6-v2).
+        self.embedding_provider = embedding_provider
+        self.ef = embedding_provider if embedding_provider is not None else embedding_functions.DefaultEmbeddingFunction()
+
+        # Query text → embedding (LRU); repeated queries and multi-query
+        # variants skip the ONNX forward pass.
+        self._query_embeddings: "OrderedDict[str, Any]" = OrderedDict()
+        self._query_embeddings_max = max(0, int(query_embedding_cache_size))
+        self._query_embeddings_lock = threading.Lock()
         
-        self.collection = self.client.get_or_create_collection(
+        self.collection = self._open_collection(create=False)
+
+        # BM25 index maintained alongside the collection; backfilled once for
+        # knowledge bases created before it existed.
+        self.lexical_index = LexicalIndex(str(self.persist_dir / "lexical_index.db"))
+        if len(self.lexical_index) == 0 and self.collection.count() > 0:
+            self._rebuild_lexical_index()
+
+    def _open_collection(self, create: bool):
+        model = getattr(self.embedding_provider, "name", "minilm")
+        open_fn = self.client.create_collection if create else self.client.get_or_create_collection
+        collection = open_fn(
             name="kts_knowledge_base",
-            embedding_function=self.ef,
-            metadata={"hnsw:space": "cosine"}
+            # A custom provider is not a Chroma embedding function; vectors
+            # are always passed in explicitly.
+            embedding_function=self.ef if self.embedding_provider is None else None,
+            metadata={"hnsw:space": "cosine", "embedding_model": model},
         )
+        stored = (collection.metadata or {}).get("embedding_model", "minilm")
+        if stored != model:
+            if collection.count() > 0:
+                # Mixing models gives dimension errors or meaningless similarities,
+                # e.g. after a configured ONNX model failed to load and
+                # get_embedding_provider fell back to the bundled MiniLM.
+                raise EmbeddingModelMismatchError(
+                    f"Collection in {self.persist_dir} was embedded with '{stored}' but the embedding model "
+                    f"in use is '{model}'; configure the '{stored}' model or delete the index and re-ingest"
+                )
+            # Empty: recreate it so the label matches the vectors written next.
+            self.client.delete_collection("kts_knowledge_base")
+            return self._open_collection(create=True)
+        return collection
+
+    def embed_documents(self, texts: List[str]) -> List[Any]:
+        """Embed passages through the provider (batched), or the default function."""
+        if not texts:
+            return []
+        embed = getattr(self.ef, "embed_documents", self.ef)
+        return list(embed(list(texts)))
 
     # -------------------------------------------------------------------------
     # Core API
     # -------------------------------------------------------------------------
 
-    def add_chunks(self, chunks: List[TextChunk]) -> None:
-        """Add list of TextChunk objects to ChromaDB"""
+    def add_chunks(self, chunks: List[TextChunk], embeddings: Optional[dict] = None) -> None:
+        """Add list of TextChunk objects to ChromaDB
+
+        *embeddings* maps content hash → precomputed vector (see
+        ``IngestionAgent.prepare``); only chunks missing from it are embedded.
+        """
         if not chunks:
             return
 
-        # Prepare batch vectors
-        ids = [c.chunk_id for c in chunks]
-        documents = [c.content for c in chunks]
-        
-        # Convert dataclass to dict for metadata, ensuring only primitives
-        metadatas = []
-        for c in chunks:
-            meta = {
-                "doc_id": c.doc_id,
-                "source_path": c.source_path,
-                "chunk_index": c.chunk_index,
-                "doc_type": "UNKNOWN" 
-            }
-            # Add any other fields from TextChunk if they exist and are primitives
-            if hasattr(c, "is_image_desc") and c.is_image_desc:
-                meta["is_image_desc"] = True
-            if hasattr(c, "image_id") and c.image_id:
-                meta["image_id"] = str(c.image_id)
-            # Preserve entity metadata (serialize as JSON strings for ChromaDB)
-            if hasattr(c, "entities") and c.entities:
-                import json
-                meta["entities"] = json.dumps(c.entities)
-            if hasattr(c, "keyphrases") and c.keyphrases:
-                import json
-                meta["keyphrases"] = json.dumps(c.keyphrases)
-            metadatas.append(meta)
+        metadatas = [self._chunk_metadata(c) for c in chunks]
+        vectors = dict(embeddings or {})
+        missing = list(dict.fromkeys(m["content_hash"] for m in metadatas if m["content_hash"] not in vectors))
+        if missing:
+            text_by_hash = {m["content_hash"]: c.content for c, m in zip(chunks, metadatas)}
+            vectors.update(zip(missing, self.embed_documents([text_by_hash[h] for h in missing])))
 
         # Upsert into collection
         self.collection.upsert(
-            ids=ids,
-            documents=documents,
+            ids=[c.chunk_id for c in chunks],
+            embeddings=[vectors[m["content_hash"]] for m in metadatas],
+            documents=[c.content for c in chunks],
             metadatas=metadatas
         )
+        self._index_lexical(chunks, metadatas)
         logger.info(f"Upserted {len(chunks)} chunks into VectorStore")
 
+    def content_hashes(self, doc_id: str) -> set:
+        """Content hashes of the chunks currently stored for *doc_id*."""
+        existing = self.collection.get(where={"doc_id": doc_id}, include=["metadatas"])
+        return {(meta or {}).get("content_hash") for meta in existing.get("metadatas") or []} - {None}
+
+    def sync_doc_chunks(self, doc_id: str, chunks: List[TextChunk], embeddings: Optional[dict] = None) -> dict:
+        """Make *chunks* the complete set of chunks stored for *doc_id*.
+
+        Chunks are matched to the stored ones by content hash, so only new
+        or edited text is embedded:
+
+        - ``unchanged``: same id and content — metadata refreshed only
+        - ``reused``: content already stored under another id (e.g. shifted
+          by an insertion) — its embedding is copied to the new id
+        - ``embedded``: content not stored yet — embedded here, unless
+          *embeddings* (content hash → vector) already has it
+        - ``deleted``: stored ids absent from *chunks*
+
+        Returns the counts above.
+        """
+        existing = self.collection.get(where={"doc_id": doc_id}, include=["metadatas"])
+        stored_hash = {
+            chunk_id: (meta or {}).get("content_hash")
+            for chunk_id, meta in zip(existing.get("ids") or [], existing.get("metadatas") or [])
+        }
+        id_by_hash = {h: chunk_id for chunk_id, h in stored_hash.items() if h}
+
+        unchanged: List[TextChunk] = []
+        reused: List[tuple[TextChunk, str]] = []
+        embedded: List[TextChunk] = []
+        for chunk in chunks:
+            digest = _content_hash(chunk.content)
+            if stored_hash.get(chunk.chunk_id) == digest:
+                unchanged.append(chunk)
+            elif digest in id_by_hash:
+                reused.append((chunk, id_by_hash[digest]))
+            else:
+                embedded.append(chunk)
+
+        if unchanged:
+            metadatas = [self._chunk_metadata(c) for c in unchanged]
+            self.collection.update(ids=[c.chunk_id for c in unchanged], metadatas=metadatas)
+            self._index_lexical(unchanged, metadatas)
+        if reused:
+            source_ids = list(dict.fromkeys(src for _, src in reused))
+            found = self.collection.get(ids=source_ids, include=["embeddings"])
+            vectors = dict(zip(found["ids"], found["embeddings"]))
+            metadatas = [self._chunk_metadata(c) for c, _ in reused]
+            self.collection.upsert(
+                ids=[c.chunk_id for c, _ in reused],
+                embeddings=[vectors[src] for _, src in reused],
+                documents=[c.content for c, _ in reused],
+                metadatas=metadatas,
+            )
+            self._index_lexical([c for c, _ in reused], metadatas)
+        self.add_chunks(embedded, embeddings)
+
+        keep = {c.chunk_id for c in chunks}
+        stale = [chunk_id for chunk_id in stored_hash if chunk_id not in keep]
+        if stale:
+            self.collection.delete(ids=stale)
+            self.lexical_index.delete_ids(stale)
+
+        stats = {"unchanged": len(unchanged), "reused": len(reused), "embedded": len(embedded), "deleted": len(stale)}
+        logger.info(f"Synced chunks for {doc_id}: {stats}")
+        return stats
+
+    def _index_lexical(self, chunks: List[TextChunk], metadatas: List[dict]) -> None:
+        self.lexical_index.upsert(
+            (c.chunk_id, c.doc_id, meta["doc_type"], c.chunk_index, c.content) for c, meta in zip(chunks, metadatas)
+        )
+
+    @staticmethod
+    def _chunk_metadata(c: TextChunk) -> dict:
+        """Chroma metadata for a chunk (primitives only)."""
+        meta = {
+            "doc_id": c.doc_id,
+            "source_path": c.source_path,
+            "chunk_index": c.chunk_index,
+            "doc_type": "UNKNOWN",
+            "content_hash": _content_hash(c.content),
+        }
+        # Add any other fields from TextChunk if they exist and are primitives
+        if hasattr(c, "is_image_desc") and c.is_image_desc:
+            meta["is_image_desc"] = True
+        if hasattr(c, "image_id") and c.image_id:
+            meta["image_id"] = str(c.image_id)
+        # Preserve entity metadata (serialize as JSON strings for ChromaDB)
+        if hasattr(c, "entities") and c.entities:
+            meta["entities"] = json.dumps(c.entities)
+        if hasattr(c, "keyphrases") and c.keyphrases:
+            meta["keyphrases"] = json.dumps(c.keyphrases)
+        if getattr(c, "page", None) is not None:
+            meta["page"] = int(c.page)
+            meta["page_end"] = int(c.page_end if c.page_end is not None else c.page)
+        return meta
+
     def search(self, query: str, top_k: int = 5, doc_type_filter: str | None = None) -> List[dict]:
         """Perform Semantic Search"""
+        return self.search_many([query], top_k, doc_type_filter)[0]
+
+    def search_many(self, queries: List[str], top_k: int = 5, doc_type_filter: str | None = None) -> List[List[dict]]:
+        """Semantic search for several queries with one embedding call and one Chroma query.
+
+        Returns one result list per query, in order.
+        """
+        if not queries:
+            return []
+        return self._dense_search_many(self.embed_queries(queries), top_k, doc_type_filter)
+
+    def search_hybrid(
+        self,
+        query: str,
+        top_k: int = 5,
+        doc_type_filter: str | None = None,
+        lexical_top_k: int | None = None,
+        rrf_k: int = 60,
+    ) -> List[dict]:
+        """Fuse dense and BM25 candidates with Reciprocal Rank Fusion.
+
+        Rows have the same shape as ``search``: ``score`` is always the cosine
+        similarity to the query (computed from the stored embedding for
+        lexical-only hits), plus ``bm25_score`` and ``rrf_score``.  Exact
+        identifiers such as ``ERR-UPL-013`` surface through the lexical list
+        without enlarging the dense ``top_k``.
+        """
+        return self.search_hybrid_many([query], top_k, doc_type_filter, lexical_top_k, rrf_k)[0]
+
+    def search_hybrid_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        doc_type_filter: str | None = None,
+        lexical_top_k: int | None = None,
+        rrf_k: int = 60,
+    ) -> List[List[dict]]:
+        """``search_hybrid`` for several queries; dense retrieval is batched as in ``search_many``."""
+        if not queries:
+            return []
+        embeddings = self.embed_queries(queries)
+        dense_lists = self._dense_search_many(embeddings, top_k, doc_type_filter)
+        return [
+            self._fuse_lexical(query, embedding, dense, top_k, doc_type_filter, lexical_top_k, rrf_k)
+            for query, embedding, dense in zip(queries, embeddings, dense_lists)
+        ]
+
+    def embed_queries(self, queries: List[str]) -> List[Any]:
+        """Embed *queries*, reusing cached vectors and batching the rest into one call.
+
+        Keys are whitespace-normalised query text.
+        """
+        keys = [_WHITESPACE_RE.sub(" ", q).strip() for q in queries]
+        cached = {}
+        with self._query_embeddings_lock:
+            for key in keys:
+                if key in self._query_embeddings:
+                    self._query_embeddings.move_to_end(key)
+                    cached[key] = self._query_embeddings[key]
+        missing = list(dict.fromkeys(key for key in keys if key not in cached))
+        if missing:
+            embed = getattr(self.ef, "embed_queries", self.ef)
+            fresh = dict(zip(missing, embed(missing)))
+            cached.update(fresh)
+            if self._query_embeddings_max:
+                with self._query_embeddings_lock:
+                    self._query_embeddings.update(fresh)
+                    while len(self._query_embeddings) > self._query_embeddings_max:
+                        self._query_embeddings.popitem(last=False)
+        return [cached[key] for key in keys]
+
+    def _fuse_lexical(
+        self,
+        query: str,
+        query_embedding,
+        dense: List[dict],
+        top_k: int,
+        doc_type_filter: str | None,
+        lexical_top_k: int | None,
+        rrf_k: int,
+    ) -> List[dict]:
+        from backend.retrieval.query_expander import reciprocal_rank_fusion
+
+        lexical_hits = self.lexical_index.search(query, lexical_top_k or top_k, doc_type_filter)
+        if not lexical_hits:
+            return dense
+
+        by_id = {row["chunk_id"]: row for row in dense}
+        missing = [chunk_id for chunk_id, _ in lexical_hits if chunk_id not in by_id]
+        if missing:
+            found = self.collection.get(ids=missing, include=["documents", "metadatas", "embeddings"])
+            for i, chunk_id in enumerate(found["ids"]):
+                by_id[chunk_id] = {
+                    "chunk_id": chunk_id,
+                    "content": found["documents"][i],
+                    **(found["metadatas"][i] or {}),
+                    "score": _cosine_similarity(query_embedding, found["embeddings"][i]),
+                }
+
+        lexical = []
+        for chunk_id, bm25 in lexical_hits:
+            row = by_id.get(chunk_id)
+            if row is not None:  # index can briefly lag a concurrent delete
+                row["bm25_score"] = bm25
+                lexical.append(row)
+
+        return reciprocal_rank_fusion([dense, lexical], k=rrf_k, chunk_id_key="chunk_id", score_key="score")
+
+    def _dense_search_many(self, query_embeddings: List[Any], top_k: int, doc_type_filter: str | None) -> List[List[dict]]:
         where_clause = {}
         if doc_type_filter:
             where_clause["doc_type"] = doc_type_filter
@@ -118,30 +380,32 @@ class VectorStore:
         where_arg = where_clause if where_clause else None
 
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=list(query_embeddings),
             n_results=top_k,
             where=where_arg,
             include=["documents", "metadatas", "distances"]
         )
         
-        # Flatten structure
-        hits = []
-        if results["ids"]:
-            count = len(results["ids"][0])
-            for i in range(count):
-                dist = results["distances"][0][i]
+        # Flatten structure: one hit list per query embedding
+        hit_lists = []
+        for q in range(len(query_embeddings)):
+            hits = []
+            ids = results["ids"][q] if results["ids"] else []
+            for i in range(len(ids)):
+                dist = results["distances"][q][i]
                 # Cosine distance to similarity: 1 - distance
                 score = 1.0 - dist
                 
-                meta = results["metadatas"][0][i]
+                meta = results["metadatas"][q][i]
                 hits.append({
-                    "chunk_id": results["ids"][0][i],
-                    "content": results["documents"][0][i],
+                    "chunk_id": ids[i],
+                    "content": results["documents"][q][i],
                     **meta,
                     "score": score
                 })
+            hit_lists.append(hits)
         
-        return hits
+        return hit_lists
     
     def get_chunks_by_indices(
         self, 
@@ -162,58 +426,93 @@ class VectorStore:
         Returns:
             List of chunk dictionaries with content, metadata, chunk_index
         """
-        if start_index < 0:
-            start_index = 0
-        
-        # ChromaDB doesn't have native range queries on metadata,
-        # so we need to get all chunks for doc and filter
+        return self._get_ranges([(doc_id, start_index, end_index)])
+
+    def get_neighbors(self, hits: List[dict], window: int, lookahead: int = 0) -> dict:
+        """Fetch the chunks around every hit in one Chroma round trip.
+
+        Resolves ``chunk_index - window .. chunk_index + window + lookahead``
+        for each hit through the ``(doc_id, chunk_index)`` side index, then
+        loads exactly those IDs with a single ``get(ids=...)``.
+
+        Returns ``{(doc_id, chunk_index): chunk_dict}``; callers should copy a
+        row before annotating it since one neighbour can serve several hits.
+        """
+        ranges = [
+            (hit["doc_id"], int(hit.get("chunk_index", 0)) - window, int(hit.get("chunk_index", 0)) + window + lookahead)
+            for hit in hits
+            if hit.get("doc_id")
+        ]
+        return {(row["doc_id"], row["chunk_index"]): row for row in self._get_ranges(ranges)}
+
+    def _get_ranges(self, ranges: List[tuple]) -> List[dict]:
         try:
+            located = self.lexical_index.chunk_ids_in_ranges(ranges)
+            if not located:
+                return []
             results = self.collection.get(
-                where={"doc_id": doc_id},
+                ids=[chunk_id for chunk_id, _, _ in located],
                 include=["documents", "metadatas"]
             )
-            
-            if not results or not results["ids"]:
-                return []
-            
-            # Filter by chunk_index range
+            by_id = {
+                chunk_id: (results["documents"][i], results["metadatas"][i] or {})
+                for i, chunk_id in enumerate(results["ids"])
+            }
+
+            # Keep side-index order (document, then chunk_index)
             chunks = []
-            for i, chunk_id in enumerate(results["ids"]):
-                meta = results["metadatas"][i]
-                chunk_idx = int(meta.get("chunk_index", -1))
-                
-                if start_index <= chunk_idx <= end_index:
-                    chunks.append({
-                        "chunk_id": chunk_id,
-                        "content": results["documents"][i],
-                        **meta,
-                        "chunk_index": chunk_idx,
-                        "score": 0.0  # No score for direct retrieval
-                    })
-            
-            # Sort by chunk_index to maintain document order
-            chunks.sort(key=lambda x: x["chunk_index"])
+            for chunk_id, doc_id, chunk_idx in located:
+                if chunk_id not in by_id:
+                    continue
+                content, meta = by_id[chunk_id]
+                chunks.append({
+                    "chunk_id": chunk_id,
+                    "content": content,
+                    **meta,
+                    "doc_id": doc_id,
+                    "chunk_index": chunk_idx,
+                    "score": 0.0  # No score for direct retrieval
+                })
             return chunks
-            
+
         except Exception as e:
-            logger.warning(f"Failed to retrieve chunks by indices for {doc_id}: {e}")
+            logger.warning(f"Failed to retrieve chunks for ranges {ranges[:3]}: {e}")
             return []
         
+    def generation(self) -> int:
+        """Counter bumped by every write to the collection (ingest, vacuum, vision)."""
+        return self.lexical_index.generation()
+
     def delete_document(self, doc_id: str) -> None:
         """Remove all chunks for a specific document"""
         # Delete expects a where clause
         self.collection.delete(
             where={"doc_id": doc_id}
         )
+        self.lexical_index.delete_document(doc_id)
 
     def reset_index(self) -> None:
         """Clear all data"""
         self.client.delete_collection("kts_knowledge_base")
-        self.collection = self.client.create_collection(
-            name="kts_knowledge_base",
-            embedding_function=self.ef,
-            metadata={"hnsw:space": "cosine"}
-        )
+        self.collection = self._open_collection(create=True)
+        self.lexical_index.clear()
+
+    def _rebuild_lexical_index(self) -> None:
+        """Re-index every stored chunk into the BM25 index."""
+        results = self.collection.get(include=["documents", "metadatas"])
+        self.lexical_index.clear()
+        rows = []
+        for chunk_id, doc, meta in zip(results["ids"], results["documents"], results["metadatas"]):
+            meta = meta or {}
+            rows.append((
+                chunk_id,
+                meta.get("doc_id", ""),
+                meta.get("doc_type", "UNKNOWN"),
+                int(meta.get("chunk_index", -1)),
+                doc or "",
+            ))
+        self.lexical_index.upsert(rows)
+        logger.info(f"Rebuilt lexical index for {len(results['ids'])} chunks")
 
     # -------------------------------------------------------------------------
     # Legacy / Compatibility API (Aliases for existing Agents)
@@ -248,6 +547,7 @@ class VectorStore:
             
             if ids_to_delete:
                 self.collection.delete(ids=ids_to_delete)
+                self.lexical_index.delete_ids(ids_to_delete)
                 return len(ids_to_delete)
         except Exception as e:
             logger.warning(f"Failed to prune orphans: {e}")
@@ -278,6 +578,10 @@ class VectorStore:
                 ids=ids,
                 metadatas=new_metadatas
             )
+            if doc_type:
+                self.lexical_index.set_doc_type(doc_id, doc_type)
+            else:
+                self.lexical_index.bump_generation()
         except Exception as e:
             logger.error(f"Failed to update metadata for {doc_id}: {e}")
 
@@ -294,9 +598,11 @@ class VectorStore:
         }
         self.collection.upsert(
             ids=[chunk_id],
+            embeddings=self.embed_documents([description]),
             documents=[description],
             metadatas=[meta]
         )
+        self.lexical_index.upsert([(chunk_id, doc_id, "IMAGE_DESC", -1, description)])
 
     # -------------------------------------------------------------------------
     # Legacy Test Compatibility API
@@ -332,4 +638,8 @@ class VectorStore:
             if "doc_type" not in metadata:
                 metadata["doc_type"] = "UNKNOWN"
             metadatas.append(metadata)
-        self.collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+        self.collection.upsert(ids=ids, embeddings=self.embed_documents(documents), documents=documents, metadatas=metadatas)
+        self.lexical_index.upsert(
+            (chunk_id, str(meta.get("doc_id", "")), str(meta["doc_type"]), int(meta.get("chunk_index", -1)), doc)
+            for chunk_id, doc, meta in zip(ids, documents, metadatas)
+        )
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import contextlib
 import json
-from dataclasses import asdict, is_dataclass
+import logging
+import multiprocessing
+import sys
+import time
+from dataclasses import asdict, is_dataclass, replace
 from pathlib import Path
 
 import click
@@ -20,7 +25,13 @@ from backend.agents import (
     VisionAgent,
 )
 from backend.common.manifest import ManifestStore
-from backend.common.models import FileInfo
+from backend.common.models import AgentResult, FileInfo
+from backend.common.text_utils import find_keywords, iter_document_text
+from backend.common.walker import iter_files
+from backend.common.watcher import WATCH_BACKENDS, FileWatcher
+from backend.vector.embedding_provider import get_embedding_provider
+
+logger = logging.getLogger(__name__)
 
 
 def _serialize(value):
@@ -58,26 +69,36 @@ def crawl(paths, dry_run, force):
     changes = result.data["changes"]
     if not dry_run:
         manifest = ManifestStore(config.manifest_path)
-        current_infos = changes.new_files + changes.modified_files
-        manifest.upsert_files(current_infos)
-        manifest.remove_paths([row.path for row in changes.deleted_files])
+        current_infos = changes.new_files + changes.modified_files + changes.refreshed_files
+        manifest.apply_changes(current_infos, [row.path for row in changes.deleted_files])
 
     click.echo(json.dumps(_serialize(result.data), indent=2))
 
 
-@cli.command()
-@click.option("--paths", multiple=True, help="One or more files or folders to ingest")
-def ingest(paths):
-    config = _ctx()
-    ingestion = IngestionAgent(config)
-    taxonomy = TaxonomyAgent(config)
-    graph_builder = GraphBuilderAgent(config)
-    vision = VisionAgent(config)
-    manifest = ManifestStore(config.manifest_path)
+class _IngestComponents:
+    """Agents and stores used by one ``ingest`` run (kept warm by ``serve``)."""
+
+    def __init__(self, config):
+        from backend.retrieval.term_registry import TermRegistry
 
-    # Term registry for learned synonym generation
-    from backend.retrieval.term_registry import TermRegistry
-    term_registry = TermRegistry(config.knowledge_base_path)
+        self.config = config
+        self.ingestion = IngestionAgent(config)
+        self.taxonomy = TaxonomyAgent(config)
+        self.graph_builder = GraphBuilderAgent(config)
+        self.vision = VisionAgent(config)
+        self.manifest = ManifestStore(config.manifest_path)
+        # Term registry for learned synonym generation
+        self.term_registry = TermRegistry(config.knowledge_base_path, embed_fn=get_embedding_provider(config))
+
+
+def _run_ingest(components: _IngestComponents, paths, workers: int = 1) -> dict:
+    config = components.config
+    ingestion = components.ingestion
+    taxonomy = components.taxonomy
+    graph_builder = components.graph_builder
+    vision = components.vision
+    manifest = components.manifest
+    term_registry = components.term_registry
 
     # Regime classifier for corpus-level regime detection
     from backend.ingestion.regime_classifier import RegimeClassifier
@@ -87,85 +108,83 @@ def ingest(paths):
     
     # If no paths provided, ingest all pending files from manifest (doc_id is not set OR explicit request)
     if not paths:
-        manifest_data = manifest.load()
-        for file_path, file_info in manifest_data.get("files", {}).items():
-            if not file_info.get("doc_id"):  # Not yet ingested
-                p = Path(file_path)
-                if p.exists() and p.suffix.lower() in config.supported_extensions:
-                    source_paths.append(p)
+        for file_path in manifest.pending_paths():  # Not yet ingested
+            p = Path(file_path)
+            if p.exists() and p.suffix.lower() in config.supported_extensions:
+                source_paths.append(p)
     else:
         # Explicit paths provided
         for raw in paths:
             p = Path(raw)
             if p.is_dir():
-                source_paths.extend([
-                    file for file in p.rglob("*")
-                    if file.is_file() and ".kts" not in file.parts
-                ])
+                source_paths.extend(
+                    Path(abs_path) for abs_path, _ in iter_files(p, config.supported_extensions, skip_dirs={".kts"})
+                )
             elif p.is_file():
                 source_paths.append(p)
 
     ingested_summary = []
+    started = time.perf_counter()
     
-    # Pre-load manifest once for efficiency if many files
-    manifest_data = manifest.load()
-
+    candidates: dict[str, Path] = {}
     for source in source_paths:
         if source.suffix.lower() not in config.supported_extensions:
             continue
-            
-        # Lookup existing doc_id if available to update same document
-        s_abs = str(source.resolve())
-        existing_info = manifest_data.get("files", {}).get(s_abs)
-        target_doc_id = existing_info.get("doc_id") if existing_info else None
-        
-        click.echo(f"Ingesting {source.name}... (Target ID: {target_doc_id or 'Auto'})", err=True)
-        
-        # Call Ingestion Agent
-        ingest_result = ingestion.execute({"path": str(source), "doc_id": target_doc_id})
-        
+        # The same file named twice would share a staging dir
+        candidates.setdefault(str(source.resolve()), source)
+
+    # Lookup existing doc_ids in one indexed query to update the same documents
+    known_infos = manifest.get_many(candidates)
+    jobs: list[tuple[Path, str, str | None]] = [
+        (source, s_abs, known_infos.get(s_abs, {}).get("doc_id")) for s_abs, source in candidates.items()
+    ]
+
+    for (source, s_abs, target_doc_id), ingest_result, prepare_s, commit_started in _ingest_documents(ingestion, jobs, workers):
         if not ingest_result.success or "document" not in ingest_result.data:
-            click.echo(f"Skipping {source.name}: {ingest_result.data.get('error', 'Unknown error')}")
+            click.echo(f"Skipping {source.name}: {ingest_result.data.get('error', 'Unknown error')}", err=True)
             continue
             
         document = ingest_result.data["document"]
         
         # Robustness: Ensure manifest has source_id and doc_id updated
-        # Reload manifest in case parallel updates (unlikely here but good practice)
-        manifest_data = manifest.load()
-        if s_abs in manifest_data.get("files", {}):
-             info = manifest_data["files"][s_abs]
-             info["doc_id"] = document.doc_id
-             info["status"] = "active"
+        # (a single-row update; the rest of the manifest is not touched)
+        info = manifest.get(s_abs)
+        if info is not None:
+             updates = {"doc_id": document.doc_id, "status": "active"}
              # If source_id missing, generate based on content hash
              if not info.get("source_id"):
                  from backend.common.hashing import sha256_file
                  # Re-hashing here is expensive but safer for source_id generation if not done by crawler.
-                 info["source_id"] = f"src_{sha256_file(source)[:16]}"
-             manifest.save(manifest_data)
-        elif s_abs not in manifest_data.get("files", {}) and target_doc_id is None:
+                 updates["source_id"] = f"src_{sha256_file(source)[:16]}"
+             manifest.update_file(s_abs, **updates)
+        elif target_doc_id is None:
              # Case: Ingesting a file not in manifest (e.g. manual path not crawled)
              from backend.common.hashing import sha256_file
              from datetime import datetime, timezone
              file_hash = sha256_file(source)
              source_id = f"src_{file_hash[:16]}"
+             st = source.stat()
              new_info = FileInfo(
                  path=s_abs,
                  filename=source.name,
                  extension=source.suffix.lower(),
-                 size_bytes=source.stat().st_size,
-                 modified_time=datetime.fromtimestamp(source.stat().st_mtime, tz=timezone.utc).isoformat(),
+                 size_bytes=st.st_size,
+                 modified_time=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(),
                  hash=file_hash,
                  doc_id=document.doc_id, # Doc ID from ingestion result
                  source_id=source_id,
                  status="active",
                  last_seen=datetime.now(timezone.utc).isoformat(),
-                 retry_count=0
+                 retry_count=0,
+                 mtime_ns=st.st_mtime_ns,
+                 inode=st.st_ino,
              )
              manifest.upsert_files([new_info])
 
         # Classification & Metadata
-        classify_result = taxonomy.execute({"text": document.extracted_text, "filename": source.name})
+        # iter_document_text re-reads a streamed PDF's content.md instead of
+        # stopping at the leading sample held in extracted_text.
+        classify_result = taxonomy.execute({"texts": iter_document_text(document), "filename": source.name})
         
         # Read metadata from disk to update it (it was written by ingestion agent)
         metadata_path = Path(document.metadata_path)
@@ -189,14 +208,16 @@ def ingest(paths):
                 metadata["doc_type"] = "GOVERNING_DOC"
             
             # Simple keyword extraction (fallback)
-            lowered = document.extracted_text.lower()
-            metadata["tools"] = [tool for tool in ["ToolX", "ToolY", "ToolZ"] if tool.lower() in lowered]
-            metadata["processes"] = [proc for proc in ["AuthProcess", "DeployProcess", "SupportProcess"] if proc.lower().replace("process", "") in lowered]
-            metadata["topics"] = [
-                topic
-                for topic in ["onboarding", "authentication", "deployment", "support", "incident"]
-                if topic in lowered
-            ]
+            tools = ["ToolX", "ToolY", "ToolZ"]
+            processes = ["AuthProcess", "DeployProcess", "SupportProcess"]
+            topics = ["onboarding", "authentication", "deployment", "support", "incident"]
+            found = find_keywords(
+                iter_document_text(document),
+                [tool.lower() for tool in tools] + [proc.lower().replace("process", "") for proc in processes] + topics,
+            )
+            metadata["tools"] = [tool for tool in tools if tool.lower() in found]
+            metadata["processes"] = [proc for proc in processes if proc.lower().replace("process", "") in found]
+            metadata["topics"] = [topic for topic in topics if topic in found]
             metadata_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
             
             # Update Vector Store Metadata
@@ -214,16 +235,44 @@ def ingest(paths):
         # Vision
         vision.execute({"operation": "initialize", "doc_id": document.doc_id, "image_paths": document.image_paths, "descriptions": {}})
 
+        commit_s = time.perf_counter() - commit_started
+        chunk_count = ingest_result.data.get("chunk_count", 0)
+        vector_sync = ingest_result.data.get("vector_sync", {})
+        embedded_chunks = vector_sync.get("embedded", chunk_count)
+        click.echo(
+            f"Ingested {source.name}: {chunk_count} chunks, {embedded_chunks} re-embedded "
+            f"(prepare {prepare_s:.2f}s, commit {commit_s:.2f}s)",
+            err=True,
+        )
         ingested_summary.append(
             {
                 "doc_id": document.doc_id,
                 "path": str(source),
-                "chunk_count": ingest_result.data.get("chunk_count", 0),
+                "chunk_count": chunk_count,
+                "embedded_chunks": embedded_chunks,
+                "reused_chunks": chunk_count - embedded_chunks,
                 "doc_type": metadata.get("doc_type", "UNKNOWN"),
                 "extracted_image_count": ingest_result.data.get("extracted_image_count", 0),
+                "prepare_seconds": round(prepare_s, 3),
+                "commit_seconds": round(commit_s, 3),
+                "pipeline": ingest_result.data.get("pipeline", {}),
             }
         )
 
+    elapsed = time.perf_counter() - started
+    total_chunks = sum(d["chunk_count"] for d in ingested_summary)
+    throughput = {
+        "workers": workers,
+        "files": len(ingested_summary),
+        "chunks": total_chunks,
+        "embedded_chunks": sum(d["embedded_chunks"] for d in ingested_summary),
+        "reused_chunks": sum(d["reused_chunks"] for d in ingested_summary),
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(len(ingested_summary) / elapsed, 3) if elapsed > 0 else 0.0,
+        "chunks_per_second": round(total_chunks / elapsed, 3) if elapsed > 0 else 0.0,
+        "pipeline_stages": _merge_stage_reports(d["pipeline"] for d in ingested_summary),
+    }
+
     total_images = sum(d.get("extracted_image_count", 0) for d in ingested_summary)
 
     # Rebuild learned synonym clusters after ingestion batch
@@ -233,14 +282,192 @@ def ingest(paths):
     corpus_regime = RegimeClassifier.corpus_regime(regime_results) if regime_results else "GENERIC_GUIDE"
     try:
         from backend.graph import GraphStore
-        gs = GraphStore(config.graph_path)
-        G = gs.load()
-        G.graph["corpus_regime"] = corpus_regime
-        gs.save(G)
+        GraphStore(config.graph_path).set_graph_attr("corpus_regime", corpus_regime)
     except Exception:
         pass  # graph persistence is best-effort
 
-    click.echo(json.dumps({"ingested": ingested_summary, "count": len(ingested_summary), "total_images_pending": total_images, "synonym_clusters": synonym_summary, "corpus_regime": corpus_regime}, indent=2))
+    return {"ingested": ingested_summary, "count": len(ingested_summary), "total_images_pending": total_images, "synonym_clusters": synonym_summary, "corpus_regime": corpus_regime, "throughput": throughput}
+
+
+def _merge_stage_reports(reports) -> dict:
+    """Sum per-document ``run_pipeline`` reports into per-stage totals."""
+    merged: dict = {}
+    for report in reports:
+        wall = report.get("wall_seconds", 0.0)
+        for name, stats in report.get("stages", {}).items():
+            total = merged.setdefault(name, {"items": 0, "busy_seconds": 0.0, "starved_seconds": 0.0,
+                                             "blocked_seconds": 0.0, "_capacity": 0.0})
+            for key in ("items", "busy_seconds", "starved_seconds", "blocked_seconds"):
+                total[key] += stats[key]
+            total["_capacity"] += wall * stats["workers"]
+    for total in merged.values():
+        capacity = total.pop("_capacity")
+        for key in ("busy_seconds", "starved_seconds", "blocked_seconds"):
+            total[key] = round(total[key], 3)
+        total["utilization"] = round(total["busy_seconds"] / capacity, 3) if capacity > 0 else 0.0
+    return merged
+
+
+def _ingest_documents(ingestion: IngestionAgent, jobs, workers: int):
+    """Run prepare/commit for each job, yielding ``(job, result, prepare_s, commit_started)``.
+
+    With ``workers > 1`` the CPU-bound prepare stage (convert, NER, chunk)
+    runs in a process pool while this process stays the single writer for
+    ChromaDB, the graph and the manifest.  With one worker, the next
+    document is prepared on a helper thread — including embedding its new
+    chunks — while the current one commits.
+    """
+    def _request(job, embed: bool = False):
+        source, _, target_doc_id = job
+        return {"path": str(source), "doc_id": target_doc_id, "embed": embed}
+
+    if workers <= 1 or len(jobs) <= 1:
+        # One document of lookahead: the next file is converted, NER'd and
+        # embedded on a helper thread while this one commits.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="kts-prepare") as prefetch:
+            pending = prefetch.submit(ingestion.prepare, _request(jobs[0], embed=True)) if jobs else None
+            for position, job in enumerate(jobs):
+                click.echo(f"Ingesting {job[0].name}... (Target ID: {job[2] or 'Auto'})", err=True)
+                prepared, failure = pending.result()
+                if position + 1 < len(jobs):
+                    pending = prefetch.submit(ingestion.prepare, _request(jobs[position + 1], embed=True))
+                commit_started = time.perf_counter()
+                if failure is not None:
+                    yield job, failure, 0.0, commit_started
+                    continue
+                yield job, ingestion.commit(prepared), prepared.prepare_seconds, commit_started
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from backend.agents.ingestion_agent import init_prepare_worker, prepare_in_worker
+
+    click.echo(f"Preparing {len(jobs)} files with {workers} workers...", err=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_prepare_worker, initargs=(ingestion.config,)) as pool:
+        futures = {pool.submit(prepare_in_worker, _request(job)): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            commit_started = time.perf_counter()
+            try:
+                prepared, failure = future.result()
+            except Exception as exc:  # worker crashed or result failed to unpickle
+                logger.warning("Prepare failed for %s: %s", job[0], exc)
+                prepared, failure = None, AgentResult(success=False, confidence=0.1, data={"error": str(exc)}, reasoning="Prepare stage failed.")
+            if failure is not None:
+                yield job, failure, 0.0, commit_started
+                continue
+            click.echo(f"Committing {job[0].name}... (Target ID: {job[2] or 'Auto'})", err=True)
+            yield job, ingestion.commit(prepared), prepared.prepare_seconds, commit_started
+
+
+@cli.command()
+@click.option("--paths", multiple=True, help="One or more files or folders to ingest")
+@click.option("--workers", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Worker processes for conversion, NER and chunking (writes stay in this process).")
+def ingest(paths, workers):
+    config = _ctx()
+    summary = _run_ingest(_IngestComponents(config), paths, workers=workers)
+    click.echo(json.dumps(summary, indent=2))
+
+
+def _sync_paths(components: _IngestComponents, crawler: CrawlerAgent, paths, scoped: bool = True) -> dict:
+    """Crawl *paths*, record the diff in the manifest and re-index what changed.
+
+    Deleted files are dropped from the vector store and graph straight away
+    (their document folders are left for ``vacuum``); renamed files keep
+    their doc_id and are re-ingested under the new path.
+    """
+    from backend.graph import GraphStore
+
+    started = time.perf_counter()
+    changes = crawler.execute({"paths": list(paths), "scoped": scoped}).data["changes"]
+    manifest = components.manifest
+    manifest.apply_changes(
+        changes.new_files + changes.modified_files + changes.refreshed_files,
+        [row.path for row in changes.deleted_files],
+    )
+
+    current = [info for info in changes.new_files + changes.modified_files if info.status == "active"]
+    kept_doc_ids = {info.doc_id for info in current if info.doc_id}
+    removed_doc_ids = []
+    for row in changes.deleted_files:
+        if row.doc_id and row.doc_id not in kept_doc_ids:
+            components.ingestion.vector_store.delete_document(row.doc_id)
+            GraphStore(components.config.graph_path).delete_document(row.doc_id)
+            removed_doc_ids.append(row.doc_id)
+
+    ingested = _run_ingest(components, [info.path for info in current]) if current else {"count": 0}
+    return {
+        "new": len(changes.new_files),
+        "modified": len([info for info in changes.modified_files if info.status == "active"]),
+        "deleted": len(changes.deleted_files),
+        "unchanged": changes.unchanged_files,
+        "removed_doc_ids": removed_doc_ids,
+        "ingested": ingested["count"],
+        "errors": changes.errors,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+@cli.command()
+@click.option("--paths", multiple=True, help="One or more source paths (default: configured source paths)")
+@click.option("--backend", "watch_backend", type=click.Choice(WATCH_BACKENDS), default=None,
+              help="Event source; 'auto' uses watchdog when installed, else polling.")
+@click.option("--debounce", type=float, default=None, help="Seconds of quiet before a burst of events is processed.")
+@click.option("--initial-crawl", is_flag=True, default=False,
+              help="Crawl and ingest the full source paths once before watching.")
+def watch(paths, watch_backend, debounce, initial_crawl):
+    """Keep the knowledge base current as files under the source paths change.
+
+    Touched files are batched, crawled (new / modified / deleted / renamed)
+    and re-ingested without rescanning the rest of the tree.  Each batch
+    prints one JSON line to stdout; progress goes to stderr.  Stop with Ctrl-C.
+    """
+    config = _ctx()
+    roots = list(paths) if paths else list(config.source_paths)
+    if not roots:
+        raise click.UsageError("No source paths configured; pass --paths.")
+    components = _IngestComponents(config)
+    crawler = CrawlerAgent(config)
+
+    def _emit(payload: dict) -> None:
+        click.echo(json.dumps(payload))
+
+    if initial_crawl:
+        with contextlib.redirect_stdout(sys.stderr):
+            summary = _sync_paths(components, crawler, roots, scoped=False)
+        _emit({"event": "initial_crawl", **summary})
+
+    watcher = FileWatcher(
+        roots,
+        config.supported_extensions,
+        skip_dirs={Path(config.knowledge_base_path).name, "knowledge_base", ".kts"},
+        debounce_seconds=debounce if debounce is not None else config.watch_debounce_seconds,
+        max_batch_wait_seconds=config.watch_max_batch_wait_seconds,
+        poll_interval_seconds=config.watch_poll_interval_seconds,
+        backend=watch_backend or config.watch_backend,
+    )
+    backend = watcher.start()
+    _emit({"event": "watching", "backend": backend, "paths": watcher.paths})
+    try:
+        while True:
+            batch = watcher.next_batch()
+            if not batch:
+                continue
+            click.echo(f"Change batch: {len(batch)} path(s)", err=True)
+            try:
+                with contextlib.redirect_stdout(sys.stderr):
+                    summary = _sync_paths(components, crawler, batch)
+            except Exception as exc:  # noqa: BLE001 - report and keep watching
+                logger.exception("watch batch failed")
+                _emit({"event": "error", "paths": batch, "error": str(exc)})
+                continue
+            _emit({"event": "batch", "paths": batch, **summary})
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
 
 
 @cli.command()
@@ -279,7 +506,7 @@ def vacuum(dry_run):
     click.echo(f"Found {len(orphaned_folders)} orphaned document folders.")
 
     # 3. Prune Vector Store
-    vector_store = VectorStore(config.chroma_persist_dir)
+    vector_store = VectorStore(config.chroma_persist_dir, embedding_provider=get_embedding_provider(config))
     
     if dry_run:
         click.echo("[DRY RUN] Would remove:")
@@ -288,6 +515,7 @@ def vacuum(dry_run):
         for f in orphaned_folders:
             click.echo(f"  - Doc Folder: {f.name}")
         click.echo("  - Orphaned vector chunks (count unknown without scan)")
+        click.echo("  - Orphaned graph document nodes (count unknown without scan)")
     else:
         # Commit
         if paths_to_remove:
@@ -301,6 +529,10 @@ def vacuum(dry_run):
         pruned_count = vector_store.prune_orphans(active_doc_ids)
         click.echo(f"Removed {pruned_count} orphaned vector chunks.")
 
+        from backend.graph import GraphStore
+        pruned_nodes = GraphStore(config.graph_path).prune_orphans(active_doc_ids)
+        click.echo(f"Removed {pruned_nodes} orphaned graph nodes.")
+
 
 @cli.command()
 @click.argument("query")
@@ -325,56 +557,92 @@ def search(query, max_results, doc_type, tool_filter, strict, no_graph_boost, no
            no_term_resolution, no_query_expansion, no_acronym_resolution,
            regime_override, debug_level, explain, provenance_detail,
            section_filter, graph_only, deep, answer_text):
-    config = _ctx()
+    options = {
+        "query": query,
+        "max_results": max_results,
+        "doc_type": doc_type,
+        "tool_filter": tool_filter,
+        "strict": strict,
+        "no_graph_boost": no_graph_boost,
+        "no_auto_filter": no_auto_filter,
+        "no_term_resolution": no_term_resolution,
+        "no_query_expansion": no_query_expansion,
+        "no_acronym_resolution": no_acronym_resolution,
+        "regime_override": regime_override,
+        "debug_level": debug_level,
+        "explain": explain,
+        "provenance_detail": provenance_detail,
+        "section_filter": section_filter,
+        "graph_only": graph_only,
+        "deep": deep,
+        "answer_text": answer_text,
+    }
+    retrieval = RetrievalService(_search_config(_ctx(), options))
+    ok, output = _run_search(retrieval, options)
+    click.echo(json.dumps(output, indent=2))
+    if not ok:
+        raise SystemExit(1)
+
+
+def _search_config(config, options: dict):
+    """Return a copy of *config* with the per-query CLI overrides applied."""
+    overrides = {}
+    if options.get("regime_override"):
+        overrides["corpus_regime_override"] = options["regime_override"]
+    if options.get("debug_level") is not None:
+        overrides["debug_level"] = int(options["debug_level"])
+    if options.get("no_query_expansion"):
+        overrides["query_expansion_enabled"] = False
+    if options.get("no_acronym_resolution"):
+        overrides["acronym_resolver_enabled"] = False
+    return replace(config, **overrides) if overrides else config
+
+
+def _run_search(retrieval: RetrievalService, options: dict) -> tuple[bool, dict]:
+    """Execute one search against *retrieval*; returns ``(ok, output)``."""
+    config = retrieval.config
+    deep = bool(options.get("deep", False))
 
-    # Apply CLI overrides to config
-    if regime_override:
-        config.corpus_regime_override = regime_override
-    if debug_level is not None:
-        config.debug_level = debug_level
-    if no_query_expansion:
-        config.query_expansion_enabled = False
-    if no_acronym_resolution:
-        config.acronym_resolver_enabled = False
-
-    retrieval = RetrievalService(config)
-    
     # Deep mode: increase per-doc chunk limit and candidate pool
     chunks_per_doc = config.deep_max_chunks_per_doc if deep else config.max_chunks_per_doc
-    
+
     result = retrieval.execute(
         {
-            "query": query,
-            "max_results": max_results,
+            "query": options["query"],
+            "max_results": int(options.get("max_results") or 5),
             "max_chunks_per_doc": chunks_per_doc,
             "deep_mode": deep,
-            "doc_type_filter": doc_type,
-            "tool_filter": tool_filter,
-            "strict": strict,
-            "no_graph_boost": no_graph_boost,
-            "no_auto_filter": no_auto_filter,
-            "no_term_resolution": no_term_resolution,
-            "generated_answer": answer_text,
-            "explain": explain,
-            "section_filter": section_filter,
-            "graph_only": graph_only,
+            "doc_type_filter": options.get("doc_type"),
+            "tool_filter": options.get("tool_filter"),
+            "strict": bool(options.get("strict", False)),
+            "no_graph_boost": bool(options.get("no_graph_boost", False)),
+            "no_auto_filter": bool(options.get("no_auto_filter", False)),
+            "no_term_resolution": bool(options.get("no_term_resolution", False)),
+            "generated_answer": options.get("answer_text"),
+            "explain": bool(options.get("explain", False)),
+            "section_filter": options.get("section_filter"),
+            "graph_only": bool(options.get("graph_only", False)),
         }
     )
     if not result.success and result.data.get("provenance", {}).get("error"):
-        click.echo(json.dumps(result.data["provenance"]["error"], indent=2))
-        raise SystemExit(1)
+        return False, result.data["provenance"]["error"]
 
     output = _serialize(result.data["search_result"])
 
-    if provenance_detail and "provenance" in result.data:
+    if options.get("provenance_detail") and "provenance" in result.data:
         output = {"search_result": output, "provenance": _serialize(result.data["provenance"])}
     if result.data.get("term_resolution"):
         if isinstance(output, dict) and "search_result" in output:
             output["term_resolution"] = result.data["term_resolution"]
         else:
             output = {"search_result": output, "term_resolution": result.data["term_resolution"]}
+    if result.data.get("debug"):
+        if isinstance(output, dict) and "search_result" in output:
+            output["debug"] = result.data["debug"]
+        else:
+            output = {"search_result": output, "debug": result.data["debug"]}
 
-    click.echo(json.dumps(output, indent=2))
+    return True, output
 
 
 @cli.command()
@@ -458,21 +726,19 @@ def describe_status(doc_id):
 
 @cli.command(name="status")
 def status_cmd():
-    config = _ctx()
-    manifest = ManifestStore(config.manifest_path).load()
-    graph = GraphBuilderAgent(config).builder.store.load()
+    click.echo(json.dumps(_status_summary(_ctx()), indent=2))
+
+
+def _status_summary(config, graph_builder: GraphBuilderAgent | None = None) -> dict:
+    manifest_files = ManifestStore(config.manifest_path).count()
+    graph_nodes, graph_edges = (graph_builder or GraphBuilderAgent(config)).builder.store.counts()
     documents_count = len([item for item in (Path(config.knowledge_base_path) / "documents").glob("*") if item.is_dir()])
-    click.echo(
-        json.dumps(
-            {
-                "documents": documents_count,
-                "manifest_files": len(manifest.get("files", {})),
-                "graph_nodes": graph.number_of_nodes(),
-                "graph_edges": graph.number_of_edges(),
-            },
-            indent=2,
-        )
-    )
+    return {
+        "documents": documents_count,
+        "manifest_files": manifest_files,
+        "graph_nodes": graph_nodes,
+        "graph_edges": graph_edges,
+    }
 
 
 @cli.command(name="diff")
@@ -487,5 +753,133 @@ def diff_cmd(old_file, new_file):
     click.echo(json.dumps(result.data, indent=2))
 
 
+class BackendSession:
+    """Long-lived backend state shared by every request handled by ``serve``.
+
+    Agents are created on first use and then reused, so chromadb, the
+    embedding model, spaCy and the cross-encoder are only loaded once per
+    process instead of once per CLI invocation.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._retrieval: RetrievalService | None = None
+        self._ingest: _IngestComponents | None = None
+        self._training: TrainingPathAgent | None = None
+        self._impact: ChangeImpactAgent | None = None
+        self.requests_handled = 0
+
+    @property
+    def retrieval(self) -> RetrievalService:
+        if self._retrieval is None:
+            self._retrieval = RetrievalService(self.config)
+        return self._retrieval
+
+    @property
+    def ingest_components(self) -> _IngestComponents:
+        if self._ingest is None:
+            self._ingest = _IngestComponents(self.config)
+        return self._ingest
+
+    def preload(self) -> None:
+        """Warm the retrieval path (vector store, embedder, graph store)."""
+        retrieval = self.retrieval
+        retrieval.vector_store.collection.count()
+        retrieval.graph_store.load()
+
+    def handle(self, command: str, args: dict):
+        handler = getattr(self, f"_cmd_{command}", None)
+        if handler is None:
+            raise ValueError(f"Unknown command: {command}")
+        self.requests_handled += 1
+        return handler(args)
+
+    def _cmd_ping(self, args: dict):
+        return {"pong": True, "requests_handled": self.requests_handled}
+
+    def _cmd_search(self, args: dict):
+        if not args.get("query"):
+            raise ValueError("search requires a 'query' argument")
+        retrieval = self.retrieval
+        # Per-request overrides must not leak into the shared config.
+        retrieval.config = _search_config(self.config, args)
+        try:
+            ok, output = _run_search(retrieval, args)
+        finally:
+            retrieval.config = self.config
+        if not ok:
+            raise ValueError(json.dumps(output))
+        return output
+
+    def _cmd_ingest(self, args: dict):
+        return _run_ingest(self.ingest_components, args.get("paths") or [], workers=int(args.get("workers", 1)))
+
+    def _cmd_training(self, args: dict):
+        if self._training is None:
+            self._training = TrainingPathAgent(self.config)
+        result = self._training.execute({"topic": args["topic"], "level": args.get("level", "beginner")})
+        return _serialize(result.data["training_path"])
+
+    def _cmd_impact(self, args: dict):
+        if self._impact is None:
+            self._impact = ChangeImpactAgent(self.config)
+        result = self._impact.execute({"entity": args["entity"]})
+        return _serialize(result.data["impact_report"])
+
+    def _cmd_freshness(self, args: dict):
+        payload = {"scope": args.get("scope", "all"), "include_images": args.get("include_images", True)}
+        if args.get("threshold_days") is not None:
+            payload["threshold_days"] = int(args["threshold_days"])
+        result = FreshnessAgent(self.config).execute(payload)
+        return _serialize(result.data["freshness_report"])
+
+    def _cmd_status(self, args: dict):
+        graph_builder = self._ingest.graph_builder if self._ingest is not None else None
+        return _status_summary(self.config, graph_builder)
+
+
+@cli.command()
+@click.option("--preload", is_flag=True, default=False, help="Load the vector store and graph before accepting requests.")
+def serve(preload):
+    """Serve requests as JSON lines over stdin/stdout.
+
+    Each input line is ``{"id": ..., "command": ..., "args": {...}}``; each
+    response is ``{"id": ..., "ok": true, "result": ...}`` or
+    ``{"id": ..., "ok": false, "error": "..."}``. Progress messages go to stderr.
+    """
+    out = sys.stdout
+    session = BackendSession(_ctx())
+
+    def _emit(payload: dict) -> None:
+        out.write(json.dumps(payload) + "\n")
+        out.flush()
+
+    if preload:
+        with contextlib.redirect_stdout(sys.stderr):
+            session.preload()
+    _emit({"event": "ready", "version": "1.1.0"})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            command = request.get("command", "")
+            if command == "shutdown":
+                _emit({"id": request_id, "ok": True, "result": {"shutdown": True}})
+                break
+            # Anything printed by agents must not corrupt the response stream.
+            with contextlib.redirect_stdout(sys.stderr):
+                result = session.handle(command, request.get("args") or {})
+            _emit({"id": request_id, "ok": True, "result": result})
+        except Exception as exc:  # noqa: BLE001 - report and keep serving
+            logger.exception("serve request failed")
+            _emit({"id": request_id, "ok": False, "error": str(exc)})
+
+
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     cli()
@@ -65,13 +65,21 @@ class KTSConfig:
     )
     knowledge_base_path: str = ".kts"
     chroma_persist_dir: str = ".kts/vectors/chroma"
-    graph_path: str = ".kts/graph/knowledge_graph.json"
-    manifest_path: str = ".kts/manifest.json"
+    graph_path: str = ".kts/graph/knowledge_graph.db"
+    manifest_path: str = ".kts/manifest.db"
+    ner_cache_path: str = ".kts/cache/ner_cache.db"
     chunk_size: int = 1000
     chunk_overlap: int = 200
     confidence_high: float = 0.90
     confidence_medium: float = 0.66
     stale_threshold_days: int = 180
+    crawl_trust_stat: bool = True               # skip hashing files whose (size, mtime_ns, inode) match the manifest
+    crawl_hash_workers: int = 8                 # threads hashing new/changed files during a crawl
+    crawl_hash_algorithm: str = "sha256"        # "sha256", "blake2b" or "xxh3" (needs xxhash) for change detection
+    watch_backend: str = "auto"                 # "watchdog", "polling" or "auto" (watchdog if installed)
+    watch_debounce_seconds: float = 2.0         # quiet time after the last event before a batch is crawled
+    watch_max_batch_wait_seconds: float = 30.0  # crawl a batch this long after its first event even if events continue
+    watch_poll_interval_seconds: float = 5.0    # stat-snapshot interval for the polling backend
 
     # ── Phase 4 master toggle (TD §18.1 rollback) ──────────────────
     phase4_enabled: bool = True
@@ -93,6 +101,16 @@ class KTSConfig:
     # ── NER / Keyphrase (Epic 2 — TD §3.2, §3.3) ─────────────────
     ner_enabled: bool = False                   # auto-enabled when KTS_SPACY_MODEL_PATH set
     spacy_model_path: str = ""                  # set by core extension from addon registry
+    ner_batch_size: int = 64                    # texts per nlp.pipe batch (per-chunk NER)
+    ner_n_process: int = 1                      # spaCy worker processes for nlp.pipe
+    ner_cache_enabled: bool = True              # reuse NER results for unchanged text across re-ingests
+    ner_cache_max_entries: int = 200_000        # LRU bound on cached NER results
+    ingest_pipeline_enabled: bool = True        # stream chunk batches through NER → embedding stages
+    ingest_pipeline_batch_size: int = 32        # chunks per pipeline batch
+    ingest_pipeline_queue_size: int = 4         # batches buffered between stages (backpressure bound)
+    pdf_streaming_enabled: bool = True          # convert/chunk PDFs page by page instead of as one string
+    pdf_stream_window_chars: int = 200_000      # text buffered by the page-stream chunker
+    pdf_stream_sample_chars: int = 1_000_000    # leading text kept in memory for NER/regime/date
 
     # ── Chunk sizing for legal/governing documents ───────────────
     legal_chunk_size: int = 3000                # Fallback char-based chunk size for legal docs
@@ -105,9 +123,24 @@ class KTSConfig:
     deep_max_chunks_per_doc: int = 5            # /deep mode keeps more chunks per document
     query_expansion_enabled: bool = True        # Multi-query retrieval with LLM expansion
     query_expansion_count: int = 3              # Number of query variations to generate
+    multi_query_concurrent: bool = True         # search query variations on a thread pool
+    multi_query_workers: int = 4                # threads for concurrent variant searches
+    multi_query_budget_ms: int = 1500           # drop variants slower than this from fusion (0 = wait for all)
     acronym_resolver_enabled: bool = True
+    hybrid_search_enabled: bool = True          # fuse BM25 lexical hits with dense search (RRF)
     learned_synonyms_enabled: bool = True       # use auto-learned synonyms at retrieval
     term_resolution_enabled: bool = True
+    query_cache_enabled: bool = True            # reuse results of repeated queries until the corpus changes
+    query_cache_max_entries: int = 256          # LRU bound on cached query results
+    query_cache_ttl_seconds: float = 600.0      # max age of a cached result (0 = no expiry)
+    query_embedding_cache_size: int = 512       # LRU of query embeddings kept by VectorStore (0 = off)
+    embedding_model: str = "minilm"             # "minilm" or "bge" (pooling / query prefix preset)
+    embedding_model_path: str = ""              # ONNX model dir or file; empty = bundled all-MiniLM-L6-v2
+    embedding_quantized: bool = True            # prefer an int8 model file when the dir has one
+    embedding_batch_size: int = 32              # texts per embedding run (length-bucketed)
+    embedding_max_length: int = 0               # token limit per text (0 = model preset)
+    embedding_intra_op_threads: int = 4         # ONNX Runtime threads within an operator
+    embedding_inter_op_threads: int = 1         # ONNX Runtime threads across operators (>1 = parallel mode)
     
     # ── Context Expansion (Smart Retrieval) ───────────────────────
     context_expansion_enabled: bool = True      # Expand context window around hit chunks
@@ -117,6 +150,12 @@ class KTSConfig:
     metadata_guided_expansion: bool = True      # Use section headers to guide expansion
     cross_encoder_enabled: bool = False         # auto-enabled when KTS_CROSSENCODER_MODEL_PATH set
     cross_encoder_model_path: str = ""          # set by core extension from addon registry
+    cross_encoder_batch_size: int = 16          # pairs per ONNX run (length-bucketed, dynamically padded)
+    cross_encoder_intra_op_threads: int = 2     # ONNX Runtime threads within an operator
+    cross_encoder_inter_op_threads: int = 1     # ONNX Runtime threads across operators (>1 = parallel mode)
+    cross_encoder_cache_size: int = 4096        # LRU of (query, passage, model) logits (0 = off)
+    cross_encoder_top_k: int = 30               # cascade: CE scores only the top-K cheap-ranked rows (0 = all)
+    cross_encoder_skip_expanded: bool = True    # cascade: never send context-expansion neighbours to the CE
     pagerank_enabled: bool = False              # deferred to Phase 4.1
     context_expansion_enabled: bool = False     # ChunkExpander — deferred
     multi_hop_enabled: bool = True
@@ -150,11 +189,19 @@ def load_config(root_dir: str | Path | None = None) -> KTSConfig:
         source_paths=paths_data.get("paths", []),
         knowledge_base_path=kb_path,
         chroma_persist_dir=f"{kb_path}/vectors/chroma",
-        graph_path=f"{kb_path}/graph/knowledge_graph.json",
-        manifest_path=f"{kb_path}/manifest.json",
+        graph_path=f"{kb_path}/graph/knowledge_graph.db",
+        manifest_path=f"{kb_path}/manifest.db",
+        ner_cache_path=f"{kb_path}/cache/ner_cache.db",
     )
 
     # ── KTS_ env-var overrides (TD §10.2) ─────────────────────────
+    cfg.crawl_trust_stat = _env_bool("KTS_CRAWL_TRUST_STAT", cfg.crawl_trust_stat)
+    cfg.crawl_hash_workers = _env_int("KTS_CRAWL_HASH_WORKERS", cfg.crawl_hash_workers)
+    cfg.crawl_hash_algorithm = os.environ.get("KTS_CRAWL_HASH_ALGORITHM", cfg.crawl_hash_algorithm).lower()
+    cfg.watch_backend = os.environ.get("KTS_WATCH_BACKEND", cfg.watch_backend).lower()
+    cfg.watch_debounce_seconds = _env_float("KTS_WATCH_DEBOUNCE_SECONDS", cfg.watch_debounce_seconds)
+    cfg.watch_max_batch_wait_seconds = _env_float("KTS_WATCH_MAX_BATCH_WAIT_SECONDS", cfg.watch_max_batch_wait_seconds)
+    cfg.watch_poll_interval_seconds = _env_float("KTS_WATCH_POLL_INTERVAL_SECONDS", cfg.watch_poll_interval_seconds)
     cfg.phase4_enabled = _env_bool("KTS_PHASE4_ENABLED", cfg.phase4_enabled)
     cfg.strict_provenance_mode = _env_bool("KTS_STRICT_PROVENANCE_MODE", cfg.strict_provenance_mode)
     cfg.min_provenance_coverage = _env_float("KTS_MIN_PROVENANCE_COVERAGE", cfg.min_provenance_coverage)
@@ -164,6 +211,16 @@ def load_config(root_dir: str | Path | None = None) -> KTSConfig:
     cfg.spacy_model_path = os.environ.get("KTS_SPACY_MODEL_PATH", cfg.spacy_model_path)
     ner_bundled = getattr(sys, 'frozen', False)  # spaCy model is bundled in PyInstaller build
     cfg.ner_enabled = _env_bool("KTS_NER_ENABLED", bool(cfg.spacy_model_path) or ner_bundled)
+    cfg.ner_batch_size = _env_int("KTS_NER_BATCH_SIZE", cfg.ner_batch_size)
+    cfg.ner_n_process = _env_int("KTS_NER_N_PROCESS", cfg.ner_n_process)
+    cfg.ner_cache_enabled = _env_bool("KTS_NER_CACHE_ENABLED", cfg.ner_cache_enabled)
+    cfg.ner_cache_max_entries = _env_int("KTS_NER_CACHE_MAX_ENTRIES", cfg.ner_cache_max_entries)
+    cfg.ingest_pipeline_enabled = _env_bool("KTS_INGEST_PIPELINE_ENABLED", cfg.ingest_pipeline_enabled)
+    cfg.ingest_pipeline_batch_size = _env_int("KTS_INGEST_PIPELINE_BATCH_SIZE", cfg.ingest_pipeline_batch_size)
+    cfg.ingest_pipeline_queue_size = _env_int("KTS_INGEST_PIPELINE_QUEUE_SIZE", cfg.ingest_pipeline_queue_size)
+    cfg.pdf_streaming_enabled = _env_bool("KTS_PDF_STREAMING_ENABLED", cfg.pdf_streaming_enabled)
+    cfg.pdf_stream_window_chars = _env_int("KTS_PDF_STREAM_WINDOW_CHARS", cfg.pdf_stream_window_chars)
+    cfg.pdf_stream_sample_chars = _env_int("KTS_PDF_STREAM_SAMPLE_CHARS", cfg.pdf_stream_sample_chars)
     cfg.acronym_resolver_enabled = _env_bool("KTS_ACRONYM_RESOLVER_ENABLED", cfg.acronym_resolver_enabled)
     cfg.max_chunks_per_doc = _env_int("KTS_MAX_CHUNKS_PER_DOC", cfg.max_chunks_per_doc)
     cfg.deep_max_chunks_per_doc = _env_int("KTS_DEEP_MAX_CHUNKS_PER_DOC", cfg.deep_max_chunks_per_doc)
@@ -173,11 +230,32 @@ def load_config(root_dir: str | Path | None = None) -> KTSConfig:
     cfg.legal_max_chunk_size = _env_int("KTS_LEGAL_MAX_CHUNK_SIZE", cfg.legal_max_chunk_size)
     cfg.query_expansion_enabled = _env_bool("KTS_QUERY_EXPANSION_ENABLED", cfg.query_expansion_enabled)
     cfg.query_expansion_count = _env_int("KTS_QUERY_EXPANSION_COUNT", cfg.query_expansion_count)
+    cfg.multi_query_concurrent = _env_bool("KTS_MULTI_QUERY_CONCURRENT", cfg.multi_query_concurrent)
+    cfg.multi_query_workers = _env_int("KTS_MULTI_QUERY_WORKERS", cfg.multi_query_workers)
+    cfg.multi_query_budget_ms = _env_int("KTS_MULTI_QUERY_BUDGET_MS", cfg.multi_query_budget_ms)
+    cfg.hybrid_search_enabled = _env_bool("KTS_HYBRID_SEARCH_ENABLED", cfg.hybrid_search_enabled)
     cfg.learned_synonyms_enabled = _env_bool("KTS_LEARNED_SYNONYMS_ENABLED", cfg.learned_synonyms_enabled)
     cfg.term_resolution_enabled = _env_bool("KTS_TERM_RESOLUTION_ENABLED", cfg.term_resolution_enabled)
+    cfg.query_cache_enabled = _env_bool("KTS_QUERY_CACHE_ENABLED", cfg.query_cache_enabled)
+    cfg.query_cache_max_entries = _env_int("KTS_QUERY_CACHE_MAX_ENTRIES", cfg.query_cache_max_entries)
+    cfg.query_cache_ttl_seconds = _env_float("KTS_QUERY_CACHE_TTL_SECONDS", cfg.query_cache_ttl_seconds)
+    cfg.query_embedding_cache_size = _env_int("KTS_QUERY_EMBEDDING_CACHE_SIZE", cfg.query_embedding_cache_size)
+    cfg.embedding_model = os.environ.get("KTS_EMBEDDING_MODEL", cfg.embedding_model).lower()
+    cfg.embedding_model_path = os.environ.get("KTS_EMBEDDING_MODEL_PATH", cfg.embedding_model_path)
+    cfg.embedding_quantized = _env_bool("KTS_EMBEDDING_QUANTIZED", cfg.embedding_quantized)
+    cfg.embedding_batch_size = _env_int("KTS_EMBEDDING_BATCH_SIZE", cfg.embedding_batch_size)
+    cfg.embedding_max_length = _env_int("KTS_EMBEDDING_MAX_LENGTH", cfg.embedding_max_length)
+    cfg.embedding_intra_op_threads = _env_int("KTS_EMBEDDING_INTRA_OP_THREADS", cfg.embedding_intra_op_threads)
+    cfg.embedding_inter_op_threads = _env_int("KTS_EMBEDDING_INTER_OP_THREADS", cfg.embedding_inter_op_threads)
     # Cross-encoder: auto-enable if model path is provided
     cfg.cross_encoder_model_path = os.environ.get("KTS_CROSSENCODER_MODEL_PATH", cfg.cross_encoder_model_path)
     cfg.cross_encoder_enabled = _env_bool("KTS_CROSS_ENCODER_ENABLED", bool(cfg.cross_encoder_model_path))
+    cfg.cross_encoder_batch_size = _env_int("KTS_CROSS_ENCODER_BATCH_SIZE", cfg.cross_encoder_batch_size)
+    cfg.cross_encoder_intra_op_threads = _env_int("KTS_CROSS_ENCODER_INTRA_OP_THREADS", cfg.cross_encoder_intra_op_threads)
+    cfg.cross_encoder_inter_op_threads = _env_int("KTS_CROSS_ENCODER_INTER_OP_THREADS", cfg.cross_encoder_inter_op_threads)
+    cfg.cross_encoder_cache_size = _env_int("KTS_CROSS_ENCODER_CACHE_SIZE", cfg.cross_encoder_cache_size)
+    cfg.cross_encoder_top_k = _env_int("KTS_CROSS_ENCODER_TOP_K", cfg.cross_encoder_top_k)
+    cfg.cross_encoder_skip_expanded = _env_bool("KTS_CROSS_ENCODER_SKIP_EXPANDED", cfg.cross_encoder_skip_expanded)
     cfg.pagerank_enabled = _env_bool("KTS_PAGERANK_ENABLED", cfg.pagerank_enabled)
     cfg.context_expansion_enabled = _env_bool("KTS_CONTEXT_EXPANSION_ENABLED", cfg.context_expansion_enabled)
     cfg.context_window_size = _env_int("KTS_CONTEXT_WINDOW_SIZE", cfg.context_window_size)
@@ -107,18 +107,22 @@ module.exports = async function doctor({ vscode, outputChannel, context, runner
   outputChannel.appendLine('\n--- Knowledge Base ---');
   const sourcePath = config.get('sourcePath');
   const kbPath = config.get('kbWorkspacePath') || (sourcePath ? path.join(sourcePath, '.kts') : paths.kbWorkspace);
-  const manifestPath = path.join(kbPath, 'manifest.json');
+  const manifestPath = path.join(kbPath, 'manifest.db');
+  const legacyManifestPath = path.join(kbPath, 'manifest.json');
   
   report.knowledgeBase = {
     kbWorkspace: kbPath,
     kbWorkspaceExists: fs.existsSync(kbPath),
-    manifestExists: fs.existsSync(manifestPath),
+    manifestExists: fs.existsSync(manifestPath) || fs.existsSync(legacyManifestPath),
     manifest: null,
   };
 
   if (fs.existsSync(manifestPath)) {
+    // SQLite manifest: `kts-backend status` reports the file count
+    report.knowledgeBase.manifest = { format: 'sqlite', sizeBytes: fs.statSync(manifestPath).size };
+  } else if (fs.existsSync(legacyManifestPath)) {
     try {
-      const manifest = JSON.parse(fs.readFileSync(manifestPath, 'utf8'));
+      const manifest = JSON.parse(fs.readFileSync(legacyManifestPath, 'utf8'));
       report.knowledgeBase.manifest = {
         lastCrawl: manifest.last_crawl || 'never',
         lastIngest: manifest.last_ingest || 'never',
@@ -5,6 +5,7 @@ This module serves as the entry point for the PyInstaller-built executable.
 It invokes the same CLI module used by the venv-based execution (Option A1).
 """
 
+import multiprocessing
 import sys
 import os
 
@@ -24,4 +25,6 @@ else:
 from cli.main import cli
 
 if __name__ == '__main__':
+    # Required for `ingest --workers N` (process pool) in the frozen executable
+    multiprocessing.freeze_support()
     sys.exit(cli())
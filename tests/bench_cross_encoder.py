@@ -0,0 +1,101 @@
+"""
+Cross-Encoder Batching Benchmark
+Compares the legacy scoring loop (every pair padded to max_length, fixed
+batches of 16) with score_pairs' length-bucketed, dynamically padded
+batches on 60- and 300-candidate pools.
+
+Requires the ONNX cross-encoder (directory with *.onnx + tokenizer.json).
+
+Usage: python tests/bench_cross_encoder.py [--model DIR] [--batch-size 16] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from backend.retrieval import cross_encoder
+
+QUERY = "What are the servicer's reporting obligations to the trustee?"
+
+WORDS = (
+    "the servicer shall deliver to the trustee a monthly remittance report "
+    "describing collections advances and distributions on each distribution date "
+    "certificateholders pooling agreement mortgage loans section"
+).split()
+
+
+def make_passages(n: int, seed: int = 11) -> list[str]:
+    # Retrieval pools mix short list items with full legal sections
+    rnd = random.Random(seed)
+    return [
+        " ".join(rnd.choices(WORDS, k=max(8, min(450, int(rnd.lognormvariate(4.3, 0.8))))))
+        for _ in range(n)
+    ]
+
+
+def fixed_padding_scores(session, tokenizer, query: str, passages: list[str], max_length: int = 512) -> list[float]:
+    """Legacy loop: pad every pair to max_length, batches of 16 in input order."""
+    names = [inp.name for inp in session.get_inputs()]
+    scores = []
+    for i in range(0, len(passages), 16):
+        ids_rows, type_rows, attn_rows = [], [], []
+        for passage in passages[i : i + 16]:
+            encoding = tokenizer.encode(query, passage)
+            ids = encoding.ids[:max_length]
+            type_ids = encoding.type_ids[:max_length]
+            pad = max_length - len(ids)
+            ids_rows.append(ids + [0] * pad)
+            type_rows.append(type_ids + [0] * pad)
+            attn_rows.append([1] * len(ids) + [0] * pad)
+        arrays = {
+            "input_ids": np.array(ids_rows, dtype=np.int64),
+            "attention_mask": np.array(attn_rows, dtype=np.int64),
+            "token_type_ids": np.array(type_rows, dtype=np.int64),
+        }
+        feed = {name: arr for name in names for key, arr in arrays.items() if key in name}
+        logits = session.run(None, feed)[0]
+        scores.extend((logits[:, 0] if logits.ndim == 2 else logits).tolist())
+    return scores
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cross-encoder batching")
+    parser.add_argument("--model", default=os.environ.get("KTS_CROSSENCODER_MODEL_PATH", ""))
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    session, tokenizer = cross_encoder._load_model(args.model or None)
+    if session is None:
+        print("Cross-encoder model not available (pass --model or set KTS_CROSSENCODER_MODEL_PATH)")
+        return 1
+
+    print(f"{'pool':>5} {'fixed 512 ms':>13} {'bucketed ms':>12} {'speedup':>8} {'max |diff|':>11}")
+    for pool in (60, 300):
+        passages = make_passages(pool)
+        legacy = fixed_padding_scores(session, tokenizer, QUERY, passages)
+        bucketed = cross_encoder.score_pairs(QUERY, passages, batch_size=args.batch_size)
+        diff = max(abs(a - b) for a, b in zip(legacy, bucketed))
+
+        legacy_ms = best_of(lambda: fixed_padding_scores(session, tokenizer, QUERY, passages), args.repeat)
+        bucketed_ms = best_of(lambda: cross_encoder.score_pairs(QUERY, passages, batch_size=args.batch_size), args.repeat)
+        print(f"{pool:>5} {legacy_ms:>13.1f} {bucketed_ms:>12.1f} {legacy_ms / bucketed_ms:>7.1f}x {diff:>11.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
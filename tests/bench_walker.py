@@ -0,0 +1,94 @@
+"""
+Crawler Walk Benchmark
+Builds a synthetic source tree (default 200k files, with a large .kts
+directory to prune) and compares the old rglob + filter walk with the
+streaming scandir walker (backend.common.walker.iter_files).
+
+Usage: python tests/bench_walker.py [--files 200000] [--fanout 20] [--root /tmp/kts_walk]
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from backend.common.walker import iter_files
+from config.settings import KTSConfig
+
+SKIP_DIRS = {".kts", "knowledge_base"}
+FILE_EXTENSIONS = [".md", ".pdf", ".docx", ".txt", ".bin", ".log"]  # ~1/3 unsupported
+
+
+def build_tree(root: Path, files: int, fanout: int) -> None:
+    """*files* empty files spread over a fanout×fanout directory grid, plus a KB dir."""
+    created = 0
+    while created < files:
+        for a in range(fanout):
+            for b in range(fanout):
+                directory = root / f"dept{a:02d}" / f"team{b:02d}"
+                directory.mkdir(parents=True, exist_ok=True)
+                for _ in range(max(1, files // (fanout * fanout * 4))):
+                    if created >= files:
+                        return
+                    (directory / f"file{created:07d}{FILE_EXTENSIONS[created % len(FILE_EXTENSIONS)]}").touch()
+                    created += 1
+    # KB output the crawler must not descend into
+    kb = root / ".kts" / "documents"
+    for i in range(files // 10):
+        (kb / f"doc_{i // 100:05d}").mkdir(parents=True, exist_ok=True)
+        (kb / f"doc_{i // 100:05d}" / f"content{i}.md").touch()
+
+
+def legacy_walk(root: Path, extensions) -> tuple[int, float]:
+    start = time.perf_counter()
+    files = [
+        p for p in root.rglob("*")
+        if p.is_file() and p.suffix.lower() in extensions and not SKIP_DIRS.intersection(p.parts)
+    ]
+    first = time.perf_counter() - start  # list is complete before the first file is used
+    paths = [str(p.resolve()) for p in files]
+    return len(paths), first
+
+
+def streaming_walk(root: Path, extensions) -> tuple[int, float]:
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in iter_files(root, extensions, skip_dirs=SKIP_DIRS):
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return count, first or 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark rglob vs scandir crawler walks")
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--fanout", type=int, default=20)
+    parser.add_argument("--root", type=Path, default=None, help="Reuse/keep the tree at this path")
+    args = parser.parse_args()
+
+    root = args.root or Path(tempfile.mkdtemp(prefix="kts_walk_"))
+    if not root.exists() or not any(root.iterdir()):
+        print(f"Building {args.files:,} files under {root} ...")
+        root.mkdir(parents=True, exist_ok=True)
+        build_tree(root, args.files, args.fanout)
+
+    extensions = set(KTSConfig().supported_extensions)
+    try:
+        print(f"{'walker':<12} {'files':>9} {'total s':>9} {'first file s':>13}")
+        for name, walk in (("rglob", legacy_walk), ("scandir", streaming_walk)):
+            start = time.perf_counter()
+            count, first = walk(root, extensions)
+            total = time.perf_counter() - start
+            print(f"{name:<12} {count:>9,} {total:>9.2f} {first:>13.4f}")
+    finally:
+        if args.root is None:
+            shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
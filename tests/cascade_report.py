@@ -0,0 +1,109 @@
+"""
+Cross-Encoder Cascade Report
+Runs tests/golden_queries.json through RetrievalService for several
+cascade sizes (config.cross_encoder_top_k) and reports quality and
+latency against the uncascaded baseline (K=0, every candidate scored).
+
+Requires an ingested knowledge base (KTS_KB_PATH) and the cross-encoder
+model (KTS_CROSSENCODER_MODEL_PATH).
+
+Usage: python tests/cascade_report.py [--k 0 10 20 30 50] [--deep] [--output report.json]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import load_config
+from backend.agents import RetrievalService
+from backend.retrieval.cross_encoder import clear_score_cache
+
+GOLDEN = Path(__file__).parent / "golden_queries.json"
+
+
+def run_queries(retrieval: RetrievalService, queries: list[dict], deep: bool) -> dict:
+    per_query = {}
+    for q in queries:
+        start = time.perf_counter()
+        result = retrieval.execute({
+            "query": q["query_text"],
+            "max_results": 5,
+            "max_chunks_per_doc": retrieval.config.deep_max_chunks_per_doc if deep else retrieval.config.max_chunks_per_doc,
+            "deep_mode": deep,
+        })
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        chunks = result.data["search_result"].context_chunks if result.success else []
+        expected = q.get("expected_doc_types_priority") or []
+        terms = [t.lower() for t in q.get("must_include_terms") or []]
+        per_query[q["query_id"]] = {
+            "ms": elapsed_ms,
+            "top1_type_ok": bool(chunks and expected and chunks[0].doc_type == expected[0]),
+            "evidence_ok": not terms or any(t in c.content.lower() for c in chunks for t in terms),
+            "top3": [c.chunk_id for c in chunks[:3]],
+        }
+    return per_query
+
+
+def summarize(per_query: dict, baseline: dict | None) -> dict:
+    latencies = sorted(r["ms"] for r in per_query.values())
+    n = len(latencies)
+    summary = {
+        "queries": n,
+        "top1_doc_type_acc": sum(r["top1_type_ok"] for r in per_query.values()) / n,
+        "evidence_hit_rate": sum(r["evidence_ok"] for r in per_query.values()) / n,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(n - 1, int(round(0.95 * (n - 1))))],
+    }
+    if baseline:
+        overlaps = [
+            len(set(r["top3"]) & set(baseline[qid]["top3"])) / max(len(baseline[qid]["top3"]), 1)
+            for qid, r in per_query.items()
+        ]
+        summary["top3_agreement_vs_full"] = sum(overlaps) / n
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Quality/latency report for cross-encoder cascade sizes")
+    parser.add_argument("--k", type=int, nargs="+", default=[0, 10, 20, 30, 50])
+    parser.add_argument("--deep", action="store_true", help="Use deep-mode candidate pools")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    base_config = load_config()
+    if not base_config.cross_encoder_enabled:
+        print("Cross-encoder disabled (set KTS_CROSSENCODER_MODEL_PATH)")
+        return 1
+    queries = json.loads(GOLDEN.read_text(encoding="utf-8"))["queries"]
+
+    retrieval = RetrievalService(base_config)
+    results = {}
+    baseline = None
+    for k in sorted(args.k):
+        # No result cache, and a cold CE score cache, so every K pays full cost
+        retrieval.config = replace(base_config, cross_encoder_top_k=k, query_cache_enabled=False)
+        retrieval.query_cache = None
+        clear_score_cache()
+        per_query = run_queries(retrieval, queries, args.deep)
+        if k == 0:
+            baseline = per_query
+        results[k] = summarize(per_query, baseline if k else None)
+
+    print(f"{'K':>4} {'top1 acc':>9} {'evidence':>9} {'top3 agr':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for k, s in results.items():
+        agreement = s.get("top3_agreement_vs_full")
+        print(
+            f"{k if k else 'all':>4} {s['top1_doc_type_acc']:>9.2f} {s['evidence_hit_rate']:>9.2f} "
+            f"{'-' if agreement is None else f'{agreement:.2f}':>9} {s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f}"
+        )
+    if args.output:
+        args.output.write_text(json.dumps({str(k): s for k, s in results.items()}, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
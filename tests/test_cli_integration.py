@@ -36,3 +36,11 @@ def test_cli_end_to_end():
 
     freshness_out = run_cli(["freshness"])
     assert freshness_out["total_documents"] >= 1
+
+
+def test_cli_ingest_with_worker_pool():
+    fixtures = ROOT / "tests" / "fixtures" / "complex"
+    ingest_out = run_cli(["ingest", "--paths", str(fixtures), "--workers", "2"])
+    assert ingest_out["count"] == 3
+    assert ingest_out["throughput"]["workers"] == 2
+    assert all("prepare_seconds" in row for row in ingest_out["ingested"])
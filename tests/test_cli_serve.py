@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def run_serve(requests: list[dict]) -> list[dict]:
+    stdin = "".join(json.dumps(item) + "\n" for item in requests)
+    result = subprocess.run(
+        [sys.executable, "-m", "cli.main", "serve"],
+        cwd=ROOT,
+        input=stdin,
+        capture_output=True,
+        text=True,
+        check=False,
+        timeout=600,
+    )
+    assert result.returncode == 0, result.stderr
+    return [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+
+
+def test_serve_handles_multiple_requests_in_one_process():
+    fixtures = ROOT / "tests" / "fixtures" / "simple"
+    responses = run_serve(
+        [
+            {"id": 1, "command": "ping"},
+            {"id": 2, "command": "ingest", "args": {"paths": [str(fixtures)]}},
+            {"id": 3, "command": "search", "args": {"query": "reset password ToolX"}},
+            {"id": 4, "command": "search", "args": {"query": "ToolX error", "deep": True}},
+            {"id": 5, "command": "status"},
+            {"id": 6, "command": "no-such-command"},
+            {"id": 7, "command": "shutdown"},
+            {"id": 8, "command": "ping"},
+        ]
+    )
+
+    assert responses[0]["event"] == "ready"
+    by_id = {row["id"]: row for row in responses[1:]}
+    assert by_id[1]["ok"] and by_id[1]["result"]["pong"]
+    assert by_id[2]["result"]["count"] >= 1
+    assert len(by_id[3]["result"]["context_chunks"]) >= 1
+    assert by_id[4]["ok"]
+    assert by_id[5]["result"]["graph_nodes"] >= 1
+    assert by_id[6]["ok"] is False and "Unknown command" in by_id[6]["error"]
+    assert by_id[7]["result"]["shutdown"] is True
+    assert 8 not in by_id
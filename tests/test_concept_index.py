@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import networkx as nx
+
+from backend.graph import ConceptIndex
+
+
+def _graph() -> nx.DiGraph:
+    G = nx.DiGraph()
+    G.add_node("doc:a", type="DOCUMENT", title="a")
+    G.add_node("term:servicer", type="DEFINED_TERM", surface_form="Servicer")
+    G.add_node("tool:toolx", type="TOOL", name="ToolX")
+    G.add_node("err:upl013", type="ERROR_CODE", name="ERR-UPL-013")
+    G.add_node("topic:upload", type="TOPIC", name="upload")
+    G.add_node("topic:upload-dup", type="TOPIC", name="Upload")
+    G.add_edge("doc:a", "tool:toolx", type="MENTIONS")
+    return G
+
+
+def _scan(G: nx.DiGraph, query: str) -> set[str]:
+    """Reference implementation: the original per-node substring scan."""
+    q = query.lower()
+    return {
+        node_id
+        for node_id, attrs in G.nodes(data=True)
+        if attrs.get("type") in ("DEFINED_TERM", "TERM", "TOOL", "ERROR_CODE", "TOPIC", "CONCEPT")
+        and attrs.get("name", attrs.get("surface_form", "")).lower()
+        and attrs.get("name", attrs.get("surface_form", "")).lower() in q
+    }
+
+
+def test_find_matches_substring_scan():
+    G = _graph()
+    index = ConceptIndex(G)
+    for query in [
+        "How does the Servicer handle ERR-UPL-013 uploads in ToolX?",
+        "toolx",
+        "nothing relevant",
+        "",
+    ]:
+        assert set(index.find(query)) == _scan(G, query)
+    assert "doc:a" not in index.find("a")
+
+
+def test_for_graph_caches_frozen_graphs_only():
+    G = _graph()
+    assert ConceptIndex.for_graph(G) is not ConceptIndex.for_graph(G)
+
+    frozen = nx.freeze(_graph())
+    assert ConceptIndex.for_graph(frozen) is ConceptIndex.for_graph(frozen)
+    assert len(ConceptIndex.for_graph(frozen)) == 4  # "upload" names two nodes
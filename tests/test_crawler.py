@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from config import load_config
 from backend.agents import CrawlerAgent
 
@@ -9,3 +11,130 @@ def test_crawler_detects_new_files():
     changes = result.data["changes"]
     assert result.success
     assert len(changes.new_files) >= 2
+
+
+def _crawl_config(tmp_path, **overrides):
+    from dataclasses import replace
+
+    kb = tmp_path / ".kts"
+    return replace(load_config(), knowledge_base_path=str(kb), manifest_path=str(kb / "manifest.json"), **overrides)
+
+
+def _crawl_and_save(agent, corpus):
+    from backend.common.manifest import ManifestStore
+
+    changes = agent.execute({"paths": [str(corpus)]}).data["changes"]
+    ManifestStore(agent.config.manifest_path).upsert_files(
+        changes.new_files + changes.modified_files + changes.refreshed_files
+    )
+    return changes
+
+
+def test_crawler_skips_hashing_files_with_unchanged_stat(tmp_path, monkeypatch):
+    import os
+    import time
+
+    import backend.agents.crawler_agent as crawler_mod
+
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    old = time.time() - 3600
+    for name in ("a.md", "b.md", "c.md"):
+        (corpus / name).write_text(f"content of {name}", encoding="utf-8")
+        os.utime(corpus / name, (old, old))
+
+    hashed = []
+    real_sha256 = crawler_mod.sha256_file
+    monkeypatch.setattr(crawler_mod, "sha256_file", lambda path: hashed.append(os.path.basename(path)) or real_sha256(path))
+    agent = CrawlerAgent(_crawl_config(tmp_path))
+
+    first = _crawl_and_save(agent, corpus)
+    assert len(first.new_files) == 3 and sorted(hashed) == ["a.md", "b.md", "c.md"]
+
+    hashed.clear()
+    second = _crawl_and_save(agent, corpus)
+    assert second.unchanged_files == 3 and hashed == []
+
+    # An edit changes size/mtime: only that file is re-read
+    (corpus / "b.md").write_text("edited content of b.md", encoding="utf-8")
+    third = _crawl_and_save(agent, corpus)
+    assert hashed == ["b.md"]
+    assert [info.filename for info in third.modified_files] == ["b.md"]
+
+
+def test_crawler_refreshes_legacy_entries_and_keeps_hash_algorithm(tmp_path):
+    import os
+    import time
+
+    from backend.common.manifest import ManifestStore
+
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.md").write_text("alpha", encoding="utf-8")
+    old = time.time() - 3600
+    os.utime(corpus / "a.md", (old, old))
+
+    agent = CrawlerAgent(_crawl_config(tmp_path))
+    _crawl_and_save(agent, corpus)
+
+    # Simulate a manifest written before stat fields existed
+    store = ManifestStore(agent.config.manifest_path)
+    data = store.load()
+    for entry in data["files"].values():
+        entry.pop("mtime_ns"), entry.pop("inode"), entry.pop("hash_algorithm")
+    store.save(data)
+
+    legacy = _crawl_and_save(CrawlerAgent(_crawl_config(tmp_path, crawl_hash_algorithm="blake2b")), corpus)
+    # Stat unknown → re-hashed, and compared with the stored sha256 digest:
+    # the content is unchanged, the entry moves to blake2b
+    assert not legacy.modified_files and legacy.unchanged_files == 1
+    assert [info.hash_algorithm for info in legacy.refreshed_files] == ["blake2b"]
+    assert store.load()["files"][str((corpus / "a.md").resolve())]["hash_algorithm"] == "blake2b"
+
+    # A real edit under a new algorithm is still detected
+    (corpus / "a.md").write_text("alphabet", encoding="utf-8")
+    os.utime(corpus / "a.md", (old, old))
+    edited = _crawl_and_save(CrawlerAgent(_crawl_config(tmp_path, crawl_hash_algorithm="sha256")), corpus)
+    assert [info.hash_algorithm for info in edited.modified_files] == ["sha256"]
+    edited = _crawl_and_save(CrawlerAgent(_crawl_config(tmp_path, crawl_hash_algorithm="blake2b")), corpus)
+    assert edited.unchanged_files == 1 and not edited.modified_files
+
+    # Switching back keeps the blake2b hash while the stat still matches
+    steady = _crawl_and_save(CrawlerAgent(_crawl_config(tmp_path)), corpus)
+    assert steady.unchanged_files == 1 and not steady.modified_files
+
+    # A legacy entry hashed with the same algorithm is unchanged but refreshed
+    data = store.load()
+    for entry in data["files"].values():
+        entry["mtime_ns"] = 0
+    store.save(data)
+    refreshed = _crawl_and_save(CrawlerAgent(_crawl_config(tmp_path, crawl_hash_algorithm="blake2b")), corpus)
+    assert refreshed.unchanged_files == 1 and len(refreshed.refreshed_files) == 1
+    assert store.load()["files"][str((corpus / "a.md").resolve())]["mtime_ns"] > 0
+
+
+def test_scoped_crawl_only_sweeps_touched_paths(tmp_path):
+    corpus = tmp_path / "corpus"
+    (corpus / "sub").mkdir(parents=True)
+    for rel in ("a.md", "b.md", "sub/c.md", "sub/d.md"):
+        (corpus / rel).write_text(f"content of {rel}", encoding="utf-8")
+    agent = CrawlerAgent(_crawl_config(tmp_path))
+    _crawl_and_save(agent, corpus)
+
+    # b.md deleted, a.md renamed, sub/ untouched: a scoped crawl of the
+    # touched paths sees the deletion and the rename but nothing else
+    (corpus / "b.md").unlink()
+    (corpus / "a.md").rename(corpus / "a2.md")
+    changes = agent.execute(
+        {"paths": [str(corpus / "b.md"), str(corpus / "a.md"), str(corpus / "a2.md")], "scoped": True}
+    ).data["changes"]
+    assert changes.errors == []
+    assert sorted(Path(row.path).name for row in changes.deleted_files) == ["a.md", "b.md"]
+    assert [info.filename for info in changes.new_files] == ["a2.md"]
+    assert changes.modified_files == []
+
+    # Unscoped, a crawl of one file would sweep everything else as missing
+    unscoped = agent.execute({"paths": [str(corpus / "sub" / "c.md")]}).data["changes"]
+    assert len(unscoped.deleted_files) == 3
+    scoped = agent.execute({"paths": [str(corpus / "sub")], "scoped": True}).data["changes"]
+    assert scoped.deleted_files == [] and scoped.unchanged_files == 2
@@ -22,12 +22,14 @@ from backend.retrieval.cross_encoder import rerank, score_pairs
 
 @pytest.fixture(autouse=True)
 def _reset_singleton():
-    """Reset the lazy-loaded ONNX session/tokenizer between tests."""
+    """Reset the lazy-loaded ONNX session/tokenizer and score cache between tests."""
     ce_mod._session = None
     ce_mod._tokenizer = None
+    ce_mod.clear_score_cache()
     yield
     ce_mod._session = None
     ce_mod._tokenizer = None
+    ce_mod.clear_score_cache()
 
 
 # ---------------------------------------------------------------------------
@@ -171,6 +173,69 @@ class TestWithMockedModel:
         scores = score_pairs("test query", passages)
         assert len(scores) == 20
 
+    def test_length_bucketed_batches_use_dynamic_padding(self):
+        """Batches are padded to their own longest pair and scores keep input order."""
+        import numpy as np
+
+        mock_session, mock_tokenizer = self._mock_load()
+
+        def encode(query, passage):
+            n = len(passage.split())
+            encoding = MagicMock()
+            encoding.ids = [1] * n
+            encoding.type_ids = [1] * n
+            return encoding
+
+        mock_tokenizer.encode.side_effect = encode
+        widths = []
+
+        def mock_run(names, feed):
+            widths.append(feed["input_ids"].shape[1])
+            # logit = number of real tokens, so scores identify their passage
+            return [feed["attention_mask"].sum(axis=1, keepdims=True).astype(np.float64)]
+
+        mock_session.run.side_effect = mock_run
+        ce_mod._session = mock_session
+        ce_mod._tokenizer = mock_tokenizer
+
+        lengths = [30, 2, 17, 5, 3, 40, 8]
+        passages = [" ".join(["w"] * n) for n in lengths]
+        scores = score_pairs("q", passages, batch_size=3, max_length=32)
+
+        assert scores == [30.0, 2.0, 17.0, 5.0, 3.0, 32.0, 8.0]
+        assert widths == [5, 30, 32]  # sorted lengths 2,3,5 | 8,17,30 | 32
+
+    def test_score_cache_only_scores_new_pairs(self):
+        """Repeated and superset reranks reuse cached logits."""
+        import numpy as np
+
+        mock_session, mock_tokenizer = self._mock_load()
+        mock_encoding = MagicMock()
+        mock_encoding.ids = list(range(10))
+        mock_encoding.type_ids = [0] * 10
+        mock_tokenizer.encode.return_value = mock_encoding
+        scored = []
+
+        def mock_run(names, feed):
+            scored.append(feed["input_ids"].shape[0])
+            return [np.arange(feed["input_ids"].shape[0], dtype=np.float64).reshape(-1, 1)]
+
+        mock_session.run.side_effect = mock_run
+        ce_mod._session = mock_session
+        ce_mod._tokenizer = mock_tokenizer
+
+        first = score_pairs("servicer  duties", ["a", "b"])
+        again = score_pairs("servicer duties", ["b", "a"])
+        superset = score_pairs("servicer duties", ["a", "c", "b"])
+
+        assert again == [first[1], first[0]]
+        assert superset[0] == first[0] and superset[2] == first[1]
+        assert scored == [2, 1]  # only "c" was scored the third time
+        assert mock_tokenizer.encode.call_count == 3
+
+        score_pairs("servicer duties", ["a"], cache_size=0)
+        assert scored == [2, 1, 1]
+
     def test_custom_score_key(self):
         """rerank supports custom score_key parameter."""
         import numpy as np
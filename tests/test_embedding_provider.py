@@ -0,0 +1,170 @@
+"""Unit tests for backend.vector.embedding_provider."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import backend.vector.embedding_provider as ep_mod
+from backend.vector import EmbeddingModelMismatchError, VectorStore
+from backend.vector.embedding_provider import (
+    EmbeddingProvider,
+    OnnxEmbeddingProvider,
+    find_model_file,
+    get_embedding_provider,
+)
+
+
+class _FakeTokenizer:
+    """Whitespace tokenizer: token id = word length."""
+
+    def enable_truncation(self, max_length):
+        self.max_length = max_length
+
+    def no_padding(self):
+        pass
+
+    def encode_batch(self, texts):
+        out = []
+        for text in texts:
+            ids = [len(w) for w in text.split()][: self.max_length]
+            out.append(SimpleNamespace(ids=ids, attention_mask=[1] * len(ids), type_ids=[0] * len(ids)))
+        return out
+
+
+class _FakeSession:
+    """Token embedding = (id, 1.0); records the padded width of each run."""
+
+    def __init__(self):
+        self.widths = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, _outputs, feeds):
+        ids = feeds["input_ids"]
+        assert "token_type_ids" not in feeds
+        self.widths.append(ids.shape[1])
+        hidden = np.stack([ids.astype(np.float32), np.ones_like(ids, dtype=np.float32)], axis=-1)
+        return [hidden]
+
+
+def _provider(model="minilm", batch_size=2):
+    return OnnxEmbeddingProvider(
+        "unused", model=model, batch_size=batch_size, session=_FakeSession(), tokenizer=_FakeTokenizer()
+    )
+
+
+def test_mean_pooling_ignores_padding_and_keeps_input_order():
+    provider = _provider(batch_size=2)
+    texts = ["aaaa aaaa aaaa aaaa", "a", "aa aa", "aaa aaa aaa"]
+    vectors = provider(texts)
+
+    # Mean of (id, 1) over real tokens only, then L2-normalised
+    for text, vector in zip(texts, vectors):
+        n = len(text.split()[0])
+        expected = np.array([n, 1.0]) / np.hypot(n, 1.0)
+        assert np.allclose(vector, expected)
+    # Sorted by length: (1, 2) then (3, 4) tokens
+    assert provider._session.widths == [2, 4]
+
+
+def test_bge_uses_cls_pooling_and_query_instruction():
+    provider = _provider(model="bge", batch_size=8)
+    doc = provider.embed_documents(["aaa b"])[0]
+    assert np.allclose(doc, np.array([3.0, 1.0]) / np.hypot(3.0, 1.0))
+
+    provider.query_instruction = "zz "
+    query = provider.embed_queries(["aaa b"])[0]
+    assert np.allclose(query, np.array([2.0, 1.0]) / np.hypot(2.0, 1.0))
+
+
+def test_unknown_model_rejected():
+    with pytest.raises(ValueError):
+        _provider(model="e5")
+
+
+def test_find_model_file_prefers_int8(tmp_path):
+    (tmp_path / "model.onnx").write_bytes(b"")
+    assert find_model_file(tmp_path) == tmp_path / "model.onnx"
+
+    onnx_dir = tmp_path / "onnx"
+    onnx_dir.mkdir()
+    (onnx_dir / "model_quantized.onnx").write_bytes(b"")
+    (tmp_path / "model.onnx").unlink()
+    assert find_model_file(tmp_path) == onnx_dir / "model_quantized.onnx"
+    assert find_model_file(tmp_path, quantized=False) == onnx_dir / "model_quantized.onnx"
+
+    (onnx_dir / "model.onnx").write_bytes(b"")
+    assert find_model_file(tmp_path, quantized=False) == onnx_dir / "model.onnx"
+    assert find_model_file(tmp_path / "missing") is None
+
+
+def test_get_embedding_provider_is_shared_and_falls_back(monkeypatch, tmp_path):
+    monkeypatch.setattr(ep_mod, "_providers", {})
+    config = SimpleNamespace(embedding_model="bge", embedding_model_path=str(tmp_path / "missing"))
+    provider = get_embedding_provider(config)
+    assert provider.name == "minilm"
+    assert get_embedding_provider(config) is provider
+
+
+class _CountingProvider(EmbeddingProvider):
+    name = "counting"
+
+    def __init__(self):
+        super().__init__(batch_size=4)
+        self.documents = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.documents.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_queries(self, texts):
+        self.queries.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_vector_store_embeds_through_provider(tmp_path):
+    from backend.common.models import TextChunk
+
+    provider = _CountingProvider()
+    store = VectorStore(str(tmp_path / "chroma"), embedding_provider=provider)
+    chunks = [
+        TextChunk(chunk_id=f"d_{i}", doc_id="d", content="x" * (i + 1), source_path="d.md", chunk_index=i)
+        for i in range(3)
+    ]
+    store.add_chunks(chunks)
+    assert provider.documents == [["x", "xx", "xxx"]]
+    assert store.collection.metadata["embedding_model"] == "counting"
+
+    hits = store.search("xx", top_k=1)
+    assert provider.queries == [["xx"]]
+    assert hits[0]["chunk_id"] == "d_1"
+
+
+def test_vector_store_rejects_collection_from_another_model(tmp_path):
+    from backend.common.models import TextChunk
+
+    persist_dir = str(tmp_path / "chroma")
+    other = _CountingProvider()
+    other.name = "other"
+    VectorStore(persist_dir, embedding_provider=other)  # empty collection: any model may open it
+
+    store = VectorStore(persist_dir, embedding_provider=_CountingProvider())
+    store.add_chunks([TextChunk(chunk_id="d_0", doc_id="d", content="x", source_path="d.md", chunk_index=0)])
+
+    with pytest.raises(EmbeddingModelMismatchError):
+        VectorStore(persist_dir, embedding_provider=other)
+    assert VectorStore(persist_dir, embedding_provider=_CountingProvider()).collection.count() == 1
+
+
+def test_embedding_provider_is_abstract():
+    with pytest.raises(TypeError):
+        EmbeddingProvider()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from backend.graph import GraphStore
+
+
+def _doc_subgraph(doc_id: str, tool: str) -> nx.DiGraph:
+    G = nx.DiGraph()
+    G.add_node(f"doc:{doc_id}", type="DOCUMENT", title=doc_id)
+    G.add_node(f"tool:{tool.lower()}", type="TOOL", name=tool)
+    G.add_edge(f"doc:{doc_id}", f"tool:{tool.lower()}", type="MENTIONS")
+    return G
+
+
+def test_migrates_legacy_json_once(tmp_path: Path):
+    legacy = tmp_path / "knowledge_graph.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "nodes": {"doc:a": {"id": "doc:a", "type": "DOCUMENT"}, "tool:x": {"id": "tool:x", "type": "TOOL"}},
+                "edges": [{"source": "doc:a", "target": "tool:x", "type": "MENTIONS"}],
+                "graph": {"corpus_regime": "GENERIC_GUIDE"},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    store = GraphStore(str(legacy))
+    G = store.load()
+
+    assert store.path == tmp_path / "knowledge_graph.db"
+    assert not legacy.exists()
+    assert (tmp_path / "knowledge_graph.json.migrated").exists()
+    assert G.nodes["doc:a"]["type"] == "DOCUMENT"
+    assert G["doc:a"]["tool:x"]["type"] == "MENTIONS"
+    assert G.graph["corpus_regime"] == "GENERIC_GUIDE"
+    assert store.load_raw()["nodes"]["tool:x"] == {"id": "tool:x", "type": "TOOL"}
+
+
+def test_failed_legacy_import_is_retried(tmp_path: Path):
+    legacy = tmp_path / "knowledge_graph.json"
+    legacy.write_text('{"nodes": {', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        GraphStore(str(legacy))
+    assert legacy.exists()
+
+    legacy.write_text(json.dumps({"nodes": {"doc:a": {"id": "doc:a", "type": "DOCUMENT"}}, "edges": []}), encoding="utf-8")
+    store = GraphStore(str(legacy))
+    assert store.counts() == (1, 0)
+    assert not legacy.exists()
+
+
+def test_upsert_subgraph_merges_without_rewriting(tmp_path: Path):
+    store = GraphStore(str(tmp_path / "graph.db"))
+    store.upsert_subgraph(_doc_subgraph("a", "ToolX"))
+    generation = store.generation()
+
+    update = _doc_subgraph("b", "ToolX")
+    update.nodes["tool:toolx"]["owner"] = "ops"
+    store.upsert_subgraph(update)
+
+    G = store.load()
+    assert store.generation() == generation + 1
+    assert store.counts() == (3, 2)
+    assert G.nodes["tool:toolx"] == {"type": "TOOL", "name": "ToolX", "owner": "ops"}
+    assert list(G.nodes) == ["doc:a", "tool:toolx", "doc:b"]
+
+
+def test_delete_document_removes_only_orphaned_neighbours(tmp_path: Path):
+    store = GraphStore(str(tmp_path / "graph.db"))
+    store.upsert_subgraph(_doc_subgraph("a", "ToolX"))
+    store.upsert_subgraph(_doc_subgraph("b", "ToolX"))
+    store.upsert_subgraph(_doc_subgraph("b", "ToolY"))
+
+    assert store.delete_document("b") == 2  # doc:b and the now-isolated tool:tooly
+    G = store.load()
+    assert set(G.nodes) == {"doc:a", "tool:toolx"}
+
+    assert store.prune_orphans(active_doc_ids=[]) == 2
+    assert store.counts() == (0, 0)
+
+
+def test_set_graph_attr_and_full_save_round_trip(tmp_path: Path):
+    store = GraphStore(str(tmp_path / "graph.db"))
+    store.set_graph_attr("corpus_regime", "GOVERNING_DOC_LEGAL")
+    assert store.load().graph["corpus_regime"] == "GOVERNING_DOC_LEGAL"
+
+    G = _doc_subgraph("a", "ToolX")
+    G.graph["schema_version"] = "1.0"
+    store.save(G)
+    reloaded = GraphStore(str(tmp_path / "graph.db")).load()
+    assert nx.utils.graphs_equal(G, reloaded)
+
+
+def test_load_is_cached_until_the_database_changes(tmp_path: Path):
+    store = GraphStore(str(tmp_path / "graph.db"))
+    store.upsert_subgraph(_doc_subgraph("a", "ToolX"))
+
+    first = store.load()
+    assert GraphStore(str(tmp_path / "graph.db")).load() is first
+    assert nx.is_frozen(first)
+
+    # A write through another store instance (or process) bumps the generation
+    GraphStore(str(tmp_path / "graph.db")).upsert_subgraph(_doc_subgraph("b", "ToolY"))
+    second = store.load()
+    assert second is not first
+    assert "doc:b" in second and "doc:b" not in first
+
+
+def test_load_copy_is_mutable(tmp_path: Path):
+    store = GraphStore(str(tmp_path / "graph.db"))
+    store.upsert_subgraph(_doc_subgraph("a", "ToolX"))
+    store.set_graph_attr("corpus_regime", "GENERIC_GUIDE")
+
+    G = store.load_copy()
+    G.add_node("tool:extra", type="TOOL")
+    assert G.graph["corpus_regime"] == "GENERIC_GUIDE"
+    assert "tool:extra" not in store.load()
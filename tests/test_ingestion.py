@@ -14,3 +14,21 @@ def test_ingestion_creates_content_and_chunks():
     assert result.success
     assert Path(document.content_path).exists()
     assert result.data["chunk_count"] > 0
+
+
+def test_prepare_result_is_picklable_and_commits():
+    import pickle
+
+    cfg = load_config()
+    agent = IngestionAgent(cfg)
+    source = Path("tests/fixtures/simple/toolx_troubleshoot.md")
+
+    prepared, failure = agent.prepare({"path": str(source)})
+    assert failure is None
+    assert prepared.chunks and Path(prepared.staging_dir).exists()
+
+    result = agent.commit(pickle.loads(pickle.dumps(prepared)))
+    assert result.success
+    assert result.data["chunk_count"] == len(prepared.chunks)
+    assert Path(result.data["document"].content_path).exists()
+    assert not Path(prepared.staging_dir).exists()
@@ -0,0 +1,62 @@
+"""Unit tests for backend.ingestion.pipeline — bounded-queue stage pipeline."""
+
+import threading
+import time
+
+import pytest
+
+from backend.ingestion.pipeline import Stage, run_pipeline
+
+
+def test_outputs_keep_input_order_across_workers():
+    def jitter(x):
+        time.sleep(0.001 * (x % 3))
+        return x * 10
+
+    outputs, report = run_pipeline(range(20), [Stage("a", jitter, workers=3), Stage("b", lambda x: x + 1)])
+
+    assert outputs == [x * 10 + 1 for x in range(20)]
+    assert report["stages"]["a"]["items"] == 20
+    assert report["stages"]["b"]["items"] == 20
+    assert report["stages"]["a"]["workers"] == 3
+    for stats in report["stages"].values():
+        assert 0.0 <= stats["utilization"] <= 1.0
+
+
+def test_slow_stage_applies_backpressure():
+    produced = []
+    in_flight = []
+    lock = threading.Lock()
+
+    def fast(x):
+        with lock:
+            produced.append(x)
+        return x
+
+    def slow(x):
+        with lock:
+            in_flight.append(len(produced) - x)
+        time.sleep(0.005)
+        return x
+
+    run_pipeline(range(30), [Stage("fast", fast), Stage("slow", slow)], queue_size=2)
+
+    # The fast stage never gets more than the queue bound (+ one item in hand) ahead
+    assert max(in_flight) <= 2 + 2
+    assert len(produced) == 30
+
+
+def test_stage_error_is_raised():
+    def boom(x):
+        if x == 5:
+            raise ValueError("bad batch")
+        return x
+
+    with pytest.raises(ValueError, match="bad batch"):
+        run_pipeline(range(50), [Stage("boom", boom), Stage("next", lambda x: x)], queue_size=1)
+
+
+def test_no_stages_passes_items_through():
+    outputs, report = run_pipeline([1, 2, 3], [])
+    assert outputs == [1, 2, 3]
+    assert report["stages"] == {}
@@ -0,0 +1,74 @@
+"""Unit tests for backend.vector.lexical_index — persistent BM25 index."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from backend.vector.lexical_index import LexicalIndex, tokenize
+
+
+def _index(tmp_path: Path) -> LexicalIndex:
+    index = LexicalIndex(str(tmp_path / "lexical_index.db"))
+    index.upsert(
+        [
+            ("a_0", "doc_a", "TROUBLESHOOT", 0, "Upload fails with ERR-UPL-013 when the file is too large."),
+            ("a_1", "doc_a", "TROUBLESHOOT", 1, "Password reset fails with ERR-PWD-007."),
+            ("b_0", "doc_b", "GOVERNING_DOC", 0, "The Servicer shall remit the Monthly Advance to the Trustee."),
+            ("b_1", "doc_b", "GOVERNING_DOC", 1, "Upload the remittance report to the Trustee portal."),
+        ]
+    )
+    return index
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    assert tokenize("See ERR-UPL-013 now") == ["see", "err-upl-013", "err", "upl", "013", "now"]
+
+
+def test_exact_error_code_ranks_first(tmp_path: Path):
+    hits = _index(tmp_path).search("what does ERR-UPL-013 mean", top_k=3)
+    assert hits[0][0] == "a_0"
+    assert "a_1" not in [chunk_id for chunk_id, _ in hits[:1]]
+
+
+def test_defined_term_and_doc_type_filter(tmp_path: Path):
+    index = _index(tmp_path)
+    assert index.search("Monthly Advance")[0][0] == "b_0"
+    assert {c for c, _ in index.search("upload", doc_type_filter="GOVERNING_DOC")} == {"b_1"}
+
+
+def test_reupsert_and_delete(tmp_path: Path):
+    index = _index(tmp_path)
+    index.upsert([("a_0", "doc_a", "TROUBLESHOOT", 0, "Nothing to see here.")])
+    assert "a_0" not in {c for c, _ in index.search("ERR-UPL-013")}
+
+    index.delete_document("doc_b")
+    assert len(index) == 2
+    assert index.search("Trustee") == []
+
+    index.delete_ids(["a_1"])
+    assert len(index) == 1
+
+
+def test_set_doc_type(tmp_path: Path):
+    index = _index(tmp_path)
+    index.set_doc_type("doc_a", "SOP")
+    assert {c for c, _ in index.search("fails", doc_type_filter="SOP")} == {"a_0", "a_1"}
+
+
+def test_chunk_ids_in_ranges(tmp_path: Path):
+    index = _index(tmp_path)
+    index.upsert([("a_2", "doc_a", "TROUBLESHOOT", 2, "Contact support.")])
+    located = index.chunk_ids_in_ranges([("doc_a", -1, 1), ("doc_a", 1, 2), ("doc_b", 1, 1), ("doc_x", 0, 5)])
+    assert located == [("a_0", "doc_a", 0), ("a_1", "doc_a", 1), ("a_2", "doc_a", 2), ("b_1", "doc_b", 1)]
+
+
+def test_generation_bumps_on_every_write(tmp_path: Path):
+    index = _index(tmp_path)
+    start = index.generation()
+    assert start >= 1
+    index.set_doc_type("doc_a", "SOP")
+    index.delete_ids(["a_1"])
+    index.delete_document("doc_b")
+    index.bump_generation()
+    assert index.generation() == start + 4
+    assert LexicalIndex(str(tmp_path / "lexical_index.db")).generation() == start + 4
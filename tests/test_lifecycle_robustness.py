@@ -9,8 +9,9 @@ import pytest
 from config import AppConfig
 from backend.agents.crawler_agent import CrawlerAgent
 from backend.agents.ingestion_agent import IngestionAgent
+from backend.common.hashing import sha256_text
 from backend.common.manifest import ManifestStore
-from backend.common.models import FileInfo
+from backend.common.models import FileInfo, TextChunk
 from backend.vector.store import VectorStore
 
 
@@ -25,6 +26,7 @@ def create_mock_config(tmp_path):
     config.knowledge_base_path = str(kb)
     config.manifest_path = str(manifest_path)
     config.chroma_persist_dir = str(chroma_dir)
+    config.ner_cache_path = str(kb / "cache" / "ner_cache.db")
     config.source_paths = [] 
     config.supported_extensions = {".txt", ".md"}
     config.chunk_size = 100
@@ -148,6 +150,97 @@ def test_ingestion_shrinking_file(tmp_path):
     for c in current_chunks:
         assert "short content" in c["content"].lower()
 
+def test_sync_doc_chunks_only_embeds_changed_content(tmp_path):
+    config = create_mock_config(tmp_path)
+    vector_store = VectorStore(config.chroma_persist_dir)
+
+    def chunks(*texts):
+        return [
+            TextChunk(chunk_id=f"doc_sync_chunk_{i}", doc_id="doc_sync", content=t, source_path="sync.txt", chunk_index=i)
+            for i, t in enumerate(texts)
+        ]
+
+    first = vector_store.sync_doc_chunks("doc_sync", chunks("alpha", "beta", "gamma"))
+    assert first == {"unchanged": 0, "reused": 0, "embedded": 3, "deleted": 0}
+
+    # Insert a paragraph at the front: old content shifts to new ids
+    second = vector_store.sync_doc_chunks("doc_sync", chunks("new intro", "alpha", "beta"))
+    assert second == {"unchanged": 0, "reused": 2, "embedded": 1, "deleted": 0}
+
+    # Drop the tail; the rest is untouched
+    third = vector_store.sync_doc_chunks("doc_sync", chunks("new intro", "alpha"))
+    assert third == {"unchanged": 2, "reused": 0, "embedded": 0, "deleted": 1}
+
+    rows = sorted((c for c in vector_store._load() if c["doc_id"] == "doc_sync"), key=lambda c: c["chunk_index"])
+    assert [c["content"] for c in rows] == ["new intro", "alpha"]
+
+
+def test_sync_doc_chunks_uses_precomputed_embeddings(tmp_path):
+    config = create_mock_config(tmp_path)
+    vector_store = VectorStore(config.chroma_persist_dir)
+    calls = []
+    embed = vector_store.ef
+
+    def counting_ef(texts):
+        calls.append(list(texts))
+        return embed(texts)
+
+    vector_store.ef = counting_ef
+    chunks = [
+        TextChunk(chunk_id=f"doc_pre_chunk_{i}", doc_id="doc_pre", content=t, source_path="pre.txt", chunk_index=i)
+        for i, t in enumerate(["alpha", "beta", "alpha"])
+    ]
+    stats = vector_store.sync_doc_chunks("doc_pre", chunks, embeddings={sha256_text("alpha"): embed(["alpha"])[0]})
+
+    assert stats["embedded"] == 3
+    assert calls == [["beta"]]  # duplicate and precomputed content is not re-embedded
+    assert vector_store.content_hashes("doc_pre") == {sha256_text("alpha"), sha256_text("beta")}
+
+
+def test_prepare_embeds_only_new_content_through_pipeline(tmp_path):
+    config = create_mock_config(tmp_path)
+    config.ner_enabled = False
+    config.regime_classifier_enabled = False
+    config.ingest_pipeline_enabled = True
+    config.ingest_pipeline_batch_size = 2
+    config.ingest_pipeline_queue_size = 2
+    source = tmp_path / "pipeline.txt"
+    source.write_text(" ".join(f"word{i}" for i in range(120)), encoding="utf-8")
+
+    agent = IngestionAgent(config)
+    prepared, failure = agent.prepare({"path": str(source), "doc_id": "doc_pipe", "embed": True})
+    assert failure is None
+    assert set(prepared.embeddings) == {sha256_text(c.content) for c in prepared.chunks}
+    assert prepared.pipeline["stages"]["embed"]["items"] == (len(prepared.chunks) + 1) // 2
+
+    agent.vector_store.sync_doc_chunks("doc_pipe", prepared.chunks, embeddings=prepared.embeddings)
+    again, _ = agent.prepare({"path": str(source), "doc_id": "doc_pipe", "embed": True})
+    assert again.embeddings == {}
+
+    # Pool workers (no ``embed``) never touch the vector store
+    worker_prepared, _ = agent.prepare({"path": str(source), "doc_id": "doc_pipe"})
+    assert worker_prepared.embeddings == {} and worker_prepared.pipeline == {}
+
+
+def test_vector_store_opens_once_across_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    config = create_mock_config(tmp_path)
+    agent = IngestionAgent(config)
+    opened = []
+
+    def slow_store(*args, **kwargs):
+        time.sleep(0.05)
+        opened.append(object())
+        return opened[-1]
+
+    with patch("backend.agents.ingestion_agent.VectorStore", side_effect=slow_store):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            stores = list(pool.map(lambda _: agent.vector_store, range(4)))
+
+    assert len(opened) == 1
+    assert all(store is opened[0] for store in stores)
+
 def test_vacuum_logic(tmp_path):
     config = create_mock_config(tmp_path)
     manifest = ManifestStore(config.manifest_path)
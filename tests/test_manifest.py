@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from backend.common.manifest import ManifestStore
+from backend.common.models import FileInfo
+
+
+def _info(path: str, digest: str = "h", doc_id: str | None = None) -> FileInfo:
+    return FileInfo(
+        path=path,
+        filename=os.path.basename(path),
+        extension=os.path.splitext(path)[1],
+        size_bytes=1,
+        modified_time="now",
+        hash=digest,
+        doc_id=doc_id,
+    )
+
+
+def test_migrates_legacy_json_once(tmp_path: Path):
+    legacy = tmp_path / "manifest.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "files": {
+                    "/src/a.md": {"path": "/src/a.md", "hash": "ha", "doc_id": "doc_1", "status": "active"},
+                    "/src/b.md": {"path": "/src/b.md", "hash": "hb", "doc_id": None, "status": "active"},
+                },
+                "updated_at": "2025-01-01T00:00:00+00:00",
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    store = ManifestStore(str(legacy))
+    assert store.path == tmp_path / "manifest.db"
+    assert not legacy.exists()
+    assert (tmp_path / "manifest.json.migrated").exists()
+    data = store.load()
+    assert list(data["files"]) == ["/src/a.md", "/src/b.md"]
+    assert data["files"]["/src/a.md"] == {"path": "/src/a.md", "hash": "ha", "doc_id": "doc_1", "status": "active"}
+    assert store.pending_paths() == ["/src/b.md"]
+
+    # Reopening does not import again
+    legacy.write_text(json.dumps({"files": {}}), encoding="utf-8")
+    assert ManifestStore(str(legacy)).count() == 2
+
+
+def test_failed_legacy_import_is_retried(tmp_path: Path):
+    legacy = tmp_path / "manifest.json"
+    legacy.write_text('{"files": {', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        ManifestStore(str(legacy))
+    assert legacy.exists()
+
+    legacy.write_text(json.dumps({"files": {"/src/a.md": {"path": "/src/a.md", "hash": "ha"}}}), encoding="utf-8")
+    store = ManifestStore(str(legacy))
+    assert store.count() == 1
+    assert not legacy.exists()
+
+
+def test_update_file_touches_one_row(tmp_path: Path):
+    store = ManifestStore(str(tmp_path / "manifest.db"))
+    store.upsert_files([_info("/src/a.md"), _info("/src/b.md")])
+
+    assert store.update_file("/src/a.md", doc_id="doc_a", status="active")
+    assert not store.update_file("/src/missing.md", doc_id="x")
+    assert store.get("/src/a.md")["doc_id"] == "doc_a"
+    assert store.get("/src/b.md")["doc_id"] is None
+    assert store.get("/src/missing.md") is None
+    assert store.pending_paths() == ["/src/b.md"]
+
+    # Indexed columns follow the JSON payload
+    with sqlite3.connect(str(store.path)) as conn:
+        assert conn.execute("SELECT path FROM files WHERE doc_id = 'doc_a'").fetchall() == [("/src/a.md",)]
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_apply_changes_upserts_and_removes_together(tmp_path: Path):
+    store = ManifestStore(str(tmp_path / "manifest.db"))
+    store.upsert_files([_info(f"/src/{i}.md") for i in range(1200)])
+    updated_at = store.load()["updated_at"]
+
+    store.apply_changes([_info("/src/0.md", digest="new"), _info("/src/new.md")], [f"/src/{i}.md" for i in range(1, 1200)])
+    data = store.load()
+    assert sorted(data["files"]) == ["/src/0.md", "/src/new.md"]
+    assert data["files"]["/src/0.md"]["hash"] == "new"
+    assert data["updated_at"] >= updated_at
+
+
+def test_lookups_by_path_and_subtree(tmp_path: Path):
+    sep = os.sep
+    paths = [f"{sep}src{sep}a.md", f"{sep}src{sep}sub{sep}b.md", f"{sep}src-other{sep}c.md", f"{sep}srcx.md"]
+    store = ManifestStore(str(tmp_path / "manifest.db"))
+    store.upsert_files([_info(p) for p in paths])
+
+    assert sorted(store.get_many([paths[0], paths[2], f"{sep}nope.md"])) == sorted([paths[0], paths[2]])
+    assert sorted(store.load_under([f"{sep}src"])) == paths[:2]
+    assert list(store.load_under([paths[1]])) == [paths[1]]
+    assert store.count() == 4
@@ -0,0 +1,114 @@
+"""Unit tests for backend.ingestion.ner_cache — persistent NER result cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import backend.ingestion.ner_extractor as ner_mod
+from backend.ingestion.ner_cache import NERCache
+from backend.ingestion.ner_extractor import (
+    ExtractedEntity,
+    ExtractedKeyphrase,
+    NERResult,
+    extract_entities_and_keyphrases,
+    extract_entities_and_keyphrases_batch,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_singleton():
+    ner_mod._nlp = None
+    yield
+    ner_mod._nlp = None
+
+
+def _result(name: str) -> NERResult:
+    return NERResult(
+        entities=[ExtractedEntity(text=name, label="ORG", start_char=0, end_char=len(name))],
+        keyphrases=[ExtractedKeyphrase(text=f"{name.lower()} duties", score=1.0, count=2)],
+    )
+
+
+def _mock_nlp(version: str = "3.8.0"):
+    def fake_doc(text):
+        first = text.split()[0]
+        ent = SimpleNamespace(text=first, label_="ORG", start_char=0, end_char=len(first))
+        tokens = [SimpleNamespace(text=w, is_stop=False, is_punct=False) for w in text.split()[:2]]
+        return SimpleNamespace(ents=[ent], noun_chunks=[tokens])
+
+    nlp = MagicMock()
+    nlp.meta = {"lang": "en", "name": "core_web_sm", "version": version}
+    nlp.pipe_names = ["tok2vec", "tagger", "parser", "ner"]
+    nlp.pipe.side_effect = lambda texts, **kwargs: (fake_doc(t) for t in texts)
+    return nlp
+
+
+def test_round_trip(tmp_path: Path):
+    cache = NERCache(str(tmp_path / "ner.db"))
+    key = NERCache.key("Trustee shall act", "en_core_web_sm-3.8.0")
+    cache.put_many({key: _result("Trustee")})
+
+    reopened = NERCache(str(tmp_path / "ner.db"))
+    assert reopened.get_many([key, "missing"]) == {key: _result("Trustee")}
+
+
+def test_key_depends_on_model_and_params():
+    base = NERCache.key("text", "model-a", "100:2:5")
+    assert base == NERCache.key("text", "model-a", "100:2:5")
+    assert base != NERCache.key("text", "model-b", "100:2:5")
+    assert base != NERCache.key("text", "model-a", "100:2:30")
+    assert base != NERCache.key("text!", "model-a", "100:2:5")
+
+
+def test_evicts_least_recently_used(tmp_path: Path):
+    cache = NERCache(str(tmp_path / "ner.db"), max_entries=2)
+    cache.put_many({"a": _result("A")})
+    cache.put_many({"b": _result("B")})
+    cache.get_many(["a"])  # "b" is now the least recently used
+    cache.put_many({"c": _result("C")})
+
+    assert len(cache) == 2
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_batch_only_runs_spacy_on_uncached_texts(tmp_path: Path):
+    cache = NERCache(str(tmp_path / "ner.db"))
+    nlp = _mock_nlp()
+    ner_mod._nlp = nlp
+
+    first = extract_entities_and_keyphrases_batch(["Trustee shall act", "Servicer must remit"], cache=cache)
+    second = extract_entities_and_keyphrases_batch(
+        ["Trustee shall act", "Depositor sells loans", "Servicer must remit"], cache=cache
+    )
+
+    assert nlp.pipe.call_count == 2
+    assert nlp.pipe.call_args.args[0] == ["Depositor sells loans"]
+    assert [r.entities[0].text for r in second] == ["Trustee", "Depositor", "Servicer"]
+    assert second[0] == first[0] and second[2] == first[1]
+
+
+def test_model_change_misses_cache(tmp_path: Path):
+    cache = NERCache(str(tmp_path / "ner.db"))
+    ner_mod._nlp = _mock_nlp("3.7.0")
+    extract_entities_and_keyphrases_batch(["Trustee shall act"], cache=cache)
+
+    nlp = _mock_nlp("3.8.0")
+    ner_mod._nlp = nlp
+    extract_entities_and_keyphrases_batch(["Trustee shall act"], cache=cache)
+    assert nlp.pipe.call_count == 1
+
+
+def test_single_call_uses_cache(tmp_path: Path):
+    cache = NERCache(str(tmp_path / "ner.db"))
+    nlp = _mock_nlp()
+    ner_mod._nlp = nlp
+
+    first = extract_entities_and_keyphrases("Trustee shall act", cache=cache)
+    second = extract_entities_and_keyphrases("Trustee shall act", cache=cache)
+
+    assert nlp.pipe.call_count == 1
+    assert first == second and first.entities[0].text == "Trustee"
@@ -24,6 +24,7 @@ from backend.ingestion.ner_extractor import (
     _dedupe_entities,
     _rank_noun_chunks,
     extract_entities_and_keyphrases,
+    extract_entities_and_keyphrases_batch,
 )
 
 
@@ -127,6 +128,59 @@ class TestGracefulDegradation:
         assert result.keyphrases == []
 
 
+# ---------------------------------------------------------------------------
+# Batch API with a mocked spaCy pipeline
+# ---------------------------------------------------------------------------
+
+def _fake_doc(text: str):
+    """Minimal stand-in for a spaCy Doc: one ORG entity + one noun chunk."""
+    from types import SimpleNamespace
+
+    ent = SimpleNamespace(text=text.split()[0], label_="ORG", start_char=0, end_char=len(text.split()[0]))
+    tokens = [SimpleNamespace(text=w, is_stop=False, is_punct=False) for w in text.split()[:2]]
+    return SimpleNamespace(ents=[ent], noun_chunks=[tokens])
+
+
+class TestBatchExtraction:
+    def _mock_nlp(self):
+        nlp = MagicMock()
+        nlp.pipe_names = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+        nlp.pipe.side_effect = lambda texts, **kwargs: (_fake_doc(t) for t in texts)
+        return nlp
+
+    def test_results_in_input_order(self):
+        ner_mod._nlp = self._mock_nlp()
+        results = extract_entities_and_keyphrases_batch(["Trustee shall act", "Servicer must remit", "Depositor sells loans"])
+        assert [r.entities[0].text for r in results] == ["Trustee", "Servicer", "Depositor"]
+        assert [r.keyphrases[0].text for r in results] == ["trustee shall", "servicer must", "depositor sells"]
+
+    def test_disables_unneeded_components_and_passes_batching(self):
+        nlp = self._mock_nlp()
+        ner_mod._nlp = nlp
+        extract_entities_and_keyphrases_batch(["Trustee shall act"], batch_size=8, n_process=1, max_text_chars=7)
+        args, kwargs = nlp.pipe.call_args
+        assert list(args[0]) == ["Trustee"]
+        assert kwargs["disable"] == ["lemmatizer"]
+        assert kwargs["batch_size"] == 8
+        assert kwargs["n_process"] == 1
+
+    def test_empty_input(self):
+        assert extract_entities_and_keyphrases_batch([]) == []
+
+    def test_no_model_returns_one_empty_result_per_text(self):
+        with patch.dict(os.environ, {}, clear=True):
+            results = extract_entities_and_keyphrases_batch(["a b", "c d"])
+        assert len(results) == 2
+        assert all(r.entities == [] and r.keyphrases == [] for r in results)
+
+    def test_pipe_failure_degrades_gracefully(self):
+        nlp = self._mock_nlp()
+        nlp.pipe.side_effect = RuntimeError("boom")
+        ner_mod._nlp = nlp
+        results = extract_entities_and_keyphrases_batch(["a b"])
+        assert len(results) == 1 and results[0].entities == []
+
+
 # ---------------------------------------------------------------------------
 # With spaCy model (skipped if en_core_web_sm not installed)
 # ---------------------------------------------------------------------------
@@ -220,3 +274,11 @@ class TestWithSpacyModel:
         for ent in result.entities:
             assert ent.start_char >= 0
             assert ent.end_char > ent.start_char
+
+    def test_batch_matches_single_call(self):
+        texts = [PSA_EXCERPT[:400], PSA_EXCERPT[400:900]]
+        batch = extract_entities_and_keyphrases_batch(texts, model_path="en_core_web_sm", batch_size=2)
+        for text, result in zip(texts, batch):
+            single = extract_entities_and_keyphrases(text, model_path="en_core_web_sm")
+            assert [(e.text, e.label) for e in result.entities] == [(e.text, e.label) for e in single.entities]
+            assert [k.text for k in result.keyphrases] == [k.text for k in single.keyphrases]
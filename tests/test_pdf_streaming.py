@@ -0,0 +1,176 @@
+"""Tests for page-streamed PDF conversion and chunking."""
+
+from pathlib import Path
+
+import pytest
+
+from backend.vector import chunk_document, chunk_pages
+from backend.vector.legal_chunker import chunk_legal_document, chunk_legal_pages
+
+
+def _pages(count: int) -> list[tuple[int, str]]:
+    return [
+        (number, " ".join(f"Page {number} sentence {i} about servicer advances." for i in range(40 + number % 7)))
+        for number in range(1, count + 1)
+    ]
+
+
+def _make_pdf(path: Path, texts: list[str]) -> None:
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    for text in texts:
+        page = doc.new_page()
+        if text:
+            page.insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_chunk_pages_matches_whole_text_chunking():
+    pages = _pages(60)
+    whole = chunk_document("doc_1", "a.pdf", "\n\n".join(text for _, text in pages), chunk_size=800, chunk_overlap=100)
+    streamed = list(chunk_pages("doc_1", "a.pdf", iter(pages), chunk_size=800, chunk_overlap=100, window_chars=5000))
+
+    assert [c.content for c in streamed] == [c.content for c in whole]
+    assert [c.chunk_index for c in streamed] == list(range(len(whole)))
+    assert [c.chunk_id for c in streamed] == [c.chunk_id for c in whole]
+
+
+def test_chunk_pages_records_source_pages():
+    pages = _pages(30)
+    by_number = dict(pages)
+    chunks = list(chunk_pages("doc_1", "a.pdf", pages, chunk_size=500, chunk_overlap=0, window_chars=2000))
+
+    assert chunks[0].page == 1
+    assert chunks[-1].page_end == 30
+    for chunk in chunks:
+        assert chunk.page <= chunk.page_end
+        body = chunk.content.split("\n", 1)[1]  # drop the [EVIDENCE] header line
+        head = body.split("\n\n")[0]
+        assert head in by_number[chunk.page]
+
+
+def _legal_pages() -> list[tuple[int, str]]:
+    body = " ".join(["The Servicer shall make Advances to the Trustee on each Distribution Date."] * 12)
+    pages, number = [], 1
+    for article, roman in enumerate(["I", "II", "III"], start=1):
+        lines = [f"ARTICLE {roman}\nPROVISIONS {article}"]
+        for section in range(1, 5):
+            lines.append(f"Section {article}.{section:02d} Heading.")
+            lines.append("(a) " + body[: 80 * section])
+            lines.append(body * (section % 3))
+            if section % 2 == 0:  # the next heading opens a new page
+                pages.append((number, "\n".join(lines)))
+                number, lines = number + 1, []
+        if lines:
+            pages.append((number, "\n".join(lines)))
+            number += 1
+    return [(1, "Preamble\nTABLE OF CONTENTS")] + [(n + 1, text) for n, text in pages]
+
+
+def test_chunk_legal_pages_matches_whole_text_legal_chunking():
+    pages = _legal_pages()
+    reads = []
+
+    def read_pages():
+        reads.append(1)
+        return iter(pages)
+
+    whole = chunk_legal_document("doc_1", "psa.pdf", "\n\n".join(text for _, text in pages))
+    streamed = list(chunk_legal_pages("doc_1", "psa.pdf", read_pages))
+
+    assert len(reads) == 2
+    assert [c.content for c in streamed] == [c.content for c in whole]
+    assert [c.chunk_id for c in streamed] == [c.chunk_id for c in whole]
+    assert streamed[0].page == 2 and streamed[-1].page_end == pages[-1][0]
+    assert all(c.page <= c.page_end for c in streamed)
+
+
+def test_chunk_legal_pages_without_headings_falls_back_to_page_chunks():
+    pages = _pages(10)
+    whole = chunk_legal_document("doc_1", "a.pdf", "\n\n".join(text for _, text in pages))
+    streamed = list(chunk_legal_pages("doc_1", "a.pdf", lambda: iter(pages)))
+    assert [c.content for c in streamed] == [c.content for c in whole]
+
+
+def test_iter_pdf_pages_yields_numbered_pages(tmp_path: Path):
+    from backend.ingestion import convert_pdf, iter_pdf_pages
+
+    source = tmp_path / "doc.pdf"
+    _make_pdf(source, ["First page text", "", "Third page text"])
+
+    pages = list(iter_pdf_pages(str(source)))
+    assert [p.number for p in pages] == [1, 2, 3]
+    assert "First page" in pages[0].text and not pages[1].text.strip()
+
+    text, images = convert_pdf(str(source))
+    assert text == "\n".join(p.text for p in pages)
+    assert images == []
+
+
+def test_prepare_streams_pdf_into_content_and_paged_chunks(tmp_path: Path):
+    from config import load_config
+    from backend.agents import IngestionAgent
+
+    source = tmp_path / "report.pdf"
+    _make_pdf(source, [f"Report page {n} discusses the waterfall." for n in range(1, 6)] + [""])
+
+    cfg = load_config()
+    cfg.knowledge_base_path = str(tmp_path / "kb")
+    cfg.chunk_size = 60
+    cfg.chunk_overlap = 0
+    prepared, failure = IngestionAgent(cfg).prepare({"path": str(source)})
+
+    assert failure is None
+    assert prepared.streamed
+    content = (Path(prepared.staging_dir) / "content.md").read_text(encoding="utf-8")
+    assert content.split("\n\n") == [f"Report page {n} discusses the waterfall." for n in range(1, 6)]
+    assert prepared.metadata["word_count"] == 30
+    assert [(c.page, c.page_end) for c in prepared.chunks] == [(n, n) for n in range(1, 6)]
+
+
+def test_iter_text_windows_overlap_covers_boundaries():
+    from backend.common.text_utils import PAGE_SEPARATOR, iter_text_windows
+
+    pages = [(n, "\n".join(f"Page {n} line {i} ToolX" for i in range(20))) for n in range(1, 41)]
+    full = PAGE_SEPARATOR.join(text for _, text in pages)
+    windows = list(iter_text_windows(pages, window_chars=3000, overlap_chars=200))
+
+    assert len(windows) > 1
+    assert all(window in full for window in windows)
+    assert windows[0].startswith(pages[0][1][:20]) and windows[-1].endswith(pages[-1][1])
+    for previous, current in zip(windows, windows[1:]):
+        head = current.split("\n", 1)[0]
+        assert head in previous[-200:]  # each window starts inside the previous one's tail, on a line start
+
+
+def test_streamed_document_consumers_read_past_the_sample(tmp_path: Path):
+    from config import load_config
+    from backend.agents import TaxonomyAgent
+    from backend.common.models import IngestedDocument
+    from backend.common.text_utils import PAGE_SEPARATOR, find_keywords, iter_document_text
+    from backend.graph.builder import GraphBuilder
+    from backend.graph.persistence import GraphStore
+
+    pages = _pages(40) + [(41, '"Late Advance" means an advance made after the Determination Date.\nToolZ handles onboarding; troubleshoot login errors here.')]
+    content = tmp_path / "content.md"
+    content.write_text(PAGE_SEPARATOR.join(text for _, text in pages), encoding="utf-8")
+    doc = IngestedDocument(
+        doc_id="doc_1", title="psa", source_path="psa.pdf", extension=".pdf",
+        content_path=str(content), metadata_path=str(tmp_path / "metadata.json"), images_dir=str(tmp_path),
+        extracted_text=pages[0][1], extracted_text_truncated=True,
+        page_spans=[(number, len(text)) for number, text in pages],
+    )
+
+    assert "".join(iter_document_text(doc)).endswith("errors here.")
+    assert find_keywords(iter_document_text(doc), ["toolz", "onboarding", "deployment"]) == {"toolz", "onboarding"}
+    assert find_keywords([doc.extracted_text], ["toolz"]) == set()
+
+    subgraph = GraphBuilder(GraphStore(str(tmp_path / "graph.db"))).upsert_document(doc, {"title": "psa"})
+    assert "defterm:late_advance" in subgraph
+
+    taxonomy = TaxonomyAgent(load_config())
+    streamed = taxonomy.execute({"texts": iter_document_text(doc), "filename": "psa.pdf"}).data
+    whole = taxonomy.execute({"text": content.read_text(encoding="utf-8"), "filename": "psa.pdf"}).data
+    sample = taxonomy.execute({"text": doc.extracted_text, "filename": "psa.pdf"}).data
+    assert streamed == whole and streamed != sample
@@ -0,0 +1,38 @@
+"""Unit tests for backend.retrieval.query_cache."""
+
+from __future__ import annotations
+
+from backend.retrieval.query_cache import QueryResultCache, make_key, normalize_query
+
+
+def test_key_ignores_whitespace_but_not_case_options_or_generation():
+    base = make_key("Reset  Password ", {"max_results": 5}, "cfg", (1, 2))
+    assert base == make_key("Reset Password", {"max_results": 5}, "cfg", (1, 2))
+    assert base != make_key("reset password", {"max_results": 5}, "cfg", (1, 2))
+    assert base != make_key("Reset Password", {"max_results": 6}, "cfg", (1, 2))
+    assert base != make_key("Reset Password", {"max_results": 5}, "cfg2", (1, 2))
+    assert base != make_key("Reset Password", {"max_results": 5}, "cfg", (2, 2))
+    assert normalize_query("  PSA\tduties ") == "PSA duties"
+
+
+def test_lru_eviction_and_counters():
+    cache = QueryResultCache(max_entries=2, ttl_seconds=0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats() == {"entries": 2, "hits": 2, "misses": 1, "evictions": 1}
+
+
+def test_ttl_expiry(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("backend.retrieval.query_cache.time.monotonic", lambda: clock[0])
+    cache = QueryResultCache(max_entries=4, ttl_seconds=10)
+    cache.put("q", "result")
+    clock[0] += 5
+    assert cache.get("q") == "result"
+    clock[0] += 11
+    assert cache.get("q") is None
+    assert len(cache) == 0
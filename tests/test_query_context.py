@@ -0,0 +1,49 @@
+from backend.retrieval.query_context import (
+    QueryContext,
+    extract_error_codes,
+    has_legal_term,
+    normalize_entity,
+    query_terms,
+)
+
+
+def _ctx(intent="troubleshooting", expected=("TROUBLESHOOT", "SOP"), enabled=True):
+    return QueryContext(
+        query="q",
+        query_lower="q",
+        error_codes=set(),
+        intent=intent,
+        expected_doc_types=list(expected),
+        intent_enabled=enabled,
+    )
+
+
+def test_extract_error_codes_upper_cases_all_patterns():
+    assert extract_error_codes("saw err-upl-013 then HTTP 504 and auth401") == ["ERR-UPL-013", "HTTP 504", "AUTH401"]
+
+
+def test_query_terms_drop_stopwords_and_short_words():
+    terms = query_terms("how to reset the password for toolx")
+    assert terms == ["how", "reset", "password", "toolx"]
+
+
+def test_intent_match_is_rank_weighted_and_boosted_for_high_confidence():
+    ctx = _ctx()
+    assert ctx.intent_match("TROUBLESHOOT") == 1.0
+    assert ctx.intent_match("SOP") == 0.5
+    assert ctx.intent_match("USER_GUIDE") == 0.0
+    assert _ctx("reference_catalog", ("REFERENCE",)).intent_match("REFERENCE") == 1.5
+    assert _ctx(enabled=False).intent_match("TROUBLESHOOT") == 0.0
+
+
+def test_top_terms_and_legal_terms():
+    ctx = _ctx()
+    ctx.terms = ["a1", "a2", "a3", "a4", "a5", "a6"]
+    assert ctx.top_terms == ["a1", "a2", "a3", "a4", "a5"]
+    assert has_legal_term("who is the trustee")
+    assert not has_legal_term("trustees list")
+
+
+def test_normalize_entity():
+    assert normalize_entity("The Master Servicer's") == "master servicer"
+    assert normalize_entity("Holders'") == "holder"
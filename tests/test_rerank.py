@@ -0,0 +1,122 @@
+import math
+import random
+
+from backend.retrieval.query_context import QueryContext
+from backend.retrieval.rerank import rerank_rows, select_for_cross_encoder
+
+
+def _ctx(intent="general", legal=False):
+    return QueryContext(
+        query="q",
+        query_lower="q",
+        error_codes=set(),
+        intent=intent,
+        expected_doc_types=[],
+        legal_term_hit=legal,
+    )
+
+
+def _scalar_score(row, feats, graph_boost, ctx):
+    """Row-at-a-time formula the vectorised scorer must reproduce."""
+    score = float(row.get("score", 0.0)) * (1.0 + graph_boost)
+    ce = row.get("cross_encoder_score")
+    if ce is not None:
+        score = 0.6 * (1.0 / (1.0 + math.exp(-ce))) + 0.4 * score
+    if feats["error_code_exact_match"] > 0:
+        score *= 1.5
+    if feats["intent_doc_type_match"] > 0:
+        score *= 1.0 + feats["intent_doc_type_match"]
+    if feats["entity_overlap"] > 0:
+        score *= 1.0 + 0.5 * feats["entity_overlap"]
+    if feats["entity_keyphrase_match"] > 0:
+        score *= 1.0 + 0.3 * feats["entity_keyphrase_match"]
+    if ctx.intent == "file_capability" and row.get("doc_type") == "TROUBLESHOOT":
+        score *= 0.6
+    if row.get("doc_type") == "GOVERNING_DOC" and ctx.legal_term_hit:
+        score *= 1.3
+    return score
+
+
+def _candidates(n, seed, with_ce):
+    rnd = random.Random(seed)
+    rows, features, boosts = [], [], []
+    for i in range(n):
+        row = {
+            "chunk_id": f"c{i}",
+            "doc_type": rnd.choice(["TROUBLESHOOT", "SOP", "USER_GUIDE", "GOVERNING_DOC"]),
+            # Coarse scores so some candidates tie
+            "score": rnd.choice([0.2, 0.4, 0.5, 0.75]),
+        }
+        if with_ce and rnd.random() < 0.8:
+            row["cross_encoder_score"] = rnd.uniform(-8, 8)
+        rows.append(row)
+        features.append({
+            "error_code_exact_match": rnd.choice([0.0, 1.0]),
+            "intent_doc_type_match": rnd.choice([0.0, 0.5, 1.0, 1.5]),
+            "entity_overlap": rnd.choice([0.0, rnd.random()]),
+            "entity_keyphrase_match": rnd.choice([0.0, rnd.random()]),
+        })
+        boosts.append(rnd.choice([0.0, 0.1, 0.35]))
+    return rows, features, boosts
+
+
+def test_rerank_rows_matches_scalar_formula_and_order():
+    for seed, ctx, with_ce in [
+        (1, _ctx(), False),
+        (2, _ctx("file_capability"), True),
+        (3, _ctx("governing_doc", legal=True), True),
+    ]:
+        rows, features, boosts = _candidates(300, seed, with_ce)
+        expected = [_scalar_score(r, f, g, ctx) for r, f, g in zip(rows, features, boosts)]
+        # Cross-encoder-scored rows rank ahead of unscored ones
+        expected_order = [
+            r["chunk_id"]
+            for _, r in sorted(
+                zip(expected, rows), key=lambda p: ("cross_encoder_score" in p[1], p[0]), reverse=True
+            )
+        ]
+
+        ranked = rerank_rows(list(rows), features, boosts, ctx)
+
+        assert [r["chunk_id"] for r in ranked] == expected_order
+        for row, score in zip(rows, expected):
+            assert math.isclose(row["_rerank_score"], score, rel_tol=1e-12)
+            assert isinstance(row["_rerank_score"], float)
+
+
+def test_rerank_rows_ranks_cascade_scored_rows_first():
+    # Cheap top-2 went through the cross-encoder; the rest were never scored
+    rows = [{"chunk_id": f"r{i}", "score": s} for i, s in enumerate([0.80, 0.75, 0.50, 0.45])]
+    rows[0]["cross_encoder_score"] = -2.0
+    rows[1]["cross_encoder_score"] = 1.0
+    features = [
+        {"error_code_exact_match": 0.0, "intent_doc_type_match": 0.0, "entity_overlap": 0.0, "entity_keyphrase_match": 0.0}
+        for _ in rows
+    ]
+
+    ranked = rerank_rows(list(rows), features, [0.0] * 4, _ctx())
+
+    assert [r["chunk_id"] for r in ranked] == ["r1", "r0", "r2", "r3"]
+    assert rows[2]["_rerank_score"] == 0.5  # unscored rows keep the cheap score
+
+
+def test_rerank_rows_empty():
+    assert rerank_rows([], [], [], _ctx()) == []
+
+
+def test_select_for_cross_encoder_takes_cheap_top_k_and_skips_neighbours():
+    ctx = _ctx()
+    rows = [
+        {"chunk_id": "a", "score": 0.5, "doc_type": "SOP"},
+        {"chunk_id": "b", "score": 0.9, "doc_type": "SOP", "_is_expanded": True},
+        {"chunk_id": "c", "score": 0.4, "doc_type": "SOP"},
+        {"chunk_id": "d", "score": 0.3, "doc_type": "SOP", "cross_encoder_score": 9.0},
+    ]
+    feats = [dict.fromkeys(("error_code_exact_match", "intent_doc_type_match", "entity_overlap", "entity_keyphrase_match"), 0.0)
+             for _ in rows]
+    boosts = [0.0, 0.0, 0.5, 0.0]  # c: 0.4 * 1.5 = 0.6 beats a
+
+    assert select_for_cross_encoder(rows, feats, boosts, ctx, top_k=2) == [0, 2]
+    assert select_for_cross_encoder(rows, feats, boosts, ctx, top_k=2, skip_expanded=False) == [1, 2]
+    # stale CE scores are ignored by the cheap stage; 0 selects all eligible rows
+    assert select_for_cross_encoder(rows, feats, boosts, ctx, top_k=0) == [0, 2, 3]
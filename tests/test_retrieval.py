@@ -2,6 +2,7 @@ from pathlib import Path
 
 from config import load_config
 from backend.agents import IngestionAgent, RetrievalService
+from backend.common.models import TextChunk
 
 
 def test_retrieval_returns_context_after_ingest():
@@ -16,3 +17,70 @@ def test_retrieval_returns_context_after_ingest():
     search_result = result.data["search_result"]
     assert len(search_result.context_chunks) >= 1
     assert len(search_result.citations) >= 1
+
+
+def test_feature_scores_with_prebuilt_query_context_match_per_row_scoring():
+    cfg = load_config()
+    retrieval = RetrievalService(cfg)
+    query = "How do I fix ERR-UPL-013 when the upload fails?"
+    rows = [
+        {"doc_type": "TROUBLESHOOT", "content": "ERR-UPL-013 means the upload timed out.", "source_path": "upload_errors.md"},
+        {"doc_type": "USER_GUIDE", "content": "Open the uploads page.", "source_path": "toolx_user_guide.md"},
+        {"doc_type": "SOP", "content": "Retry the upload.", "source_path": "sop.md", "is_image_desc": True},
+    ]
+
+    ctx = retrieval._build_query_context(query)
+    for row in rows:
+        assert retrieval._compute_feature_scores(query, row, ctx=ctx) == retrieval._compute_feature_scores(query, row)
+
+
+def test_repeated_query_served_from_cache_until_corpus_changes():
+    cfg = load_config()
+    cfg.debug_level = 1
+    retrieval = RetrievalService(cfg)
+    chunk = TextChunk(
+        chunk_id="guide_0",
+        doc_id="guide",
+        content="To reset your ToolX password open Settings and choose Reset Password.",
+        source_path="toolx_user_guide.md",
+        chunk_index=0,
+        doc_type="USER_GUIDE",
+    )
+    retrieval.vector_store.add_chunks([chunk])
+
+    first = retrieval.execute({"query": "reset password ToolX", "max_results": 5})
+    second = retrieval.execute({"query": "  reset password\tToolX ", "max_results": 5})
+    # Case is significant to acronym/term resolution, so it is part of the key
+    recased = retrieval.execute({"query": "reset password toolx", "max_results": 5})
+
+    assert first.data["debug"]["query_cache"]["hit"] is False
+    assert second.data["debug"]["query_cache"]["hit"] is True
+    assert second.data["search_result"] is first.data["search_result"]
+    assert recased.data["debug"]["query_cache"]["hit"] is False
+
+    # Any write to the corpus (ingest, vacuum, vision) invalidates the entry
+    retrieval.vector_store.add_chunks([chunk])
+    third = retrieval.execute({"query": "reset password ToolX", "max_results": 5})
+    assert third.data["debug"]["query_cache"]["hit"] is False
+
+
+def test_search_variants_drops_variants_over_latency_budget():
+    import time
+
+    cfg = load_config()
+    cfg.multi_query_budget_ms = 200
+    retrieval = RetrievalService(cfg)
+
+    def search(query, top_k, doc_type_filter):
+        if query == "slow variant":
+            time.sleep(1.0)
+        if query == "original":
+            time.sleep(0.3)  # the original is awaited even past the budget
+        return [{"chunk_id": f"{query}_0", "score": 0.5}]
+
+    lists, timings = retrieval._search_variants(search, ["original", "fast variant", "slow variant"], 5, None)
+
+    assert [rows[0]["chunk_id"] for rows in lists] == ["original_0", "fast variant_0"]
+    assert [t["used"] for t in timings] == [True, True, False]
+    assert timings[2]["elapsed_ms"] is None
+    assert timings[0]["elapsed_ms"] >= 300
@@ -0,0 +1,33 @@
+"""Unit tests for backend.vector.store.VectorStore."""
+
+from backend.common.models import TextChunk
+from backend.vector.store import VectorStore
+
+
+def test_search_many_batches_and_caches_query_embeddings(tmp_path):
+    vector_store = VectorStore(str(tmp_path / "chroma"), query_embedding_cache_size=2)
+    vector_store.add_chunks([
+        TextChunk(chunk_id=f"doc_q_chunk_{i}", doc_id="doc_q", content=t, source_path="q.txt", chunk_index=i)
+        for i, t in enumerate(["reset password", "upload limits", "trustee duties"])
+    ])
+
+    calls = []
+    embed = vector_store.ef
+
+    def counting_ef(texts):
+        calls.append(list(texts))
+        return embed(texts)
+
+    vector_store.ef = counting_ef
+    queries = ["reset  password", "upload limits", "reset password"]
+    batched = vector_store.search_many(queries, top_k=2)
+
+    assert calls == [["reset password", "upload limits"]]  # one batch, normalised, de-duplicated
+    assert [[r["chunk_id"] for r in rows] for rows in batched] == [
+        [r["chunk_id"] for r in vector_store.search(q, top_k=2)] for q in queries
+    ]
+    assert len(calls) == 1  # single-query searches were served from the cache
+
+    vector_store.embed_queries(["trustee duties"])  # evicts least recently used "upload limits"
+    vector_store.embed_queries(["reset password", "upload limits"])
+    assert calls[1:] == [["trustee duties"], ["upload limits"]]
@@ -23,6 +23,9 @@ import time
 from pathlib import Path
 
 REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from backend.graph import GraphStore  # noqa: E402
 EXE = REPO / "dist" / "kts-backend" / "kts-backend.exe"
 
 FOLDERS = {
@@ -152,10 +155,10 @@ def test_folder(name: str, folder: Path, queries: list[dict] | None = None):
 
     # 3d. GAP 3: Defined terms (4-strategy extractor)
     print("\n[3d] DEFINED TERMS GRAPH (Gap 3)")
-    graph_path = Path(kb_path) / "graph" / "knowledge_graph.json"
+    graph_path = Path(kb_path) / "graph" / "knowledge_graph.db"
     defterm_count = 0
     if graph_path.exists():
-        graph_data = json.loads(graph_path.read_text(encoding="utf-8"))
+        graph_data = GraphStore(str(graph_path)).load_raw()
         nodes = graph_data.get("nodes", {})
         # nodes is a dict keyed by node_id
         if isinstance(nodes, dict):
@@ -169,7 +172,7 @@ def test_folder(name: str, folder: Path, queries: list[dict] | None = None):
     print("\n[3e] CORPUS REGIME IN GRAPH")
     graph_regime = "MISSING"
     if graph_path.exists():
-        graph_data = json.loads(graph_path.read_text(encoding="utf-8"))
+        graph_data = GraphStore(str(graph_path)).load_raw()
         graph_regime = graph_data.get("graph", {}).get("corpus_regime", "MISSING")
     print(f"  Graph corpus_regime: {graph_regime}")
     results["graph_corpus_regime"] = graph_regime
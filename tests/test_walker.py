@@ -0,0 +1,71 @@
+"""Unit tests for backend.common.walker — streaming scandir walk."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from backend.common.walker import iter_files
+
+
+def _touch(path: Path, text: str = "x") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_matches_rglob_filter_with_resolved_paths(tmp_path):
+    for rel in ("a.md", "B.TXT", "sub/c.md", "sub/deep/d.pdf", "sub/skip.bin", "notes"):
+        _touch(tmp_path / rel)
+
+    found = sorted(path for path, _ in iter_files(tmp_path, {".md", ".txt", ".pdf"}))
+    expected = sorted(
+        str(p.resolve()) for p in tmp_path.rglob("*")
+        if p.is_file() and p.suffix.lower() in {".md", ".txt", ".pdf"}
+    )
+    assert found == expected
+
+
+def test_skip_dirs_are_pruned_before_descending(tmp_path, monkeypatch):
+    _touch(tmp_path / "keep.md")
+    _touch(tmp_path / ".kts" / "documents" / "doc.md")
+    _touch(tmp_path / "nested" / "knowledge_base" / "x.md")
+
+    opened = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: opened.append(str(path)) or real_scandir(path))
+
+    found = [os.path.basename(p) for p, _ in iter_files(tmp_path, {".md"}, skip_dirs={".kts", "knowledge_base"})]
+    assert found == ["keep.md"]
+    assert not any(".kts" in p or "knowledge_base" in p for p in opened)
+
+
+def test_yields_lazily(tmp_path):
+    for i in range(5):
+        _touch(tmp_path / f"d{i}" / "f.md")
+    walker = iter_files(tmp_path, {".md"})
+    first_path, first_entry = next(walker)
+    assert first_entry.name == "f.md" and first_path.endswith("f.md")
+    assert len(list(walker)) == 4
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unavailable")
+def test_follows_symlinked_dirs_without_looping(tmp_path):
+    _touch(tmp_path / "real" / "a.md")
+    try:
+        os.symlink(tmp_path / "real", tmp_path / "link")
+        os.symlink(tmp_path, tmp_path / "real" / "loop")
+    except OSError:
+        pytest.skip("cannot create symlinks")
+
+    found = [p for p, _ in iter_files(tmp_path, {".md"})]
+    assert found == [str((tmp_path / "real" / "a.md").resolve())]
+
+
+def test_single_file_base_and_unreadable_dirs(tmp_path):
+    _touch(tmp_path / "one.md")
+    assert [p for p, _ in iter_files(tmp_path / "one.md", {".md"})] == [str((tmp_path / "one.md").resolve())]
+    assert list(iter_files(tmp_path / "one.md", {".txt"})) == []
+
+    errors = []
+    list(iter_files(tmp_path / "missing", {".md"}, on_error=lambda path, exc: errors.append(path)))
+    assert errors
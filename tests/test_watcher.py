@@ -0,0 +1,107 @@
+"""Unit tests for backend.common.watcher — debounced change batches."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from backend.common.watcher import Debouncer, FileWatcher, collapse_paths, diff_snapshots, snapshot
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_debouncer_waits_for_quiet_and_caps_batch_age():
+    clock = _Clock()
+    debouncer = Debouncer(quiet_seconds=2.0, max_wait_seconds=5.0, clock=clock)
+    assert debouncer.take_ready() == []
+
+    debouncer.add(["a.md", "b.md"])
+    clock.now += 1.5
+    debouncer.add(["a.md"])  # a second save of the same file extends the quiet window
+    clock.now += 1.5
+    assert debouncer.take_ready() == []
+    clock.now += 0.5
+    assert debouncer.take_ready() == ["a.md", "b.md"]
+    assert debouncer.pending() == 0
+
+    # A burst that never goes quiet is released max_wait after its first event
+    for _ in range(6):
+        debouncer.add(["c.md"])
+        clock.now += 1.0
+    assert debouncer.take_ready() == ["c.md"]
+
+
+def test_debouncer_wait_returns_empty_on_stop():
+    stop = threading.Event()
+    debouncer = Debouncer(quiet_seconds=60.0)
+    debouncer.add(["a.md"])
+    threading.Timer(0.1, stop.set).start()
+    assert debouncer.wait(stop, tick=0.05) == []
+
+
+def test_collapse_paths_keeps_only_outermost():
+    sep = os.sep
+    root = f"{sep}share"
+    paths = [f"{root}{sep}dir", f"{root}{sep}dir{sep}a.md", f"{root}{sep}dir.md", f"{root}{sep}dir{sep}sub{sep}b.md"]
+    assert collapse_paths(paths) == [f"{root}{sep}dir", f"{root}{sep}dir.md"]
+
+
+def test_snapshot_diff_reports_added_changed_and_removed(tmp_path):
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+    (tmp_path / "b.md").write_text("b", encoding="utf-8")
+    (tmp_path / ".kts").mkdir()
+    (tmp_path / ".kts" / "manifest.md").write_text("x", encoding="utf-8")
+    before = snapshot([str(tmp_path)], {".md"}, skip_dirs={".kts"})
+    assert len(before) == 2
+
+    (tmp_path / "a.md").write_text("a, edited", encoding="utf-8")
+    (tmp_path / "b.md").unlink()
+    (tmp_path / "c.md").write_text("c", encoding="utf-8")
+    after = snapshot([str(tmp_path)], {".md"}, skip_dirs={".kts"})
+
+    root = os.path.realpath(tmp_path)
+    assert diff_snapshots(before, after) == [os.path.join(root, name) for name in ("a.md", "b.md", "c.md")]
+
+
+def test_wanted_filters_scope_extension_and_skip_dirs(tmp_path):
+    watcher = FileWatcher([str(tmp_path)], {".md"}, skip_dirs={".kts"})
+    root = os.path.realpath(tmp_path)
+    assert watcher.wanted(os.path.join(root, "a.MD"))
+    assert not watcher.wanted(os.path.join(root, "a.tmp"))
+    assert not watcher.wanted(os.path.join(root, ".kts", "a.md"))
+    assert not watcher.wanted(os.path.join(root + "-other", "a.md"))
+    assert watcher.wanted(os.path.join(root, "folder"), is_directory=True)
+
+
+def test_unknown_backend_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        FileWatcher([str(tmp_path)], {".md"}, backend="fanotify")
+
+
+def test_polling_watcher_batches_a_burst(tmp_path):
+    (tmp_path / "keep.md").write_text("unchanged", encoding="utf-8")
+    watcher = FileWatcher(
+        [str(tmp_path)], {".md"}, debounce_seconds=0.3, poll_interval_seconds=0.05, backend="polling"
+    )
+    assert watcher.start() == "polling"
+    try:
+        for i in range(3):
+            (tmp_path / "burst.md").write_text("x" * (i + 1), encoding="utf-8")
+            (tmp_path / f"new_{i}.md").write_text("new", encoding="utf-8")
+            time.sleep(0.05)
+        started = time.monotonic()
+        batch = watcher.next_batch()
+        assert time.monotonic() - started < 5
+    finally:
+        watcher.stop()
+
+    root = os.path.realpath(tmp_path)
+    assert batch == [os.path.join(root, name) for name in ("burst.md", "new_0.md", "new_1.md", "new_2.md")]
+    assert watcher.next_batch() == []  # stopped